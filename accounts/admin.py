@@ -1 +1,126 @@
+import uuid
+
 from django.contrib import admin
+from django.contrib.admin.views.main import ORDER_VAR, PAGE_VAR
+from django.core.paginator import Paginator
+from django.db import connection
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+
+from utils import revoke_sessions, user_session_index_ins
+from .models import Session
+
+# Query parameter of the keyset link: "<created_at>|<id>" of the last row shown
+CURSOR_VAR = "before"
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that never runs an unbounded `COUNT(*)`.
+
+    Unfiltered lists use the planner's row estimate on PostgreSQL. Any other
+    list is counted up to `count_limit` rows only; rows beyond that are reached
+    through keyset navigation instead of page numbers.
+    """
+
+    count_limit = 10000
+
+    @cached_property
+    def count(self):
+        if connection.vendor == "postgresql" and not self.object_list.query.where:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                    [self.object_list.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+            # reltuples is -1 (or 0) until the table has been analyzed
+            if row and row[0] > 0:
+                return row[0]
+
+        return self.object_list[:self.count_limit].count()
+
+
+@admin.register(Session)
+class SessionAdmin(admin.ModelAdmin):
+    """Admin for sessions, designed for tables with tens of millions of rows.
+
+    The change list joins `User` in the same query, never counts the whole
+    table, and only searches on indexed columns (exact session id or exact
+    username). Older rows are reached with a keyset link on
+    `(created_at, id)`, backed by `session_created_at_id_idx`, rather than deep
+    OFFSET pages. Sessions sharing the `created_at` of the last row shown are
+    not skipped.
+    """
+
+    list_display = ("id", "user", "created_at", "last_seen_at", "revoked")
+    list_select_related = ("user",)
+    list_filter = ("revoked",)
+    search_fields = ("id", "user__username")
+    search_help_text = "Exact session id or username."
+    raw_id_fields = ("user",)
+    readonly_fields = ("created_at", "last_seen_at")
+    ordering = ("-created_at", "-id")
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+    actions = ["revoke_selected_sessions"]
+
+    def get_search_results(self, request, queryset, search_term):
+        """Search by exact session id or exact username, both backed by an index."""
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+
+        try:
+            return queryset.filter(id=uuid.UUID(search_term)), False
+        except ValueError:
+            return queryset.filter(user__username=search_term), False
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        cursor = getattr(request, "session_cursor", None)
+        if cursor is None:
+            return queryset
+        created_at, session_id = cursor
+        return queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=session_id))
+
+    def changelist_view(self, request, extra_context=None):
+        """Add a keyset link to the page of sessions older than the last one shown."""
+        # The admin rejects unknown query parameters, so the cursor is taken out
+        # of the query string and applied in `get_queryset`
+        request.GET = request.GET.copy()
+        request.session_cursor = self._decode_cursor(request.GET.pop(CURSOR_VAR, [""])[-1])
+        response = super().changelist_view(request, extra_context=extra_context)
+        changelist = getattr(response, "context_data", {}).get("cl")
+        if changelist is None or ORDER_VAR in changelist.params:
+            return response
+
+        results = list(changelist.result_list)
+        if len(results) == changelist.list_per_page:
+            response.context_data["keyset_next_url"] = changelist.get_query_string(
+                new_params={CURSOR_VAR: f"{results[-1].created_at.isoformat()}|{results[-1].id}"},
+                remove=[PAGE_VAR],
+            )
+        return response
+
+    def _decode_cursor(self, cursor: str):
+        """Return the (created_at, id) position of a keyset cursor, or None if it is invalid."""
+        created_at, _, session_id = cursor.partition("|")
+        try:
+            created_at = parse_datetime(created_at)
+            session_id = uuid.UUID(session_id)
+        except ValueError:
+            return None
+        if created_at is None:
+            return None
+        return created_at, session_id
+
+    @admin.action(description="Revoke selected sessions")
+    def revoke_selected_sessions(self, request, queryset):
+        """Revoke sessions with one UPDATE and clear their tokens from Redis."""
+        sessions = list(queryset.filter(revoked=False).values_list("user_id", "id"))
+        session_ids = [session_id for _, session_id in sessions]
+        revoked = Session.objects.filter(id__in=session_ids).update(revoked=True)
+        revoke_sessions(session_ids=session_ids)
+        user_session_index_ins.remove(sessions=sessions)
+        self.message_user(request, f"Revoked {revoked} sessions.")
@@ -0,0 +1,37 @@
+from rest_framework.authentication import BaseAuthentication
+
+
+class TokenUser:
+    """User of a request authenticated by access token, without a database query.
+
+    Only the id is known. Views that need more than the id load the `User`.
+    """
+
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, user_id):
+        self.id = self.pk = user_id
+
+    def __str__(self):
+        return f"TokenUser {self.id}"
+
+
+class AuthContextAuthentication(BaseAuthentication):
+    """DRF authentication backed by the auth context of `TokenMiddleware`.
+
+    The middleware validates the access token once and stores an
+    `utils.auth_context.AuthContext` on the request. This class exposes it as
+    `request.auth`, with a `TokenUser` as `request.user`, so views never parse
+    or verify the token again. Requests without a context (endpoints excluded
+    from token validation) are left to the next authentication class.
+    """
+
+    def authenticate(self, request):
+        auth_context = getattr(request._request, "auth_context", None)
+        if auth_context is None:
+            return None
+        return TokenUser(user_id=auth_context.user_id), auth_context
+
+    def authenticate_header(self, request):
+        return "Bearer"
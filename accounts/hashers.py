@@ -0,0 +1,63 @@
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher,
+    BCryptSHA256PasswordHasher,
+    PBKDF2PasswordHasher,
+    ScryptPasswordHasher,
+)
+
+# Work factors are read from settings on every use, so they can be tuned with
+# the `calibrate_password_hashers` command without code changes. The algorithm
+# names are unchanged, so existing hashes keep verifying. When a stored hash
+# uses different parameters, Django re-hashes the password on the next
+# successful `authenticate` unless PASSWORD_HASH_UPGRADE is disabled. A hash
+# made with another algorithm than PASSWORD_HASHER is always re-hashed.
+
+
+class CalibratedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    @property
+    def iterations(self):
+        return settings.PASSWORD_PBKDF2_ITERATIONS
+
+    def must_update(self, encoded):
+        return settings.PASSWORD_HASH_UPGRADE and super().must_update(encoded)
+
+
+class CalibratedArgon2PasswordHasher(Argon2PasswordHasher):
+    @property
+    def time_cost(self):
+        return settings.PASSWORD_ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.PASSWORD_ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_ARGON2_PARALLELISM
+
+    def must_update(self, encoded):
+        return settings.PASSWORD_HASH_UPGRADE and super().must_update(encoded)
+
+
+class CalibratedBCryptSHA256PasswordHasher(BCryptSHA256PasswordHasher):
+    @property
+    def rounds(self):
+        return settings.PASSWORD_BCRYPT_ROUNDS
+
+    def must_update(self, encoded):
+        return settings.PASSWORD_HASH_UPGRADE and super().must_update(encoded)
+
+
+class CalibratedScryptPasswordHasher(ScryptPasswordHasher):
+    @property
+    def work_factor(self):
+        return settings.PASSWORD_SCRYPT_WORK_FACTOR
+
+    @property
+    def maxmem(self):
+        # scrypt needs 128 * r * N bytes; leave headroom above OpenSSL's 32 MiB default
+        return 2 * 128 * self.block_size * self.work_factor
+
+    def must_update(self, encoded):
+        return settings.PASSWORD_HASH_UPGRADE and super().must_update(encoded)
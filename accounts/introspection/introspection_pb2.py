@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# NO CHECKED-IN PROTOBUF GENCODE
+# source: accounts/introspection/introspection.proto
+# Protobuf Python Version: 7.35.1
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+_runtime_version.ValidateProtobufRuntimeVersion(
+    _runtime_version.Domain.PUBLIC,
+    7,
+    35,
+    1,
+    '',
+    'accounts/introspection/introspection.proto'
+)
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n*accounts/introspection/introspection.proto\x12\x15\x61uth.introspection.v1\" \n\x0fValidateRequest\x12\r\n\x05token\x18\x01 \x01(\t\"n\n\x10ValidateResponse\x12\x10\n\x08is_valid\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x0f\n\x07user_id\x18\x03 \x01(\x03\x12\x12\n\nsession_id\x18\x04 \x01(\t\x12\x12\n\nexpires_at\x18\x05 \x01(\x03\x32\xd8\x01\n\x12TokenIntrospection\x12[\n\x08Validate\x12&.auth.introspection.v1.ValidateRequest\x1a\'.auth.introspection.v1.ValidateResponse\x12\x65\n\x0eValidateStream\x12&.auth.introspection.v1.ValidateRequest\x1a\'.auth.introspection.v1.ValidateResponse(\x01\x30\x01\x62\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'accounts.introspection.introspection_pb2', _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+  DESCRIPTOR._loaded_options = None
+  _globals['_VALIDATEREQUEST']._serialized_start=69
+  _globals['_VALIDATEREQUEST']._serialized_end=101
+  _globals['_VALIDATERESPONSE']._serialized_start=103
+  _globals['_VALIDATERESPONSE']._serialized_end=213
+  _globals['_TOKENINTROSPECTION']._serialized_start=216
+  _globals['_TOKENINTROSPECTION']._serialized_end=432
+# @@protoc_insertion_point(module_scope)
@@ -0,0 +1,142 @@
+# Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
+"""Client and server classes corresponding to protobuf-defined services."""
+import grpc
+import warnings
+
+from accounts.introspection import introspection_pb2 as accounts_dot_introspection_dot_introspection__pb2
+
+GRPC_GENERATED_VERSION = '1.84.0'
+GRPC_VERSION = grpc.__version__
+_version_not_supported = False
+
+try:
+    from grpc._utilities import first_version_is_lower
+    _version_not_supported = first_version_is_lower(GRPC_VERSION, GRPC_GENERATED_VERSION)
+except ImportError:
+    _version_not_supported = True
+
+if _version_not_supported:
+    raise RuntimeError(
+        f'The grpc package installed is at version {GRPC_VERSION},'
+        + ' but the generated code in accounts/introspection/introspection_pb2_grpc.py depends on'
+        + f' grpcio>={GRPC_GENERATED_VERSION}.'
+        + f' Please upgrade your grpc module to grpcio>={GRPC_GENERATED_VERSION}'
+        + f' or downgrade your generated code using grpcio-tools<={GRPC_VERSION}.'
+    )
+
+
+class TokenIntrospectionStub:
+    """Missing associated documentation comment in .proto file."""
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.Validate = channel.unary_unary(
+                '/auth.introspection.v1.TokenIntrospection/Validate',
+                request_serializer=accounts_dot_introspection_dot_introspection__pb2.ValidateRequest.SerializeToString,
+                response_deserializer=accounts_dot_introspection_dot_introspection__pb2.ValidateResponse.FromString,
+                _registered_method=True)
+        self.ValidateStream = channel.stream_stream(
+                '/auth.introspection.v1.TokenIntrospection/ValidateStream',
+                request_serializer=accounts_dot_introspection_dot_introspection__pb2.ValidateRequest.SerializeToString,
+                response_deserializer=accounts_dot_introspection_dot_introspection__pb2.ValidateResponse.FromString,
+                _registered_method=True)
+
+
+class TokenIntrospectionServicer:
+    """Missing associated documentation comment in .proto file."""
+
+    def Validate(self, request, context):
+        """Validate one access token.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ValidateStream(self, request_iterator, context):
+        """Validate a stream of access tokens. Responses are sent in request order.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_TokenIntrospectionServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'Validate': grpc.unary_unary_rpc_method_handler(
+                    servicer.Validate,
+                    request_deserializer=accounts_dot_introspection_dot_introspection__pb2.ValidateRequest.FromString,
+                    response_serializer=accounts_dot_introspection_dot_introspection__pb2.ValidateResponse.SerializeToString,
+            ),
+            'ValidateStream': grpc.stream_stream_rpc_method_handler(
+                    servicer.ValidateStream,
+                    request_deserializer=accounts_dot_introspection_dot_introspection__pb2.ValidateRequest.FromString,
+                    response_serializer=accounts_dot_introspection_dot_introspection__pb2.ValidateResponse.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'auth.introspection.v1.TokenIntrospection', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+    server.add_registered_method_handlers('auth.introspection.v1.TokenIntrospection', rpc_method_handlers)
+
+
+ # This class is part of an EXPERIMENTAL API.
+class TokenIntrospection:
+    """Missing associated documentation comment in .proto file."""
+
+    @staticmethod
+    def Validate(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/auth.introspection.v1.TokenIntrospection/Validate',
+            accounts_dot_introspection_dot_introspection__pb2.ValidateRequest.SerializeToString,
+            accounts_dot_introspection_dot_introspection__pb2.ValidateResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ValidateStream(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/auth.introspection.v1.TokenIntrospection/ValidateStream',
+            accounts_dot_introspection_dot_introspection__pb2.ValidateRequest.SerializeToString,
+            accounts_dot_introspection_dot_introspection__pb2.ValidateResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -0,0 +1,80 @@
+from concurrent import futures
+
+import grpc
+from django.conf import settings
+from jwt import ExpiredSignatureError, InvalidTokenError
+
+from utils import validate_access_token
+from . import introspection_pb2, introspection_pb2_grpc
+from ..views.token_validation import (
+    MESSAGE_INVALID_TOKEN,
+    MESSAGE_TOKEN_EXPIRED,
+    MESSAGE_TOKEN_INVALID_OR_EXPIRED,
+    MESSAGE_TOKEN_VALID,
+)
+
+
+class TokenIntrospectionService(introspection_pb2_grpc.TokenIntrospectionServicer):
+    """gRPC counterpart of `TokenValidationView` for internal services.
+
+    Tokens are validated with `validate_access_token`, like in
+    `TokenMiddleware`, without DRF parsing or the Django middleware stack.
+    Results carry the same messages as the HTTP endpoint, plus the user id,
+    session id and expiry of valid tokens.
+    """
+
+    def Validate(self, request, context):
+        """Validate one access token."""
+        return self._validate(request.token)
+
+    def ValidateStream(self, request_iterator, context):
+        """Validate a stream of access tokens, answering each in order."""
+        for request in request_iterator:
+            yield self._validate(request.token)
+
+    def _validate(self, token: str) -> introspection_pb2.ValidateResponse:
+        """Validate a token and describe the result.
+
+        Args:
+            token (str): The encoded access token.
+
+        Returns:
+            ValidateResponse: The validity, message and, for valid tokens, the claims.
+        """
+        try:
+            payload = validate_access_token(token=token) if token else None
+        except ExpiredSignatureError:
+            return introspection_pb2.ValidateResponse(is_valid=False, message=MESSAGE_TOKEN_EXPIRED)
+        except InvalidTokenError:
+            return introspection_pb2.ValidateResponse(is_valid=False, message=MESSAGE_INVALID_TOKEN)
+
+        if payload is None:
+            return introspection_pb2.ValidateResponse(is_valid=False, message=MESSAGE_TOKEN_INVALID_OR_EXPIRED)
+
+        return introspection_pb2.ValidateResponse(
+            is_valid=True,
+            message=MESSAGE_TOKEN_VALID,
+            user_id=int(payload.get("user_id") or 0),
+            session_id=str(payload.get("session_id") or ""),
+            expires_at=int(payload.get("exp") or 0),
+        )
+
+
+def create_server(address: str = None, max_workers: int = None):
+    """Create an introspection gRPC server listening on `address`.
+
+    Args:
+        address (str): The address to bind, GRPC_INTROSPECTION_ADDRESS by default.
+            A port of 0 binds a free port.
+        max_workers (int): Size of the thread pool serving RPCs,
+            GRPC_INTROSPECTION_MAX_WORKERS by default.
+
+    Returns:
+        tuple: The unstarted `grpc.Server` and the bound port.
+    """
+    server = grpc.server(
+        futures.ThreadPoolExecutor(max_workers=max_workers or settings.GRPC_INTROSPECTION_MAX_WORKERS)
+    )
+    introspection_pb2_grpc.add_TokenIntrospectionServicer_to_server(TokenIntrospectionService(), server)
+    port = server.add_insecure_port(address or settings.GRPC_INTROSPECTION_ADDRESS)
+    return server, port
@@ -0,0 +1,76 @@
+import os
+import tempfile
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from utils import redis_client_ins
+from utils.shared_token_cache import SharedTokenCache
+
+
+class Command(BaseCommand):
+    """Compare the lookup cost of the token validation caches.
+
+    A set of tokens is looked up in the shared memory-mapped cache, in a
+    per-worker dict, and with a Redis GET of its allowlist key. The mean time
+    per lookup is reported for each. Redis is skipped when it is unreachable.
+    """
+
+    help = "Measure lookup time of the shared token cache, a per-worker dict and Redis GET."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tokens",
+            type=int,
+            default=10000,
+            help="Number of distinct cached tokens.",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=100000,
+            help="Number of lookups to time per cache.",
+        )
+
+    def handle(self, *args, **options):
+        token_count = options["tokens"]
+        iterations = options["iterations"]
+        tokens = [f"token-{index}-{uuid.uuid4().hex}" for index in range(token_count)]
+        lookups = [tokens[index % token_count] for index in range(iterations)]
+        expires_at = time.time() + 3600
+
+        self.stdout.write(f"{'cache':<14}{'lookup (us)':>14}")
+
+        with tempfile.TemporaryDirectory() as directory, override_settings(
+            SHARED_TOKEN_CACHE_ENABLED=True,
+            SHARED_TOKEN_CACHE_PATH=os.path.join(directory, "token_cache"),
+            SHARED_TOKEN_CACHE_SLOTS=max(65536, token_count * 2),
+            SHARED_TOKEN_CACHE_TTL_SECONDS=3600,
+        ):
+            shared_cache = SharedTokenCache()
+            session_id = str(uuid.uuid4())
+            for token in tokens:
+                shared_cache.set(token=token, user_id=1, session_id=session_id, expires_at=expires_at)
+            self._report("shared mmap", shared_cache.get, lookups)
+
+        local_cache = {token: {"user_id": 1, "session_id": session_id} for token in tokens}
+        self._report("worker dict", local_cache.get, lookups)
+
+        if redis_client_ins is None:
+            self.stdout.write(f"{'redis GET':<14}{'unavailable':>14}")
+            return
+        redis_client_ins.set_access_tokens(tokens=[(token, session_id) for token in tokens])
+        try:
+            self._report("redis GET", lambda token: redis_client_ins.get_access_token(token=token), lookups)
+        finally:
+            redis_client_ins.delete_session_tokens(session_ids=[session_id])
+
+    def _report(self, name, lookup, lookups):
+        """Time `lookup` over every token of `lookups` and print the mean in microseconds."""
+        start = time.perf_counter()
+        for token in lookups:
+            lookup(token)
+        elapsed = time.perf_counter() - start
+        self.stdout.write(f"{name:<14}{elapsed / len(lookups) * 1_000_000:>14.2f}")
@@ -0,0 +1,60 @@
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from utils import decode_token, encode_token
+
+
+class Command(BaseCommand):
+    """Compare the standard and compact token claim profiles.
+
+    For each profile this command reports the size of an access and a refresh
+    token in bytes, and the mean time to encode and decode them.
+    """
+
+    help = "Measure token size and encode/decode time for each token claim profile."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=1000,
+            help="Number of encode/decode operations to time per profile and token type.",
+        )
+
+    def handle(self, *args, **options):
+        iterations = options["iterations"]
+        session_id = str(uuid.uuid4())
+
+        self.stdout.write(
+            f"{'profile':<10}{'type':<9}{'bytes':>7}{'encode (us)':>14}{'decode (us)':>14}"
+        )
+        for profile in ("standard", "compact"):
+            with override_settings(TOKEN_CLAIM_PROFILE=profile):
+                for token_type, lifetime in (
+                    ("access", settings.ACCESS_TOKEN_EXPIRATION_SECONDS),
+                    ("refresh", settings.REFRESH_TOKEN_EXPIRATION_SECONDS),
+                ):
+                    payload = {
+                        "user_id": 123456,
+                        "session_id": session_id,
+                        "exp": datetime.utcnow() + timedelta(seconds=lifetime),
+                        "type": token_type,
+                    }
+                    token, encode_us = self._time(encode_token, iterations, payload=payload)
+                    _, decode_us = self._time(decode_token, iterations, token=token)
+                    self.stdout.write(
+                        f"{profile:<10}{token_type:<9}{len(token):>7}{encode_us:>14.1f}{decode_us:>14.1f}"
+                    )
+
+    def _time(self, func, iterations, **kwargs):
+        """Call `func` repeatedly and return its last result and mean duration in microseconds."""
+        start = time.perf_counter()
+        for _ in range(iterations):
+            result = func(**kwargs)
+        elapsed = time.perf_counter() - start
+        return result, elapsed / iterations * 1_000_000
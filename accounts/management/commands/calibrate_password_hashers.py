@@ -0,0 +1,139 @@
+import hashlib
+import math
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from django.utils.crypto import get_random_string
+from django.utils.module_loading import import_string
+
+# Setting that controls the work factor of each hasher, and how cost scales with it
+HASHER_PARAMETERS = {
+    "pbkdf2": ("PASSWORD_PBKDF2_ITERATIONS", "linear"),
+    "argon2": ("PASSWORD_ARGON2_TIME_COST", "linear"),
+    "bcrypt": ("PASSWORD_BCRYPT_ROUNDS", "log2"),
+    "scrypt": ("PASSWORD_SCRYPT_WORK_FACTOR", "power_of_two"),
+}
+MAX_VERIFICATION_STEPS = 5
+
+
+class Command(BaseCommand):
+    """Recommend password hasher work factors for a login latency budget.
+
+    Every available hasher is timed on this machine at its configured work
+    factor. The cost is extrapolated to the largest work factor whose p99
+    hashing time fits `--target-ms`, and that work factor is then measured
+    again (and lowered if needed) before it is recommended. Apply the result
+    through the printed `.env` lines; existing hashes are upgraded on the next
+    successful login when PASSWORD_HASH_UPGRADE is enabled.
+    """
+
+    help = "Benchmark password hashers and recommend work factors for a target p99 hashing time."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--target-ms",
+            type=float,
+            default=250.0,
+            help="Target p99 hashing time in milliseconds.",
+        )
+        parser.add_argument(
+            "--samples",
+            type=int,
+            default=20,
+            help="Number of hashes timed per measurement.",
+        )
+        parser.add_argument(
+            "--hashers",
+            nargs="+",
+            choices=sorted(HASHER_PARAMETERS),
+            default=sorted(HASHER_PARAMETERS),
+            help="Hashers to calibrate.",
+        )
+
+    def handle(self, *args, **options):
+        target_ms = options["target_ms"]
+        samples = options["samples"]
+        recommendations = []
+
+        self.stdout.write(f"Target p99 hashing time: {target_ms:.0f} ms, {samples} samples per measurement.")
+        self.stdout.write(
+            f"{'hasher':<8}{'current':>10}{'p99 (ms)':>10}{'recommended':>13}{'p99 (ms)':>10}"
+        )
+        for name in options["hashers"]:
+            setting, scaling = HASHER_PARAMETERS[name]
+            hasher = import_string(settings.CALIBRATED_PASSWORD_HASHERS[name])()
+            if not self._is_available(name, hasher):
+                self.stdout.write(f"{name:<8}  not available on this machine, skipped.")
+                continue
+
+            current = getattr(settings, setting)
+            current_ms = self._measure(hasher, setting, current, samples)
+            recommended = self._extrapolate(current, current_ms, target_ms, scaling)
+            recommended_ms = self._measure(hasher, setting, recommended, samples)
+            for _ in range(MAX_VERIFICATION_STEPS):
+                if recommended_ms <= target_ms:
+                    break
+                lower = self._step_down(recommended, scaling)
+                if lower == recommended:
+                    break
+                recommended = lower
+                recommended_ms = self._measure(hasher, setting, recommended, samples)
+
+            recommendations.append((setting, recommended))
+            self.stdout.write(
+                f"{name:<8}{current:>10}{current_ms:>10.1f}{recommended:>13}{recommended_ms:>10.1f}"
+            )
+
+        if recommendations:
+            self.stdout.write("\nSuggested .env settings:")
+            for setting, value in recommendations:
+                self.stdout.write(f"{setting}={value}")
+
+    def _is_available(self, name: str, hasher) -> bool:
+        """Check whether the library a hasher depends on is installed."""
+        if name == "scrypt":
+            return hasattr(hashlib, "scrypt")
+        if name in ("argon2", "bcrypt"):
+            try:
+                hasher._load_library()
+            except ValueError:
+                return False
+        return True
+
+    def _measure(self, hasher, setting: str, value: int, samples: int) -> float:
+        """Return the p99 time in milliseconds to hash a password with `setting=value`."""
+        password = get_random_string(16)
+        durations = []
+        with override_settings(**{setting: value}):
+            for _ in range(samples):
+                salt = hasher.salt()
+                start = time.perf_counter()
+                hasher.encode(password, salt)
+                durations.append((time.perf_counter() - start) * 1000)
+
+        if len(durations) < 2:
+            return durations[0]
+        return statistics.quantiles(durations, n=100, method="inclusive")[98]
+
+    def _extrapolate(self, value: int, value_ms: float, target_ms: float, scaling: str) -> int:
+        """Estimate the largest work factor whose hashing time fits the target."""
+        ratio = target_ms / value_ms
+        if scaling == "linear":
+            estimate = int(value * ratio)
+            if value >= 1000:
+                estimate = estimate // 1000 * 1000
+            return max(1, estimate)
+        if scaling == "log2":
+            return min(31, max(4, value + math.floor(math.log2(ratio))))
+        return max(2, 2 ** (int(math.log2(value)) + math.floor(math.log2(ratio))))
+
+    def _step_down(self, value: int, scaling: str) -> int:
+        """Return the next lower work factor to try."""
+        if scaling == "linear":
+            return max(1, int(value * 0.9) if value >= 10 else value - 1)
+        if scaling == "log2":
+            return max(4, value - 1)
+        return max(2, value // 2)
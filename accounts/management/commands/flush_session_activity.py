@@ -0,0 +1,115 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from utils import revoke_sessions, session_activity_tracker_ins, user_session_index_ins
+from ...models import Session
+
+
+class Command(BaseCommand):
+    """Persist buffered session activity and optionally expire idle sessions.
+
+    Last activity timestamps recorded by `TokenMiddleware` and
+    `RefreshTokenView` are buffered in Redis. This command drains the buffer and
+    writes it to `Session.last_seen_at` with a single bulk update, so requests
+    never write to the database to track activity. Run it periodically, or
+    continuously with `--interval`.
+    """
+
+    help = "Flush buffered session activity to the database and expire idle sessions."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=None,
+            help="Keep running and flush every INTERVAL seconds.",
+        )
+        parser.add_argument(
+            "--expire-inactive-seconds",
+            type=int,
+            default=None,
+            help="Revoke sessions without activity for this many seconds.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of sessions per UPDATE statement.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            flushed = self._flush(batch_size=options["batch_size"])
+            self.stdout.write(f"Flushed activity of {flushed} sessions.")
+
+            if options["expire_inactive_seconds"] is not None:
+                expired = self._expire_inactive(options["expire_inactive_seconds"])
+                self.stdout.write(f"Revoked {expired} inactive sessions.")
+
+            if options["interval"] is None:
+                return
+            time.sleep(options["interval"])
+
+    def _flush(self, batch_size: int) -> int:
+        """Write the buffered last activity timestamps to the database.
+
+        Args:
+            batch_size (int): Number of sessions per UPDATE statement.
+
+        Returns:
+            int: The number of sessions updated.
+        """
+        activity = session_activity_tracker_ins.drain()
+        if not activity:
+            return 0
+
+        sessions = [
+            Session(id=session_id, last_seen_at=datetime.fromtimestamp(timestamp, tz=timezone.utc))
+            for session_id, timestamp in activity.items()
+        ]
+        Session.objects.bulk_update(sessions, ["last_seen_at"], batch_size=batch_size)
+        session_activity_tracker_ins.acknowledge()
+        return len(sessions)
+
+    def _expire_inactive(self, inactive_seconds: int) -> int:
+        """Revoke sessions that have been idle for longer than `inactive_seconds`.
+
+        Sessions that never reported activity are judged by their creation time.
+        Sessions older than REFRESH_TOKEN_EXPIRATION_SECONDS are skipped: their
+        refresh token has expired, so they cannot be used anymore. The idle
+        sessions are walked by id and revoked in batches of
+        TOKEN_REVOCATION_BATCH_SIZE, each with one UPDATE and one
+        `revoke_sessions` call, like the admin revoke action.
+
+        Args:
+            inactive_seconds (int): The inactivity threshold in seconds.
+
+        Returns:
+            int: The number of sessions revoked.
+        """
+        now = datetime.now(tz=timezone.utc)
+        cutoff = now - timedelta(seconds=inactive_seconds)
+        idle_sessions = Session.objects.filter(
+            Q(last_seen_at__lt=cutoff) | Q(last_seen_at__isnull=True, created_at__lt=cutoff),
+            created_at__gte=now - timedelta(seconds=settings.REFRESH_TOKEN_EXPIRATION_SECONDS),
+            revoked=False,
+        ).order_by("id")
+        batch_size = settings.TOKEN_REVOCATION_BATCH_SIZE
+
+        revoked = 0
+        last_id = None
+        while True:
+            batch = idle_sessions if last_id is None else idle_sessions.filter(id__gt=last_id)
+            sessions = list(batch.values_list("user_id", "id")[:batch_size])
+            if not sessions:
+                return revoked
+
+            session_ids = [session_id for _, session_id in sessions]
+            revoked += Session.objects.filter(id__in=session_ids, revoked=False).update(revoked=True)
+            revoke_sessions(session_ids=session_ids)
+            user_session_index_ins.remove(sessions=sessions)
+            last_id = session_ids[-1]
@@ -0,0 +1,245 @@
+import time
+from collections import Counter, defaultdict
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand
+from jwt import InvalidTokenError
+from redis.cluster import RedisCluster
+
+from utils import decode_token, redis_client_ins
+from ...models import Session
+
+# Upper bounds (in seconds) of the TTL histogram buckets; the last bucket is open-ended
+TTL_BUCKETS = [60, 300, 900, 3600, 86400]
+TTL_BUCKET_LABELS = ["<1m", "<5m", "<15m", "<1h", "<1d", ">=1d"]
+NO_EXPIRY_LABEL = "none"
+
+# Key prefixes whose keys belong to a single session, named after its id
+SESSION_KEY_PREFIXES = ("session", "session_tokens", "refresh")
+
+
+class Command(BaseCommand):
+    """Report the contents and memory use of the Redis keyspace per key prefix.
+
+    Every node is walked incrementally with `SCAN`, so Redis keeps serving
+    other clients between batches (unlike `KEYS`). For each prefix (the part
+    of the key before the first `:`) the command reports the number of keys,
+    a histogram of their TTLs and the memory use estimated from
+    `MEMORY USAGE` on the first `--memory-samples` keys, which arrive in hash
+    order.
+
+    With `--find-orphans`, keys of revoked or deleted sessions
+    (`access_token:*`, `session_tokens:*`, `session:*` and `refresh:*`) are
+    counted; `--delete-orphans` also deletes them in batches of
+    `--batch-size`, pausing `--sleep` seconds between batches. Each batch is
+    one pipeline of per-key `UNLINK`s, since the keys of a cluster node span
+    many hash slots and a multi-key `DEL` would fail with CROSSSLOT.
+    """
+
+    help = "Scan the Redis keyspace and report key counts, TTLs and memory use per prefix."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--match",
+            default="*",
+            help="Only scan keys matching this pattern.",
+        )
+        parser.add_argument(
+            "--scan-count",
+            type=int,
+            default=1000,
+            help="COUNT hint of each SCAN call.",
+        )
+        parser.add_argument(
+            "--memory-samples",
+            type=int,
+            default=100,
+            help="Keys per prefix measured with MEMORY USAGE.",
+        )
+        parser.add_argument(
+            "--find-orphans",
+            action="store_true",
+            help="Count keys of revoked or deleted sessions.",
+        )
+        parser.add_argument(
+            "--delete-orphans",
+            action="store_true",
+            help="Delete keys of revoked or deleted sessions.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of orphaned keys per UNLINK pipeline.",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0.05,
+            help="Seconds to pause after each SCAN batch and each DEL.",
+        )
+
+    def handle(self, *args, **options):
+        if redis_client_ins is None:
+            self.stderr.write("Redis is not available.")
+            return
+
+        self._counts = Counter()
+        self._ttls = defaultdict(Counter)
+        self._memory = defaultdict(list)
+        self._orphans = Counter()
+        self._deleted = 0
+        self._options = options
+        find_orphans = options["find_orphans"] or options["delete_orphans"]
+
+        for node in self._nodes():
+            cursor = 0
+            while True:
+                cursor, keys = node.scan(cursor=cursor, match=options["match"], count=options["scan_count"])
+                keys = [key.decode() for key in keys]
+                if keys:
+                    self._inspect(node, keys)
+                    if find_orphans:
+                        self._handle_orphans(node, keys)
+                if cursor == 0:
+                    break
+                time.sleep(options["sleep"])
+
+        self._report()
+
+    def _nodes(self) -> list:
+        """Return a plain client for every primary node holding keys."""
+        if isinstance(redis_client_ins, RedisCluster):
+            return [
+                redis_client_ins.get_redis_connection(node)
+                for node in redis_client_ins.get_primaries()
+            ]
+        clients = getattr(redis_client_ins, "clients", None)
+        if clients is not None:
+            # Sharded deployment: every node holds a part of the keyspace
+            return list(clients.values())
+        return [redis_client_ins]
+
+    def _inspect(self, node, keys: list) -> None:
+        """Count a SCAN batch and record its TTLs and sampled memory use."""
+        pipeline = node.pipeline(transaction=False)
+        for key in keys:
+            self._counts[self._prefix(key)] += 1
+            pipeline.ttl(key)
+
+        # MEMORY USAGE replies follow the TTL replies
+        samples = []
+        sampled = Counter()
+        for key in keys:
+            prefix = self._prefix(key)
+            if len(self._memory[prefix]) + sampled[prefix] < self._options["memory_samples"]:
+                pipeline.memory_usage(key)
+                samples.append(prefix)
+                sampled[prefix] += 1
+        results = pipeline.execute()
+
+        for key, ttl in zip(keys, results[:len(keys)]):
+            # -2: the key expired since it was scanned
+            if ttl != -2:
+                self._ttls[self._prefix(key)][self._ttl_bucket(ttl)] += 1
+        for prefix, usage in zip(samples, results[len(keys):]):
+            if usage is not None:
+                self._memory[prefix].append(usage)
+
+    def _handle_orphans(self, node, keys: list) -> None:
+        """Count, and optionally delete, the keys of revoked or deleted sessions."""
+        key_sessions = {}
+        for key in keys:
+            session_id = self._session_id(key)
+            if session_id is not None:
+                key_sessions[key] = session_id
+        if not key_sessions:
+            return
+
+        active = {
+            str(session_id)
+            for session_id in Session.objects.filter(
+                id__in=set(key_sessions.values()),
+                revoked=False,
+            ).values_list("id", flat=True)
+        }
+        orphans = [key for key, session_id in key_sessions.items() if session_id not in active]
+        for key in orphans:
+            self._orphans[self._prefix(key)] += 1
+
+        if not self._options["delete_orphans"]:
+            return
+        batch_size = self._options["batch_size"]
+        for start in range(0, len(orphans), batch_size):
+            pipeline = node.pipeline(transaction=False)
+            for key in orphans[start:start + batch_size]:
+                pipeline.unlink(key)
+            self._deleted += sum(pipeline.execute())
+            time.sleep(self._options["sleep"])
+
+    def _session_id(self, key: str):
+        """Return the id of the session a key belongs to, if any.
+
+        Args:
+            key (str): The Redis key.
+
+        Returns:
+            str or None: The session id, or None for keys not tied to a session.
+        """
+        prefix, _, rest = key.partition(":")
+        if prefix == "access_token":
+            try:
+                session_id = decode_token(token=rest, verify=False).get("session_id")
+            except InvalidTokenError:
+                return None
+        elif prefix in SESSION_KEY_PREFIXES:
+            # refresh:{<session id>}:lock and refresh:{<session id>}:result
+            session_id = rest.split(":", 1)[0].strip("{}")
+        else:
+            return None
+
+        if not session_id:
+            return None
+        try:
+            return str(Session._meta.pk.to_python(session_id))
+        except ValidationError:
+            return None
+
+    def _prefix(self, key: str) -> str:
+        return key.split(":", 1)[0]
+
+    def _ttl_bucket(self, ttl: int) -> str:
+        if ttl < 0:
+            return NO_EXPIRY_LABEL
+        for bound, label in zip(TTL_BUCKETS, TTL_BUCKET_LABELS):
+            if ttl < bound:
+                return label
+        return TTL_BUCKET_LABELS[-1]
+
+    def _report(self) -> None:
+        labels = TTL_BUCKET_LABELS + [NO_EXPIRY_LABEL]
+        header = f"{'prefix':<24}{'keys':>10}{'avg bytes':>12}{'est. MiB':>11}" + "".join(
+            f"{label:>9}" for label in labels
+        )
+        self.stdout.write(header)
+
+        total_keys = 0
+        total_bytes = 0.0
+        for prefix, count in self._counts.most_common():
+            samples = self._memory[prefix]
+            average = sum(samples) / len(samples) if samples else 0.0
+            estimated = average * count
+            total_keys += count
+            total_bytes += estimated
+            self.stdout.write(
+                f"{prefix:<24}{count:>10}{average:>12.0f}{estimated / 2**20:>11.2f}"
+                + "".join(f"{self._ttls[prefix][label]:>9}" for label in labels)
+            )
+        self.stdout.write(f"{'total':<24}{total_keys:>10}{'':>12}{total_bytes / 2**20:>11.2f}")
+
+        if self._options["find_orphans"] or self._options["delete_orphans"]:
+            for prefix, count in self._orphans.most_common():
+                self.stdout.write(f"Orphaned {prefix} keys: {count}")
+            self.stdout.write(f"Orphaned keys: {sum(self._orphans.values())}")
+        if self._options["delete_orphans"]:
+            self.stdout.write(f"Deleted {self._deleted} orphaned keys.")
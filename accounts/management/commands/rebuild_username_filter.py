@@ -0,0 +1,47 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from utils import redis_client_ins, username_filter_ins
+
+
+class Command(BaseCommand):
+    """Build the Redis Bloom filter of taken usernames from the `User` table.
+
+    Run it once before enabling username availability checks, and again after
+    changing USERNAME_FILTER_CAPACITY or USERNAME_FILTER_ERROR_RATE. Usernames
+    are streamed from the database, and the new filter replaces the old one
+    atomically. Users who signed up while the filter was being built are
+    added again afterwards, so no signup is lost.
+    """
+
+    help = "Rebuild the Redis Bloom filter of taken usernames."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10000,
+            help="Number of usernames per database fetch and Redis pipeline.",
+        )
+
+    def handle(self, *args, **options):
+        if redis_client_ins is None:
+            self.stderr.write("Redis is not available.")
+            return
+
+        started = timezone.now()
+        usernames = User.objects.order_by().values_list("username", flat=True)
+        count = username_filter_ins.rebuild(
+            usernames.iterator(chunk_size=options["batch_size"]),
+            batch_size=options["batch_size"],
+        )
+
+        # Signups during the rebuild were added to the filter that was just replaced
+        for username in usernames.filter(date_joined__gte=started):
+            username_filter_ins.add(username)
+
+        self.stdout.write(
+            f"Added {count} usernames to a filter of {username_filter_ins.size} bits "
+            f"with {username_filter_ins.hash_count} hash functions."
+        )
@@ -0,0 +1,49 @@
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from ...introspection.service import create_server
+
+
+class Command(BaseCommand):
+    """Serve the gRPC token introspection service.
+
+    Run it next to the Gunicorn server, with the same settings, so internal
+    services can validate tokens without going through the HTTP API. SIGTERM
+    and SIGINT stop the server after in-flight RPCs finish, within
+    `--grace` seconds.
+    """
+
+    help = "Serve the gRPC token introspection service."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--address",
+            default=settings.GRPC_INTROSPECTION_ADDRESS,
+            help="Address to listen on.",
+        )
+        parser.add_argument(
+            "--max-workers",
+            type=int,
+            default=settings.GRPC_INTROSPECTION_MAX_WORKERS,
+            help="Number of threads serving RPCs.",
+        )
+        parser.add_argument(
+            "--grace",
+            type=float,
+            default=5.0,
+            help="Seconds to let in-flight RPCs finish on shutdown.",
+        )
+
+    def handle(self, *args, **options):
+        server, port = create_server(address=options["address"], max_workers=options["max_workers"])
+        server.start()
+        self.stdout.write(f"Serving token introspection on {options['address']} (port {port}).")
+
+        def stop(signum, frame):
+            server.stop(options["grace"])
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+        server.wait_for_termination()
@@ -1,8 +1,31 @@
+import random
+import time
+
+from django.conf import settings
+from django.db import connection
 from django.http import JsonResponse
+from django.urls import Resolver404, resolve
 from rest_framework import status
-from jwt import InvalidTokenError
+from jwt import ExpiredSignatureError, InvalidTokenError
 
-from utils import redis_client_ins, extract_token
+from utils import (
+    AuthContext,
+    auth_logger_ins,
+    extract_token,
+    is_profiling_request_signed,
+    request_profiler_ins,
+    PROFILING_HEADER,
+    RESULT_DENIED,
+    RESULT_ERROR,
+    RESULT_FAILURE,
+    RESULT_SUCCESS,
+    session_activity_tracker_ins,
+    shared_token_cache_ins,
+    start_span,
+    start_trace,
+    trace_database_query,
+    validate_access_token,
+)
 
 
 # Constants for response status codes and messages
@@ -20,16 +43,128 @@ EXCLUDED_PATHS = {
     "/api/auth/login/",
     "/api/auth/refresh-token/",
     "/api/auth/validate-token/",
+    "/api/auth/username-available/",
 }
 
 
+class TracingMiddleware:
+    """Middleware that traces each request when TRACING_ENABLED is set.
+
+    It starts the root span of the request, continuing the trace of an incoming
+    W3C `traceparent` header, and records every database query of the request
+    as a child span. Redis commands and JWT signing and verification add their
+    own spans. Finished traces are exported by `utils.tracing.SpanExporter`.
+
+    Attributes:
+        get_response (callable): The next middleware or view to handle the request.
+    """
+
+    def __init__(self, get_response):
+        """Initialize the middleware with the next response handler.
+
+        Args:
+            get_response (callable): The next middleware or view.
+        """
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """Process an incoming HTTP request inside a root span.
+
+        Args:
+            request (HttpRequest): The incoming HTTP request.
+
+        Returns:
+            HttpResponse: The HTTP response after processing.
+        """
+        with start_trace(
+            f"{request.method} {request.path}",
+            traceparent=request.headers.get("traceparent"),
+            **{"http.method": request.method, "http.target": request.path},
+        ) as span:
+            if span is None:
+                return self.get_response(request)
+
+            with connection.execute_wrapper(trace_database_query):
+                response = self.get_response(request)
+            span.set_attribute("http.status_code", response.status_code)
+            if response.status_code >= 500:
+                span.set_error(f"HTTP {response.status_code}")
+            return response
+
+
+class ProfilingMiddleware:
+    """Middleware that profiles requests to the views of `accounts.views`.
+
+    A request is profiled when PROFILING_ENABLED is set and it falls in the
+    PROFILING_SAMPLE_RATE fraction, or when it carries a valid signed
+    `X-Profile-Request` header (see `utils.sign_profiling_request`).
+    Profiles are aggregated per endpoint by `utils.profiler.RequestProfiler`.
+    A request that is not profiled costs one setting check and one header lookup.
+
+    Attributes:
+        get_response (callable): The next middleware or view to handle the request.
+    """
+
+    def __init__(self, get_response):
+        """Initialize the middleware with the next response handler.
+
+        Args:
+            get_response (callable): The next middleware or view.
+        """
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """Process an incoming HTTP request, profiling it if selected.
+
+        Args:
+            request (HttpRequest): The incoming HTTP request.
+
+        Returns:
+            HttpResponse: The HTTP response after processing.
+        """
+        signed_header = request.headers.get(PROFILING_HEADER)
+        if not (settings.PROFILING_ENABLED or signed_header):
+            return self.get_response(request)
+
+        endpoint = self._get_endpoint(request)
+        if endpoint is None:
+            return self.get_response(request)
+
+        if signed_header and is_profiling_request_signed(signed_header):
+            selected = True
+        else:
+            selected = settings.PROFILING_ENABLED and random.random() < settings.PROFILING_SAMPLE_RATE
+        if not selected:
+            return self.get_response(request)
+
+        return request_profiler_ins.profile(endpoint, self.get_response, request)
+
+    def _get_endpoint(self, request):
+        """Return the URL name of the request if it is served by `accounts.views`.
+
+        Args:
+            request (HttpRequest): The incoming HTTP request.
+
+        Returns:
+            str or None: The URL name, or None if the request is out of scope.
+        """
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return None
+        if not match.func.__module__.startswith("accounts.views") or not match.url_name:
+            return None
+        return match.url_name
+
+
 class TokenMiddleware:
     """Middleware to handle JWT token validation for specific API endpoints.
 
     This middleware intercepts incoming HTTP requests to authentication-related
     endpoints and validates the JWT token provided in the Authorization header.
     If the token is invalid or missing, an unauthorized response is returned.
-    Certain endpoints are excluded from token validation.
+    Certain endpoints are excluded from token validation. The outcome and
+    latency of every authentication request are written to the access log.
 
     Attributes:
         get_response (callable): The next middleware or view to handle the request.
@@ -53,22 +188,62 @@ class TokenMiddleware:
             HttpResponse: The HTTP response after processing.
         """
         # Only process paths that start with '/api/auth/'
-        if request.path.startswith("/api/auth/"):
+        if not request.path.startswith("/api/auth/"):
+            return self.get_response(request)
+
+        started = time.perf_counter()
+        response = None
+        try:
             # Skip token validation for excluded authentication endpoints
             if request.path not in EXCLUDED_PATHS:
-                is_valid, response = self._validate_token(request)
+                with start_span("TokenMiddleware"):
+                    is_valid, response = self._validate_token(request)
                 if not is_valid:
                     return response  # Return error response if token is invalid
 
-        # Proceed to the next middleware or view
-        response = self.get_response(request)
-        return response
+            # Proceed to the next middleware or view
+            response = self.get_response(request)
+            return response
+        finally:
+            self._log_access(request, response, started)
+
+    def _log_access(self, request, response, started):
+        """Write the outcome of an authentication request to the access log.
+
+        Args:
+            request (HttpRequest): The incoming HTTP request.
+            response (HttpResponse or None): The response, or None if handling failed.
+            started (float): `time.perf_counter()` when handling started.
+        """
+        status_code = response.status_code if response is not None else 500
+        if status_code < 400:
+            result = RESULT_SUCCESS
+        elif status_code in (401, 403):
+            result = RESULT_DENIED
+        elif status_code >= 500:
+            result = RESULT_ERROR
+        else:
+            result = RESULT_FAILURE
+
+        reason = getattr(response, "auth_reason", None) or ("ok" if status_code < 400 else f"http_{status_code}")
+        auth_context = getattr(request, "auth_context", None)
+        auth_logger_ins.access(
+            endpoint=request.path,
+            result=result,
+            latency_ms=(time.perf_counter() - started) * 1000,
+            reason=reason,
+            method=request.method,
+            status=status_code,
+            user_id=auth_context.user_id if auth_context is not None else None,
+        )
 
     def _validate_token(self, request):
         """Validate the JWT token present in the request's Authorization header.
 
         This method extracts the token from the Authorization header, verifies its
-        validity by checking against Redis, and handles errors appropriately.
+        validity according to the configured token validation mode, stores the
+        token and its claims as `request.auth_context`, records activity on its
+        session, and handles errors appropriately.
 
         Args:
             request (HttpRequest): The incoming HTTP request.
@@ -80,31 +255,49 @@ class TokenMiddleware:
         """
         auth_header = request.headers.get("Authorization")
         if not auth_header:
-            return False, self._unauthorized_response("Authorization header missing.")
+            return False, self._unauthorized_response("Authorization header missing.", "missing_authorization")
 
         try:
             # Extract the token from the Authorization header
             token = extract_token(auth_header=auth_header)
-            # Retrieve token validity status from Redis
-            token_value = redis_client_ins.get_access_token(token=token)
 
-            if token_value != b"valid":
-                return False, self._unauthorized_response("Invalid or expired token.")
+            # Tokens validated recently by any worker of this node are trusted as is
+            payload = shared_token_cache_ins.get(token=token)
+            if payload is None:
+                # Check token validity against the token store or the revocation denylist
+                payload = validate_access_token(token=token)
+                if payload is None:
+                    return False, self._unauthorized_response("Invalid or expired token.", "token_not_valid")
+
+                shared_token_cache_ins.set(
+                    token=token,
+                    user_id=payload.get("user_id"),
+                    session_id=payload.get("session_id"),
+                    expires_at=payload.get("exp", 0),
+                )
+
+            # Views read the token and its claims from here instead of decoding it again
+            request.auth_context = AuthContext(token=token, claims=payload)
+            session_activity_tracker_ins.touch(session_id=payload.get("session_id"))
+
+        except ExpiredSignatureError:
+            return False, self._unauthorized_response("Invalid token.", "token_expired")
 
         except InvalidTokenError:
-            return False, self._unauthorized_response("Invalid token.")
+            return False, self._unauthorized_response("Invalid token.", "invalid_token")
 
         except Exception:
-            # TODO: Log unexpected exceptions here
-            return False, self._unauthorized_response("Invalid authentication token.")
+            auth_logger_ins.error(endpoint=request.path, reason="token_validation_error")
+            return False, self._unauthorized_response("Invalid authentication token.", "token_validation_error")
 
         return True, None
 
-    def _unauthorized_response(self, error_message):
+    def _unauthorized_response(self, error_message, reason):
         """Generate a standardized unauthorized JSON response.
 
         Args:
             error_message (str): A descriptive error message.
+            reason (str): The reason code written to the access log.
 
         Returns:
             JsonResponse: A JSON response with error details and HTTP 401 status.
@@ -112,4 +305,6 @@ class TokenMiddleware:
         # Create a copy of the error response template to avoid mutation
         response_data = ERROR_RESPONSE_TEMPLATE.copy()
         response_data["error"] = error_message
-        return JsonResponse(response_data, status=UNAUTHORIZED_STATUS)
+        response = JsonResponse(response_data, status=UNAUTHORIZED_STATUS)
+        response.auth_reason = reason
+        return response
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.16 on 2026-10-19 05:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='session',
+            name='last_seen_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
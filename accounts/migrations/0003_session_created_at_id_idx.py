@@ -0,0 +1,17 @@
+# Generated by Django 4.2.16 on 2026-10-19 05:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_session_last_seen_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='session',
+            index=models.Index(fields=['created_at', 'id'], name='session_created_at_id_idx'),
+        ),
+    ]
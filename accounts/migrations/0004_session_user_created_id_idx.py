@@ -0,0 +1,17 @@
+# Generated by Django 4.2.16 on 2026-10-19 05:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_session_created_at_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='session',
+            index=models.Index(fields=['user', 'created_at', 'id'], name='session_user_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.16 on 2026-10-19 06:11
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_session_user_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='session',
+            options={'permissions': [('issue_bulk_tokens', 'Can issue access tokens for other users in bulk')]},
+        ),
+    ]
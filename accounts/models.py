@@ -6,7 +6,17 @@ class Session(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='sessions')
     created_at = models.DateTimeField(auto_now_add=True)
+    last_seen_at = models.DateTimeField(null=True, blank=True, db_index=True)
     revoked = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='session_created_at_id_idx'),
+            models.Index(fields=['user', 'created_at', 'id'], name='session_user_created_id_idx'),
+        ]
+        permissions = [
+            ('issue_bulk_tokens', 'Can issue access tokens for other users in bulk'),
+        ]
+
     def __str__(self):
         return f"Session {self.id} for {self.user.username}"
@@ -1,5 +1,6 @@
 # accounts/serializers.py
 
+from django.conf import settings
 from django.contrib.auth.models import User
 from rest_framework import serializers
 from .models import Session
@@ -19,6 +20,12 @@ class SignupSerializer(serializers.ModelSerializer):
         )
         return user
 
+class UsernameAvailabilitySerializer(serializers.Serializer):
+    username = serializers.CharField(
+        max_length=User._meta.get_field('username').max_length,
+        validators=User._meta.get_field('username').validators,
+    )
+
 class LogoutSerializer(serializers.Serializer):
     pass
 
@@ -35,4 +42,16 @@ class RefreshTokenSerializer(serializers.Serializer):
     refresh = serializers.CharField()
 
 class TokenValidationSerializer(serializers.Serializer):
-    token = serializers.CharField()
\ No newline at end of file
+    token = serializers.CharField()
+
+class BulkTokenIssueSerializer(serializers.Serializer):
+    user_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        min_length=1,
+        max_length=settings.BULK_TOKEN_MAX_COUNT,
+    )
+
+class SessionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Session
+        fields = ('id', 'created_at', 'last_seen_at', 'revoked')
\ No newline at end of file
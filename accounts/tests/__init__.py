@@ -1,6 +1,24 @@
 from . import (
+    test_auth_events,
+    test_auth_logging,
+    test_bulk_token_issue_view,
+    test_flush_session_activity,
+    test_inspect_token_store,
+    test_introspection,
     test_login_view,
+    test_logout_view,
+    test_password_hashers,
+    test_profiling,
     test_refresh_token_view,
+    test_session_admin,
+    test_session_list_view,
+    test_sharded_redis,
+    test_shared_token_cache,
     test_signup_view,
+    test_token_store,
     test_token_validation_view,
+    test_tracing,
+    test_username_availability_view,
+    test_warmup,
+    test_without_redis,
 )
@@ -26,15 +26,15 @@ def create_session(db, create_user):
 
 @pytest.fixture
 def mock_encode_token():
-    with patch('authentication.utils.encode_token') as mock:
+    with patch('utils.encode_token') as mock:
         yield mock
 
 @pytest.fixture
 def mock_decode_token():
-    with patch('authentication.utils.decode_token') as mock:
+    with patch('utils.decode_token') as mock:
         yield mock
 
 @pytest.fixture
-def mock_redis_client():
-    with patch('authentication.utils.redis_client_ins') as mock:
+def mock_token_store():
+    with patch('utils.token_registry.token_store_ins') as mock:
         yield mock
\ No newline at end of file
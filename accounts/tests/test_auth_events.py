@@ -0,0 +1,68 @@
+# tests/test_auth_events.py
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.test import override_settings
+
+from utils.auth_events import AuthEventPublisher
+
+
+@pytest.fixture
+def publisher():
+    with override_settings(AUTH_EVENTS_ENABLED=True, AUTH_EVENT_BUFFER_SIZE=4, AUTH_EVENT_BATCH_SIZE=2):
+        publisher = AuthEventPublisher()
+        with patch('utils.auth_events.redis_client_ins', MagicMock()), \
+                patch.object(publisher, '_ensure_thread'):
+            yield publisher
+
+
+def _events(publisher):
+    return [entry["event"] for entry in publisher._buffer]
+
+
+def test_failed_flush_keeps_events(publisher):
+    # Arrange
+    publisher.publish("e0")
+    publisher.publish("e1")
+
+    # Act
+    with patch.object(publisher, '_write', side_effect=ConnectionError):
+        publisher.flush()
+
+    # Assert
+    assert _events(publisher) == ["e0", "e1"]
+    assert publisher.dropped == 0
+
+
+def test_failed_flush_with_full_buffer_drops_oldest_events(publisher):
+    # Arrange
+    for name in ("e0", "e1", "e2", "e3"):
+        publisher.publish(name)
+
+    def fail_after_new_events(batch):
+        # Requests keep publishing while the batch is being written
+        publisher.publish("e4")
+        publisher.publish("e5")
+        raise ConnectionError
+
+    # Act
+    with patch.object(publisher, '_write', side_effect=fail_after_new_events):
+        publisher.flush()
+
+    # Assert
+    assert _events(publisher) == ["e2", "e3", "e4", "e5"]
+    assert publisher.dropped == 2
+
+
+def test_publish_into_full_buffer_counts_drop(publisher):
+    # Arrange
+    for name in ("e0", "e1", "e2", "e3"):
+        publisher.publish(name)
+
+    # Act
+    publisher.publish("e4")
+
+    # Assert
+    assert _events(publisher) == ["e1", "e2", "e3", "e4"]
+    assert publisher.dropped == 1
@@ -0,0 +1,55 @@
+# tests/test_auth_logging.py
+
+import json
+
+import pytest
+from django.test import override_settings
+from django.urls import reverse
+
+from utils import auth_logger_ins
+from .fixtures.common_fixtures import api_client
+
+
+def read_entries(log_path):
+    # Wait for the background writer to drain the queue
+    auth_logger_ins.stop()
+    return [json.loads(line) for line in log_path.read_text().splitlines()]
+
+
+@pytest.mark.django_db
+def test_missing_authorization_is_logged_as_denied(api_client, tmp_path):
+    # Arrange
+    log_path = tmp_path / "auth.log"
+
+    # Act
+    with override_settings(AUTH_LOG_PATH=str(log_path)):
+        auth_logger_ins.stop()
+        api_client.get(reverse('session-list'))
+        entries = read_entries(log_path)
+
+    # Assert
+    assert len(entries) == 1
+    entry = entries[0]
+    assert entry["endpoint"] == reverse('session-list')
+    assert entry["method"] == "GET"
+    assert entry["status"] == 401
+    assert entry["result"] == "denied"
+    assert entry["reason"] == "missing_authorization"
+    assert entry["latency_ms"] >= 0
+    assert entry["sample_rate"] == 1.0
+
+
+@pytest.mark.django_db
+def test_successful_requests_are_sampled(api_client, tmp_path):
+    # Arrange
+    log_path = tmp_path / "auth.log"
+
+    # Act
+    with override_settings(AUTH_LOG_PATH=str(log_path), AUTH_LOG_SUCCESS_SAMPLE_RATE=0.0):
+        auth_logger_ins.stop()
+        auth_logger_ins.access(endpoint="/api/auth/login/", result="success", latency_ms=1.0, reason="ok")
+        auth_logger_ins.access(endpoint="/api/auth/login/", result="denied", latency_ms=1.0, reason="http_401")
+        entries = read_entries(log_path)
+
+    # Assert
+    assert [entry["result"] for entry in entries] == ["denied"]
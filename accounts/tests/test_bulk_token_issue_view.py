@@ -0,0 +1,233 @@
+# tests/views/test_bulk_token_issue_view.py
+
+import json
+
+import pytest
+from django.contrib.auth.models import Permission
+from django.urls import reverse
+from rest_framework import status
+from unittest.mock import patch
+from datetime import datetime, timedelta
+from django.conf import settings
+from django.test import override_settings
+from utils import decode_token, encode_token
+from utils.tracing import span_exporter_ins
+from ..models import Session
+from .fixtures.common_fixtures import api_client, create_user, create_session
+
+
+def _grant_bulk_token_permission(user):
+    user.user_permissions.add(Permission.objects.get(codename='issue_bulk_tokens'))
+
+
+def _authorize(api_client, user, session):
+    token = encode_token(payload={
+        "user_id": user.id,
+        "session_id": str(session.id),
+        "exp": datetime.utcnow() + timedelta(seconds=settings.ACCESS_TOKEN_EXPIRATION_SECONDS),
+        "type": "access"
+    })
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+
+@pytest.mark.django_db
+@patch('accounts.views.bulk_token_issue.user_session_index_ins')
+@patch('accounts.views.bulk_token_issue.register_access_tokens')
+@patch('utils.session_activity_tracker_ins.touch')
+@patch('accounts.middleware.validate_access_token', side_effect=lambda token: decode_token(token=token, verify=False))
+def test_bulk_token_issue_success(mock_validate, mock_touch, mock_register_access_tokens, mock_user_session_index, api_client, create_user, create_session):
+    # Arrange
+    url = reverse('bulk-token-issue')
+    service = create_user(username='service', password='testpassword')
+    _grant_bulk_token_permission(service)
+    _authorize(api_client, service, create_session(user=service))
+    first = create_user(username='first', password='testpassword')
+    second = create_user(username='second', password='testpassword')
+
+    data = {
+        "user_ids": [second.id, first.id, second.id]
+    }
+
+    # Act
+    response = api_client.post(url, data, format='json')
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    tokens = response.data['data']
+    assert [item['user_id'] for item in tokens] == [second.id, first.id, second.id]
+    for item in tokens:
+        payload = decode_token(token=item['access'])
+        assert payload['user_id'] == item['user_id']
+        assert payload['session_id'] == item['session_id']
+        assert payload['type'] == 'access'
+    assert Session.objects.filter(user__in=[first, second]).count() == 3
+    mock_register_access_tokens.assert_called_once_with(
+        tokens=[(item['access'], item['session_id']) for item in tokens],
+    )
+
+
+@pytest.mark.django_db
+@patch('utils.session_activity_tracker_ins.touch')
+@patch('accounts.middleware.validate_access_token', side_effect=lambda token: decode_token(token=token, verify=False))
+def test_bulk_token_issue_requires_permission(mock_validate, mock_touch, api_client, create_user, create_session):
+    # Arrange
+    url = reverse('bulk-token-issue')
+    user = create_user(username='testuser', password='testpassword')
+    user.is_staff = True
+    user.save()
+    _authorize(api_client, user, create_session(user=user))
+
+    data = {
+        "user_ids": [user.id]
+    }
+
+    # Act
+    response = api_client.post(url, data, format='json')
+
+    # Assert
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert Session.objects.count() == 1
+
+
+@pytest.mark.django_db
+@patch('utils.session_activity_tracker_ins.touch')
+@patch('accounts.middleware.validate_access_token', side_effect=lambda token: decode_token(token=token, verify=False))
+def test_bulk_token_issue_unknown_users(mock_validate, mock_touch, api_client, create_user, create_session):
+    # Arrange
+    url = reverse('bulk-token-issue')
+    service = create_user(username='service', password='testpassword')
+    _grant_bulk_token_permission(service)
+    _authorize(api_client, service, create_session(user=service))
+
+    data = {
+        "user_ids": [service.id, 999999]
+    }
+
+    # Act
+    response = api_client.post(url, data, format='json')
+
+    # Assert
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data['error'] == "Unknown, inactive or superuser user ids: 999999."
+
+
+@pytest.mark.django_db
+@patch('utils.session_activity_tracker_ins.touch')
+@patch('accounts.middleware.validate_access_token', side_effect=lambda token: decode_token(token=token, verify=False))
+def test_bulk_token_issue_rejects_inactive_and_superuser_targets(mock_validate, mock_touch, api_client, create_user, create_session):
+    # Arrange
+    url = reverse('bulk-token-issue')
+    service = create_user(username='service', password='testpassword')
+    _grant_bulk_token_permission(service)
+    _authorize(api_client, service, create_session(user=service))
+    inactive = create_user(username='inactive', password='testpassword')
+    inactive.is_active = False
+    inactive.save()
+    admin = create_user(username='admin', password='testpassword')
+    admin.is_superuser = True
+    admin.save()
+
+    data = {
+        "user_ids": [inactive.id, admin.id]
+    }
+
+    # Act
+    response = api_client.post(url, data, format='json')
+
+    # Assert
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data['error'] == f"Unknown, inactive or superuser user ids: {inactive.id}, {admin.id}."
+    assert Session.objects.filter(user__in=[inactive, admin]).count() == 0
+
+
+@pytest.mark.django_db
+@patch('accounts.views.bulk_token_issue.user_session_index_ins')
+@patch('accounts.views.bulk_token_issue.register_access_tokens')
+@patch('utils.session_activity_tracker_ins.touch')
+@patch('accounts.middleware.validate_access_token', side_effect=lambda token: decode_token(token=token, verify=False))
+def test_bulk_token_issue_allows_superuser_caller(mock_validate, mock_touch, mock_register_access_tokens, mock_user_session_index, api_client, create_user, create_session):
+    # Arrange
+    url = reverse('bulk-token-issue')
+    admin = create_user(username='admin', password='testpassword')
+    admin.is_superuser = True
+    admin.save()
+    _authorize(api_client, admin, create_session(user=admin))
+    user = create_user(username='testuser', password='testpassword')
+
+    data = {
+        "user_ids": [user.id]
+    }
+
+    # Act
+    response = api_client.post(url, data, format='json')
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert [item['user_id'] for item in response.data['data']] == [user.id]
+
+
+
+@pytest.mark.django_db
+@patch('accounts.views.bulk_token_issue.user_session_index_ins')
+@patch('accounts.views.bulk_token_issue.register_access_tokens')
+@patch('utils.session_activity_tracker_ins.touch')
+@patch('accounts.middleware.validate_access_token', side_effect=lambda token: decode_token(token=token, verify=False))
+def test_bulk_token_issue_signing_spans_join_request_trace(mock_validate, mock_touch, mock_register_access_tokens, mock_user_session_index, api_client, create_user, create_session, tmp_path):
+    # Arrange
+    url = reverse('bulk-token-issue')
+    export_path = tmp_path / "traces.jsonl"
+    service = create_user(username='service', password='testpassword')
+    _grant_bulk_token_permission(service)
+    _authorize(api_client, service, create_session(user=service))
+    users = [create_user(username=f'user{index}', password='testpassword') for index in range(3)]
+
+    data = {
+        "user_ids": [user.id for user in users]
+    }
+
+    # Act
+    with override_settings(TRACING_ENABLED=True, TRACING_EXPORT_PATH=str(export_path)):
+        api_client.post(url, data, format='json')
+
+    # Assert
+    span_exporter_ins.flush()
+    spans = [
+        span
+        for line in export_path.read_text().splitlines()
+        for span in json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    ]
+    span_ids = {span["spanId"] for span in spans}
+    encode_spans = [span for span in spans if span["name"] == "jwt.encode"]
+    assert len(encode_spans) == 3
+    assert all(span.get("parentSpanId") in span_ids for span in encode_spans)
+
+
+@pytest.mark.django_db
+@patch('utils.user_sessions.redis_client_ins')
+@patch('accounts.views.bulk_token_issue.register_access_tokens')
+@patch('utils.session_activity_tracker_ins.touch')
+@patch('accounts.middleware.validate_access_token', side_effect=lambda token: decode_token(token=token, verify=False))
+def test_bulk_token_issue_is_exempt_from_session_limit(mock_validate, mock_touch, mock_register_access_tokens, mock_redis, api_client, create_user, create_session):
+    # Arrange
+    url = reverse('bulk-token-issue')
+    service = create_user(username='service', password='testpassword')
+    _grant_bulk_token_permission(service)
+    _authorize(api_client, service, create_session(user=service))
+    user = create_user(username='testuser', password='testpassword')
+    existing_session = create_session(user=user)
+    pipeline = mock_redis.pipeline.return_value
+
+    data = {
+        "user_ids": [user.id, user.id]
+    }
+
+    # Act
+    with override_settings(MAX_SESSIONS_PER_USER=1):
+        response = api_client.post(url, data, format='json')
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert [call.args[-1] for call in pipeline.eval.call_args_list] == [0, 0]
+    existing_session.refresh_from_db()
+    assert not existing_session.revoked
+    assert Session.objects.filter(user=user, revoked=False).count() == 3
@@ -0,0 +1,113 @@
+# tests/commands/test_flush_session_activity.py
+
+import pytest
+import time
+from datetime import timedelta
+from unittest.mock import patch
+from django.core.management import call_command
+from django.test import override_settings
+from django.conf import settings
+from django.utils import timezone
+from utils import InMemoryTokenStore
+from ..models import Session
+from .fixtures.common_fixtures import create_user, create_session
+
+
+@pytest.mark.django_db
+@patch('utils.session_activity_tracker_ins.acknowledge')
+@patch('utils.session_activity_tracker_ins.drain')
+def test_flush_session_activity_updates_last_seen(mock_drain, mock_acknowledge, create_user, create_session):
+    # Arrange
+    user = create_user(username='testuser', password='testpassword')
+    active_session = create_session(user=user)
+    idle_session = create_session(user=user)
+    last_seen = time.time()
+    mock_drain.return_value = {str(active_session.id): last_seen}
+
+    # Act
+    call_command('flush_session_activity')
+
+    # Assert
+    active_session.refresh_from_db()
+    idle_session.refresh_from_db()
+    assert active_session.last_seen_at.timestamp() == pytest.approx(last_seen, abs=1e-3)
+    assert idle_session.last_seen_at is None
+    mock_acknowledge.assert_called_once()
+
+
+@pytest.mark.django_db
+@patch('accounts.management.commands.flush_session_activity.revoke_sessions')
+@patch('utils.user_session_index_ins.remove')
+@patch('utils.session_activity_tracker_ins.drain')
+def test_flush_session_activity_expires_inactive_sessions(mock_drain, mock_remove, mock_revoke_sessions, create_user, create_session):
+    # Arrange
+    user = create_user(username='testuser', password='testpassword')
+    active_session = create_session(user=user)
+    idle_session = create_session(user=user)
+    Session.objects.filter(id=active_session.id).update(last_seen_at=timezone.now())
+    Session.objects.filter(id=idle_session.id).update(last_seen_at=timezone.now() - timedelta(hours=2))
+    mock_drain.return_value = {}
+
+    # Act
+    call_command('flush_session_activity', expire_inactive_seconds=3600)
+
+    # Assert
+    active_session.refresh_from_db()
+    idle_session.refresh_from_db()
+    assert active_session.revoked is False
+    assert idle_session.revoked is True
+    mock_remove.assert_called_once_with(sessions=[(user.id, idle_session.id)])
+    mock_revoke_sessions.assert_called_once_with(session_ids=[idle_session.id])
+
+
+@pytest.mark.django_db
+@override_settings(TOKEN_VALIDATION_MODE="allowlist")
+@patch('utils.user_session_index_ins.remove')
+@patch('utils.session_activity_tracker_ins.drain')
+def test_flush_session_activity_revokes_tokens_of_inactive_sessions(mock_drain, mock_remove, create_user, create_session):
+    # Arrange
+    user = create_user(username='testuser', password='testpassword')
+    active_session = create_session(user=user)
+    idle_session = create_session(user=user)
+    Session.objects.filter(id=active_session.id).update(last_seen_at=timezone.now())
+    Session.objects.filter(id=idle_session.id).update(last_seen_at=timezone.now() - timedelta(hours=2))
+    mock_drain.return_value = {}
+    store = InMemoryTokenStore()
+    store.set_access_token(token="active_token", session_id=str(active_session.id))
+    store.set_access_token(token="idle_token", session_id=str(idle_session.id))
+
+    # Act
+    with patch('utils.token_registry.token_store_ins', store):
+        call_command('flush_session_activity', expire_inactive_seconds=3600)
+
+    # Assert
+    assert store.get_access_token(token="active_token") == b"valid"
+    assert store.get_access_token(token="idle_token") is None
+
+
+@pytest.mark.django_db
+@override_settings(TOKEN_REVOCATION_BATCH_SIZE=2)
+@patch('accounts.management.commands.flush_session_activity.revoke_sessions')
+@patch('utils.user_session_index_ins.remove')
+@patch('utils.session_activity_tracker_ins.drain')
+def test_flush_session_activity_expires_in_batches_and_skips_expired_sessions(mock_drain, mock_remove, mock_revoke_sessions, create_user, create_session):
+    # Arrange
+    user = create_user(username='testuser', password='testpassword')
+    idle_sessions = [create_session(user=user) for _ in range(3)]
+    expired_session = create_session(user=user)
+    Session.objects.update(last_seen_at=timezone.now() - timedelta(hours=2))
+    Session.objects.filter(id=expired_session.id).update(
+        created_at=timezone.now() - timedelta(seconds=settings.REFRESH_TOKEN_EXPIRATION_SECONDS + 60),
+    )
+    mock_drain.return_value = {}
+
+    # Act
+    call_command('flush_session_activity', expire_inactive_seconds=3600)
+
+    # Assert
+    revoked_ids = [session_id for call in mock_revoke_sessions.call_args_list for session_id in call.kwargs['session_ids']]
+    assert [len(call.kwargs['session_ids']) for call in mock_revoke_sessions.call_args_list] == [2, 1]
+    assert sorted(revoked_ids) == sorted(session.id for session in idle_sessions)
+    assert Session.objects.filter(revoked=True).count() == 3
+    expired_session.refresh_from_db()
+    assert expired_session.revoked is False
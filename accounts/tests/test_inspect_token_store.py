@@ -0,0 +1,139 @@
+# tests/commands/test_inspect_token_store.py
+
+import uuid
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from redis import ResponseError
+from redis.cluster import RedisCluster
+from redis.crc import key_slot
+
+from utils import encode_token
+from .fixtures.common_fixtures import create_user, create_session
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the commands used by `inspect_token_store`."""
+
+    def __init__(self, ttls):
+        self.ttls = dict(ttls)
+        self.scan_calls = 0
+        self._results = []
+
+    def scan(self, cursor=0, match=None, count=None):
+        # Two SCAN batches, like an incremental walk of the keyspace
+        self.scan_calls += 1
+        if cursor == 0:
+            self._scanned = sorted(self.ttls)
+        half = len(self._scanned) // 2
+        if cursor == 0:
+            return 1, [key.encode() for key in self._scanned[:half]]
+        return 0, [key.encode() for key in self._scanned[half:]]
+
+    def pipeline(self, transaction=True):
+        self._results = []
+        return self
+
+    def ttl(self, key):
+        self._results.append(self.ttls.get(key, -2))
+
+    def memory_usage(self, key):
+        self._results.append(100)
+
+    def execute(self):
+        return self._results
+
+    def unlink(self, key):
+        self._results.append(int(self.ttls.pop(key, None) is not None))
+
+    def delete(self, *keys):
+        # Like a cluster node, refuse multi-key commands across hash slots
+        if len({key_slot(key.encode()) for key in keys}) > 1:
+            raise ResponseError("CROSSSLOT Keys in request don't hash to the same slot")
+        return sum(self.ttls.pop(key, None) is not None for key in keys)
+
+
+@pytest.mark.django_db
+def test_inspect_token_store_reports_counts_and_ttls(create_user, create_session):
+    # Arrange
+    fake_redis = FakeRedis({
+        "access_token:a": 30,
+        "access_token:b": 1200,
+        "user_sessions:1": 7200,
+        "{session_last_seen}": -1,
+    })
+    out = StringIO()
+
+    # Act
+    with patch('accounts.management.commands.inspect_token_store.redis_client_ins', fake_redis):
+        call_command('inspect_token_store', sleep=0, stdout=out)
+
+    # Assert
+    lines = {line.split()[0]: line.split() for line in out.getvalue().splitlines()}
+    # keys, avg bytes, MiB, <1m, <5m, <15m, <1h, <1d, >=1d, none
+    assert lines["access_token"][1:] == ["2", "100", "0.00", "1", "0", "0", "1", "0", "0", "0"]
+    assert lines["user_sessions"][1] == "1"
+    assert lines["{session_last_seen}"][-1] == "1"
+    assert lines["total"][1] == "4"
+    assert fake_redis.scan_calls == 2
+
+
+@pytest.mark.django_db
+def test_inspect_token_store_deletes_keys_of_revoked_sessions(create_user, create_session):
+    # Arrange
+    user = create_user(username='testuser', password='testpassword')
+    active_session = create_session(user=user)
+    revoked_session = create_session(user=user)
+    revoked_session.revoked = True
+    revoked_session.save()
+    deleted_session_id = uuid.uuid4()
+    revoked_token = encode_token(payload={"user_id": user.id, "session_id": str(revoked_session.id), "type": "access"})
+    active_token = encode_token(payload={"user_id": user.id, "session_id": str(active_session.id), "type": "access"})
+    fake_redis = FakeRedis({
+        f"access_token:{revoked_token}": 60,
+        f"access_token:{active_token}": 60,
+        f"session_tokens:{revoked_session.id}": 60,
+        f"session:{deleted_session_id}": 60,
+        f"session:{active_session.id}": 60,
+        f"refresh:{{{revoked_session.id}}}:result": 5,
+        f"user_sessions:{user.id}": 3600,
+    })
+    out = StringIO()
+
+    # Act
+    with patch('accounts.management.commands.inspect_token_store.redis_client_ins', fake_redis):
+        call_command('inspect_token_store', delete_orphans=True, batch_size=2, sleep=0, stdout=out)
+
+    # Assert
+    assert set(fake_redis.ttls) == {
+        f"access_token:{active_token}",
+        f"session:{active_session.id}",
+        f"user_sessions:{user.id}",
+    }
+    assert "Deleted 4 orphaned keys." in out.getvalue()
+
+
+@pytest.mark.django_db
+def test_inspect_token_store_deletes_orphans_on_redis_cluster(create_user, create_session):
+    # Arrange
+    user = create_user(username='testuser', password='testpassword')
+    active_session = create_session(user=user)
+    deleted_session_ids = [uuid.uuid4() for _ in range(4)]
+    node = FakeRedis({
+        **{f"session:{session_id}": 60 for session_id in deleted_session_ids},
+        f"session:{active_session.id}": 60,
+    })
+    cluster = RedisCluster.__new__(RedisCluster)
+    out = StringIO()
+
+    # Act
+    with patch('accounts.management.commands.inspect_token_store.redis_client_ins', cluster), \
+            patch.object(cluster, 'get_primaries', return_value=["node1"], create=True), \
+            patch.object(cluster, 'get_redis_connection', return_value=node, create=True):
+        call_command('inspect_token_store', delete_orphans=True, batch_size=10, sleep=0, stdout=out)
+
+    # Assert
+    assert set(node.ttls) == {f"session:{active_session.id}"}
+    assert "Deleted 4 orphaned keys." in out.getvalue()
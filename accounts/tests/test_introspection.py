@@ -0,0 +1,68 @@
+# tests/test_introspection.py
+
+from unittest.mock import patch
+
+import grpc
+import pytest
+from jwt import ExpiredSignatureError
+
+from ..introspection import introspection_pb2, introspection_pb2_grpc
+from ..introspection.service import create_server
+
+SESSION_ID = "0b6f2a1e-54b8-4c1e-9a53-5a8e3f4f0c11"
+CLAIMS = {"user_id": 7, "session_id": SESSION_ID, "exp": 1900000000, "type": "access"}
+
+
+def validate_access_token_side_effect(token):
+    if token == "expired":
+        raise ExpiredSignatureError()
+    return CLAIMS if token == "valid" else None
+
+
+@pytest.fixture
+def introspection_stub():
+    server, port = create_server(address="localhost:0", max_workers=2)
+    server.start()
+    channel = grpc.insecure_channel(f"localhost:{port}")
+    yield introspection_pb2_grpc.TokenIntrospectionStub(channel)
+    channel.close()
+    server.stop(None)
+
+
+@patch('accounts.introspection.service.validate_access_token')
+def test_validate_returns_claims_of_valid_token(mock_validate, introspection_stub):
+    # Arrange
+    mock_validate.side_effect = validate_access_token_side_effect
+
+    # Act
+    response = introspection_stub.Validate(introspection_pb2.ValidateRequest(token="valid"))
+
+    # Assert
+    assert response.is_valid
+    assert response.message == "Token is valid."
+    assert response.user_id == 7
+    assert response.session_id == SESSION_ID
+    assert response.expires_at == 1900000000
+    mock_validate.assert_called_once_with(token="valid")
+
+
+@patch('accounts.introspection.service.validate_access_token')
+def test_validate_stream_answers_in_request_order(mock_validate, introspection_stub):
+    # Arrange
+    mock_validate.side_effect = validate_access_token_side_effect
+    tokens = ["revoked", "valid", "expired", ""]
+
+    # Act
+    responses = list(introspection_stub.ValidateStream(
+        introspection_pb2.ValidateRequest(token=token) for token in tokens
+    ))
+
+    # Assert
+    assert [response.is_valid for response in responses] == [False, True, False, False]
+    assert [response.message for response in responses] == [
+        "Token is invalid or expired.",
+        "Token is valid.",
+        "Token has expired.",
+        "Token is invalid or expired.",
+    ]
+    assert responses[0].user_id == 0
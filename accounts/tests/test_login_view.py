@@ -4,7 +4,12 @@ import pytest
 from django.urls import reverse
 from rest_framework import status
 from unittest.mock import MagicMock, patch
+from django.test import override_settings
+from redis.cluster import RedisCluster
+from utils import user_session_index_ins
+from utils.user_sessions import ADD_SESSION_SCRIPT
 from ..models import Session
+from ..views import LoginView
 from .fixtures.common_fixtures import api_client, create_user
 
 @pytest.mark.django_db
@@ -40,7 +45,7 @@ def test_login_success(mock_set_access_token, mock_encode_token, mock_create_ses
     assert 'refresh' in response.data['data']
     assert response.data['data']['access'] == 'token_access'
     assert response.data['data']['refresh'] == 'token_refresh'
-    mock_set_access_token.assert_called_with(token='token_access')
+    mock_set_access_token.assert_called_with(token='token_access', session_id='session123')
 
 
 @pytest.mark.django_db
@@ -81,4 +86,120 @@ def test_login_authentication_failure(mock_authenticate_user, api_client, create
     # Assert
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
     assert response.data['data'] is None
-    assert response.data['error'] == "Invalid credentials."
\ No newline at end of file
+    assert response.data['error'] == "Invalid credentials."
+
+@pytest.mark.django_db
+@patch('accounts.views.LoginView._generate_refresh_token')
+@patch('accounts.views.LoginView._generate_access_token')
+@patch('accounts.views.LoginView._create_session')
+def test_login_upgrades_password_hash_parameters(mock_create_session, mock_generate_access_token, mock_generate_refresh_token, api_client, create_user):
+    # Arrange
+    url = reverse('login')
+    with override_settings(PASSWORD_PBKDF2_ITERATIONS=1000):
+        user = create_user(username='testuser', password='testpassword')
+    mock_generate_access_token.return_value = 'token_access'
+    mock_generate_refresh_token.return_value = 'token_refresh'
+
+    data = {
+        "username": "testuser",
+        "password": "testpassword"
+    }
+
+    # Act
+    with override_settings(PASSWORD_PBKDF2_ITERATIONS=2000):
+        response = api_client.post(url, data, format='json')
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    user.refresh_from_db()
+    assert user.password.startswith('pbkdf2_sha256$2000$')
+
+
+@pytest.mark.django_db
+@patch('accounts.views.login.revoke_sessions')
+@patch('accounts.views.login.user_session_index_ins')
+def test_login_evicts_oldest_sessions_over_limit(mock_session_index, mock_revoke_sessions, api_client, create_user):
+    # Arrange
+    user = create_user(username='testuser', password='testpassword')
+    oldest_session = Session.objects.create(user=user)
+    newer_session = Session.objects.create(user=user)
+    mock_session_index.add.return_value = [str(oldest_session.id)]
+
+    # Act
+    with override_settings(MAX_SESSIONS_PER_USER=2):
+        session = LoginView()._create_session(user)
+
+    # Assert
+    assert mock_session_index.add.call_args.kwargs["limit"] == 2
+    mock_revoke_sessions.assert_called_once_with(session_ids=[str(oldest_session.id)])
+    oldest_session.refresh_from_db()
+    newer_session.refresh_from_db()
+    assert oldest_session.revoked
+    assert not newer_session.revoked
+    assert not Session.objects.get(id=session.id).revoked
+
+
+@patch('utils.user_sessions.redis_client_ins')
+def test_session_index_trims_to_limit_in_one_script(mock_redis):
+    # Arrange
+    mock_redis.eval.return_value = [b"oldest"]
+
+    # Act
+    evicted = user_session_index_ins.add(user_id=1, session_id="newest", created_at=1.0, limit=3)
+
+    # Assert
+    assert evicted == ["oldest"]
+    mock_redis.eval.assert_called_once()
+    script, numkeys, key, session_id, created_at, _, _, limit = mock_redis.eval.call_args.args
+    assert (script, numkeys, key, session_id, created_at, limit) == (ADD_SESSION_SCRIPT, 1, "user_sessions:1", "newest", 1.0, 3)
+    mock_redis.pipeline.assert_not_called()
+
+
+def test_session_index_trims_to_limit_on_redis_cluster():
+    # Arrange
+    cluster = RedisCluster.__new__(RedisCluster)
+
+    # Act
+    with patch('utils.user_sessions.redis_client_ins', cluster), \
+            patch.object(cluster, 'eval', return_value=[b"oldest"]) as mock_eval:
+        evicted = user_session_index_ins.add(user_id=1, session_id="newest", created_at=1.0, limit=3)
+
+    # Assert
+    assert evicted == ["oldest"]
+    mock_eval.assert_called_once()
+
+
+@patch('utils.user_sessions.redis_client_ins')
+def test_session_index_reports_missing_index_as_unpopulated(mock_redis):
+    # Arrange
+    mock_redis.eval.return_value = None
+
+    # Act
+    evicted = user_session_index_ins.add(user_id=1, session_id="newest", created_at=1.0, limit=3)
+
+    # Assert
+    assert evicted is None
+
+
+@pytest.mark.django_db
+@patch('accounts.views.login.revoke_sessions')
+@patch('accounts.views.login.user_session_index_ins')
+def test_login_rebuilds_missing_index_and_enforces_limit(mock_session_index, mock_revoke_sessions, api_client, create_user):
+    # Arrange
+    user = create_user(username='testuser', password='testpassword')
+    oldest_session = Session.objects.create(user=user)
+    newer_session = Session.objects.create(user=user)
+    mock_session_index.add.return_value = None
+
+    # Act
+    with override_settings(MAX_SESSIONS_PER_USER=2):
+        session = LoginView()._create_session(user)
+
+    # Assert
+    rebuilt = mock_session_index.rebuild.call_args.kwargs
+    assert rebuilt["user_id"] == user.id
+    assert [session_id for session_id, _ in rebuilt["sessions"]] == [session.id, newer_session.id]
+    mock_revoke_sessions.assert_called_once_with(session_ids=[str(oldest_session.id)])
+    oldest_session.refresh_from_db()
+    assert oldest_session.revoked
+    assert not Session.objects.get(id=session.id).revoked
@@ -0,0 +1,42 @@
+# tests/views/test_logout_view.py
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from unittest.mock import patch
+import jwt
+from datetime import datetime, timedelta
+from django.conf import settings
+from utils import encode_token, InMemoryTokenStore
+from .fixtures.common_fixtures import api_client, create_user, create_session
+
+
+@pytest.mark.django_db
+@patch('accounts.views.logout.user_session_index_ins')
+@patch('utils.session_activity_tracker_ins.touch')
+def test_logout_decodes_token_once(mock_touch, mock_user_session_index, api_client, create_user, create_session):
+    # Arrange
+    url = reverse('logout')
+    user = create_user(username='testuser', password='testpassword')
+    session = create_session(user=user)
+    token = encode_token(payload={
+        "user_id": user.id,
+        "session_id": str(session.id),
+        "exp": datetime.utcnow() + timedelta(seconds=settings.ACCESS_TOKEN_EXPIRATION_SECONDS),
+        "type": "access"
+    })
+    store = InMemoryTokenStore()
+    store.set_access_token(token=token, session_id=str(session.id))
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    # Act
+    with patch('utils.token_registry.token_store_ins', store), \
+            patch('utils.decode_token.decode', wraps=jwt.decode) as mock_decode:
+        response = api_client.post(url)
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert mock_decode.call_count == 1
+    session.refresh_from_db()
+    assert session.revoked is True
+    assert store.get_access_token(token=token) is None
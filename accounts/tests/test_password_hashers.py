@@ -0,0 +1,60 @@
+# tests/test_password_hashers.py
+
+import pytest
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import check_password, get_hasher, identify_hasher, make_password
+from django.test import override_settings
+from .fixtures.common_fixtures import create_user
+
+
+def test_calibrated_hashers_are_not_shadowed():
+    # Arrange
+    encoded = make_password("password123")
+
+    # Act
+    hasher = identify_hasher(encoded)
+
+    # Assert
+    assert settings.PASSWORD_HASHERS[0] == f"{type(hasher).__module__}.{type(hasher).__name__}"
+
+
+def test_django_default_hashes_keep_verifying():
+    # Arrange
+    encoded = make_password("password123", hasher=get_hasher("pbkdf2_sha1"))
+
+    # Act
+    valid = check_password("password123", encoded)
+
+    # Assert
+    assert encoded.startswith("pbkdf2_sha1$")
+    assert valid is True
+
+
+@pytest.mark.parametrize('algorithm', ['argon2', 'bcrypt_sha256'])
+def test_optional_hashers_are_installed(algorithm):
+    # Arrange
+    encoded = make_password("password123", hasher=get_hasher(algorithm))
+
+    # Act
+    valid = check_password("password123", encoded)
+
+    # Assert
+    assert encoded.startswith(f"{algorithm}$")
+    assert valid is True
+
+
+@pytest.mark.django_db
+@override_settings(PASSWORD_HASH_UPGRADE=False)
+def test_other_algorithm_is_rehashed_even_without_upgrades(create_user):
+    # Arrange
+    user = create_user(username='testuser', password='testpassword')
+    user.password = make_password("testpassword", hasher=get_hasher("pbkdf2_sha1"))
+    user.save()
+
+    # Act
+    authenticate(username='testuser', password='testpassword')
+
+    # Assert
+    user.refresh_from_db()
+    assert identify_hasher(user.password).algorithm == get_hasher().algorithm
@@ -0,0 +1,63 @@
+# tests/test_profiling.py
+
+import pstats
+
+import pytest
+from django.test import override_settings
+from django.urls import reverse
+
+from utils import sign_profiling_request
+from .fixtures.common_fixtures import api_client
+
+LOGIN_DATA = {"username": "nobody", "password": "wrongpassword"}
+
+
+@pytest.mark.django_db
+def test_signed_header_profiles_request(api_client, tmp_path):
+    # Arrange
+    header = sign_profiling_request()
+
+    # Act
+    with override_settings(PROFILING_OUTPUT_DIR=str(tmp_path), PROFILING_INTERVAL_SECONDS=0.001):
+        response = api_client.post(reverse('login'), LOGIN_DATA, format='json', HTTP_X_PROFILE_REQUEST=header)
+
+    # Assert
+    assert response.status_code == 401
+    [collapsed_file] = tmp_path.glob("login.*.collapsed")
+    lines = collapsed_file.read_text().splitlines()
+    assert lines
+    for line in lines:
+        stack, count = line.rsplit(" ", 1)
+        assert int(count) > 0
+
+
+@pytest.mark.django_db
+def test_invalid_header_is_not_profiled(api_client, tmp_path):
+    # Act
+    with override_settings(PROFILING_OUTPUT_DIR=str(tmp_path)):
+        api_client.post(reverse('login'), LOGIN_DATA, format='json', HTTP_X_PROFILE_REQUEST="profile:forged")
+
+    # Assert
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.django_db
+def test_sampled_requests_are_aggregated_as_pstats(api_client, tmp_path):
+    # Act
+    with override_settings(
+        PROFILING_ENABLED=True,
+        PROFILING_SAMPLE_RATE=1.0,
+        PROFILING_FORMAT="pstats",
+        PROFILING_OUTPUT_DIR=str(tmp_path),
+    ):
+        api_client.post(reverse('login'), LOGIN_DATA, format='json')
+        api_client.post(reverse('login'), LOGIN_DATA, format='json')
+
+    # Assert
+    [stats_file] = tmp_path.glob("login.*.pstats")
+    stats = pstats.Stats(str(stats_file))
+    post_calls = [
+        calls for (filename, _, name), (calls, *_) in stats.stats.items()
+        if name == "post" and filename.endswith("login.py")
+    ]
+    assert post_calls == [2]
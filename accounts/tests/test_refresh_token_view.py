@@ -7,6 +7,9 @@ from unittest.mock import patch
 import jwt
 from datetime import datetime, timedelta
 from django.conf import settings
+from django.test import override_settings
+from utils import decode_token, encode_token, InMemoryTokenStore
+from utils.refresh_coalescer import RefreshCoalescer
 from ..models import Session  # Adjust the import based on your app name
 from .fixtures.common_fixtures import api_client, create_user, create_session
 
@@ -61,3 +64,161 @@ def test_refresh_token_wrong_type(mock_decode_token, api_client, create_user, cr
     # Assert
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
     assert response.data['error'] == "Invalid refresh token."
+
+
+@pytest.mark.django_db
+@override_settings(TOKEN_CLAIM_PROFILE='compact', REFRESH_COALESCING_ENABLED=False)
+@patch('utils.session_activity_tracker_ins.touch')
+@patch('utils.token_store.redis_client_ins')
+def test_refresh_token_compact_claims(mock_redis_client, mock_touch, api_client, create_user, create_session):
+    # Arrange
+    url = reverse('refresh-token')
+    user = create_user(username='testuser7', password='testpassword')
+    session = create_session(user=user)
+
+    refresh_token = encode_token(payload={
+        "user_id": user.id,
+        "session_id": str(session.id),
+        "exp": datetime.utcnow() + timedelta(seconds=settings.REFRESH_TOKEN_EXPIRATION_SECONDS),
+        "type": "refresh"
+    })
+
+    data = {
+        "refresh": refresh_token
+    }
+
+    # Act
+    response = api_client.post(url, data, format='json')
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    access_payload = decode_token(token=response.data['data']['access'])
+    assert access_payload['session_id'] == str(session.id)
+    assert access_payload['type'] == 'access'
+    assert 's' in jwt.decode(response.data['data']['access'], options={"verify_signature": False})
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the commands used by the refresh coalescer."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, nx=False, px=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value.encode() if isinstance(value, str) else value
+        return True
+
+    def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    def eval(self, script, numkeys, key, value):
+        # Compare-and-delete of RELEASE_LOCK_SCRIPT
+        if self.data.get(key) == value.encode():
+            return self.delete(key)
+        return 0
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def execute(self):
+        return []
+
+
+@pytest.mark.django_db
+@patch('utils.session_activity_tracker_ins.touch')
+@patch('utils.token_store.redis_client_ins')
+@patch('utils.refresh_coalescer.redis_client_ins', new_callable=FakeRedis)
+@patch('accounts.views.refresh_token.encode_token', wraps=encode_token)
+def test_refresh_token_concurrent_refreshes_share_access_token(mock_encode_token, fake_redis, mock_redis_client, mock_touch, api_client, create_user, create_session):
+    # Arrange
+    url = reverse('refresh-token')
+    user = create_user(username='testuser8', password='testpassword')
+    session = create_session(user=user)
+
+    refresh_token = encode_token(payload={
+        "user_id": user.id,
+        "session_id": str(session.id),
+        "exp": datetime.utcnow() + timedelta(seconds=settings.REFRESH_TOKEN_EXPIRATION_SECONDS),
+        "type": "refresh"
+    })
+
+    data = {
+        "refresh": refresh_token
+    }
+
+    # Act
+    first_response = api_client.post(url, data, format='json')
+    second_response = api_client.post(url, data, format='json')
+
+    # Assert
+    assert first_response.status_code == status.HTTP_200_OK
+    assert second_response.status_code == status.HTTP_200_OK
+    assert first_response.data['data']['access'] == second_response.data['data']['access']
+    mock_encode_token.assert_called_once()
+    mock_redis_client.set_access_token.assert_called_once()
+    assert f"refresh:{{{session.id}}}:lock" not in fake_redis.data
+
+
+@patch('utils.refresh_coalescer.redis_client_ins', new_callable=FakeRedis)
+def test_refresh_coalescer_keeps_lock_of_next_holder(fake_redis):
+    # Arrange
+    lock_key = "refresh:{session1}:lock"
+
+    def issue_access_token():
+        # The lock times out while the token is issued and another caller takes it
+        fake_redis.data[lock_key] = b"next-holder"
+        return "access1"
+
+    # Act
+    access_token = RefreshCoalescer().issue(session_id="session1", issue_access_token=issue_access_token)
+
+    # Assert
+    assert access_token == "access1"
+    assert fake_redis.data[lock_key] == b"next-holder"
+
+
+@patch('utils.refresh_coalescer.redis_client_ins', None)
+def test_refresh_coalescer_issues_without_redis():
+    # Act
+    access_token = RefreshCoalescer().issue(session_id="session1", issue_access_token=lambda: "access1")
+
+    # Assert
+    assert access_token == "access1"
+
+
+@pytest.mark.django_db
+@patch('utils.session_activity_tracker_ins.touch')
+@patch('utils.refresh_coalescer.redis_client_ins', new_callable=FakeRedis)
+def test_refresh_token_after_logout_within_coalescing_window(fake_redis, mock_touch, api_client, create_user, create_session):
+    # Arrange
+    user = create_user(username='testuser9', password='testpassword')
+    session = create_session(user=user)
+    refresh_token = encode_token(payload={
+        "user_id": user.id,
+        "session_id": str(session.id),
+        "exp": datetime.utcnow() + timedelta(seconds=settings.REFRESH_TOKEN_EXPIRATION_SECONDS),
+        "type": "refresh"
+    })
+    data = {
+        "refresh": refresh_token
+    }
+
+    with patch('utils.token_registry.token_store_ins', InMemoryTokenStore()):
+        first_response = api_client.post(reverse('refresh-token'), data, format='json')
+        access_token = first_response.data['data']['access']
+
+        # Act
+        logout_response = api_client.post(reverse('logout'), HTTP_AUTHORIZATION=f"Bearer {access_token}")
+        second_response = api_client.post(reverse('refresh-token'), data, format='json')
+
+    # Assert
+    assert first_response.status_code == status.HTTP_200_OK
+    assert logout_response.status_code == status.HTTP_200_OK
+    assert second_response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert second_response.data['error'] == "Session has been revoked."
+    assert f"refresh:{{{session.id}}}:result" not in fake_redis.data
@@ -0,0 +1,83 @@
+# tests/admin/test_session_admin.py
+
+import pytest
+from django.urls import reverse
+from unittest.mock import patch
+from ..models import Session
+from .fixtures.common_fixtures import create_user, create_session
+
+
+@pytest.mark.django_db
+def test_session_admin_changelist(admin_client, create_user, create_session):
+    # Arrange
+    url = reverse('admin:accounts_session_changelist')
+    user = create_user(username='testuser', password='testpassword')
+    session = create_session(user=user)
+
+    # Act
+    response = admin_client.get(url)
+
+    # Assert
+    assert response.status_code == 200
+    assert str(session.id) in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_session_admin_search_by_username(admin_client, create_user, create_session):
+    # Arrange
+    url = reverse('admin:accounts_session_changelist')
+    session = create_session(user=create_user(username='alice', password='testpassword'))
+    other_session = create_session(user=create_user(username='bob', password='testpassword'))
+
+    # Act
+    response = admin_client.get(url, {'q': 'alice'})
+
+    # Assert
+    content = response.content.decode()
+    assert str(session.id) in content
+    assert str(other_session.id) not in content
+
+
+@pytest.mark.django_db
+@patch('accounts.admin.user_session_index_ins')
+@patch('accounts.admin.revoke_sessions')
+def test_session_admin_revoke_action(mock_revoke_sessions, mock_user_session_index, admin_client, create_user, create_session):
+    # Arrange
+    url = reverse('admin:accounts_session_changelist')
+    user = create_user(username='testuser', password='testpassword')
+    session = create_session(user=user)
+    other_session = create_session(user=user)
+
+    data = {
+        'action': 'revoke_selected_sessions',
+        '_selected_action': [str(session.id)],
+    }
+
+    # Act
+    response = admin_client.post(url, data)
+
+    # Assert
+    assert response.status_code == 302
+    assert Session.objects.get(id=session.id).revoked is True
+    assert Session.objects.get(id=other_session.id).revoked is False
+    mock_revoke_sessions.assert_called_once_with(session_ids=[session.id])
+    mock_user_session_index.remove.assert_called_once_with(sessions=[(user.id, session.id)])
+
+
+@pytest.mark.django_db
+@patch('accounts.admin.SessionAdmin.list_per_page', 2)
+def test_session_admin_keyset_link_keeps_sessions_with_equal_created_at(admin_client, create_user, create_session):
+    # Arrange
+    url = reverse('admin:accounts_session_changelist')
+    user = create_user(username='testuser', password='testpassword')
+    sessions = [create_session(user=user) for _ in range(3)]
+    Session.objects.update(created_at=sessions[0].created_at)
+
+    # Act
+    first_page = admin_client.get(url)
+    second_page = admin_client.get(url + first_page.context['keyset_next_url'])
+
+    # Assert
+    shown = [session.id for page in (first_page, second_page) for session in page.context['cl'].result_list]
+    assert sorted(shown) == sorted(session.id for session in sessions)
+    assert len(set(shown)) == 3
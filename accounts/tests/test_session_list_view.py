@@ -0,0 +1,107 @@
+# tests/views/test_session_list_view.py
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from unittest.mock import MagicMock, patch
+from datetime import datetime, timedelta
+from django.conf import settings
+from utils import decode_token, encode_token
+from utils.user_sessions import EMPTY_INDEX_TTL_SECONDS, EMPTY_MARKER, REBUILD_INDEX_SCRIPT, UserSessionIndex
+from .fixtures.common_fixtures import api_client, create_user, create_session
+
+
+def _access_token(user, session):
+    return encode_token(payload={
+        "user_id": user.id,
+        "session_id": str(session.id),
+        "exp": datetime.utcnow() + timedelta(seconds=settings.ACCESS_TOKEN_EXPIRATION_SECONDS),
+        "type": "access"
+    })
+
+
+@pytest.mark.django_db
+@patch('utils.user_session_index_ins.count')
+@patch('utils.session_activity_tracker_ins.touch')
+@patch('accounts.middleware.validate_access_token', side_effect=lambda token: decode_token(token=token, verify=False))
+def test_session_list_keyset_pagination(mock_validate, mock_touch, mock_count, api_client, create_user, create_session):
+    # Arrange
+    url = reverse('session-list')
+    user = create_user(username='testuser', password='testpassword')
+    sessions = [create_session(user=user) for _ in range(3)]
+    create_session(user=create_user(username='otheruser', password='testpassword'))
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {_access_token(user, sessions[-1])}")
+
+    mock_count.return_value = 3
+
+    # Act
+    first_page = api_client.get(url, {'limit': 2})
+    second_page = api_client.get(url, {'limit': 2, 'cursor': first_page.data['data']['next_cursor']})
+
+    # Assert
+    assert first_page.status_code == status.HTTP_200_OK
+    assert first_page.data['data']['active_count'] == 3
+    assert [item['id'] for item in first_page.data['data']['results']] == [str(sessions[2].id), str(sessions[1].id)]
+    assert second_page.status_code == status.HTTP_200_OK
+    assert [item['id'] for item in second_page.data['data']['results']] == [str(sessions[0].id)]
+    assert second_page.data['data']['next_cursor'] is None
+
+
+@pytest.mark.django_db
+@patch('accounts.views.session_list.user_session_index_ins')
+@patch('utils.session_activity_tracker_ins.touch')
+@patch('accounts.middleware.validate_access_token', side_effect=lambda token: decode_token(token=token, verify=False))
+def test_session_list_rebuilds_active_count(mock_validate, mock_touch, mock_user_session_index, api_client, create_user, create_session):
+    # Arrange
+    url = reverse('session-list')
+    user = create_user(username='testuser', password='testpassword')
+    session = create_session(user=user)
+    create_session(user=user, revoked=True)
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {_access_token(user, session)}")
+
+    mock_user_session_index.count.return_value = None
+
+    # Act
+    response = api_client.get(url)
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data['data']['active_count'] == 1
+    mock_user_session_index.rebuild.assert_called_once()
+
+
+@pytest.mark.django_db
+@patch('utils.session_activity_tracker_ins.touch')
+@patch('accounts.middleware.validate_access_token', side_effect=lambda token: decode_token(token=token, verify=False))
+def test_session_list_invalid_cursor(mock_validate, mock_touch, api_client, create_user, create_session):
+    # Arrange
+    url = reverse('session-list')
+    user = create_user(username='testuser', password='testpassword')
+    session = create_session(user=user)
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {_access_token(user, session)}")
+
+    # Act
+    response = api_client.get(url, {'cursor': 'not-a-cursor'})
+
+    # Assert
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data['error'] == "Invalid cursor."
+
+
+@patch('utils.user_sessions.redis_client_ins')
+def test_rebuild_caches_zero_active_sessions(mock_redis):
+    # Arrange
+    pipeline = MagicMock()
+    mock_redis.pipeline.return_value = pipeline
+    pipeline.execute.return_value = [1, 0]
+    index = UserSessionIndex()
+
+    # Act
+    index.rebuild(user_id=7, sessions=[])
+    count = index.count(user_id=7)
+
+    # Assert
+    mock_redis.eval.assert_called_once_with(
+        REBUILD_INDEX_SCRIPT, 1, "user_sessions:7", EMPTY_INDEX_TTL_SECONDS, 0, EMPTY_MARKER,
+    )
+    assert count == 0
@@ -0,0 +1,96 @@
+# tests/utils/test_sharded_redis.py
+
+from utils.sharded_redis import ConsistentHashRing, ShardedRedis
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def __getattr__(self, command):
+        def queue(*args, **kwargs):
+            self.commands.append((command, args, kwargs))
+            return self
+        return queue
+
+    def __len__(self):
+        return len(self.commands)
+
+    def execute(self):
+        self.client.executed.append(self.commands)
+        return [getattr(self.client, command)(*args, **kwargs) for command, args, kwargs in self.commands]
+
+
+class FakeClient:
+    def __init__(self):
+        self.data = {}
+        self.executed = []
+
+    def pipeline(self, transaction=False):
+        return FakePipeline(self)
+
+    def set(self, name, value):
+        self.data[name] = value
+        return True
+
+    def get(self, name):
+        return self.data.get(name)
+
+    def delete(self, *keys):
+        return sum(1 for key in keys if self.data.pop(key, None) is not None)
+
+    def eval(self, script, numkeys, *keys_and_args):
+        return keys_and_args[0] in self.data
+
+
+def test_consistent_hash_ring_is_stable_and_honours_hash_tags():
+    # Arrange
+    ring = ConsistentHashRing(["a:6379", "b:6379", "c:6379"])
+    bigger_ring = ConsistentHashRing(["a:6379", "b:6379", "c:6379", "d:6379"])
+    keys = [f"access_token:{i}" for i in range(1000)]
+
+    # Act
+    moved = sum(1 for key in keys if ring.get_node(key) != bigger_ring.get_node(key))
+
+    # Assert
+    assert ring.get_node("{tag}") == ring.get_node("{tag}:flushing")
+    assert moved < 400  # roughly a quarter of the keys move to the new node
+
+
+def test_sharded_pipeline_groups_commands_per_node():
+    # Arrange
+    clients = {"a:6379": FakeClient(), "b:6379": FakeClient()}
+    sharded_redis = ShardedRedis(clients=clients)
+    keys = [f"access_token:{i}" for i in range(20)]
+
+    # Act
+    pipeline = sharded_redis.pipeline()
+    for key in keys:
+        pipeline.set(name=key, value="valid")
+    pipeline.delete(*keys[:5])
+    results = pipeline.execute()
+
+    # Assert
+    assert results == [True] * 20 + [5]
+    assert all(len(client.executed) == 1 for client in clients.values())
+    assert sharded_redis.get(name=keys[10]) == "valid"
+    assert sharded_redis.get(name=keys[0]) is None
+
+
+def test_sharded_pipeline_routes_eval_by_first_key():
+    # Arrange
+    clients = {"a:6379": FakeClient(), "b:6379": FakeClient()}
+    sharded_redis = ShardedRedis(clients=clients)
+    keys = [f"refresh:{{{i}}}:lock" for i in range(20)]
+    for key in keys:
+        sharded_redis.set(name=key, value="owner")
+
+    # Act
+    pipeline = sharded_redis.pipeline()
+    for key in keys:
+        pipeline.eval("script", 1, key, "owner")
+    results = pipeline.execute()
+
+    # Assert
+    assert results == [True] * 20
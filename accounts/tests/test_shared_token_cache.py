@@ -0,0 +1,107 @@
+# tests/test_shared_token_cache.py
+
+import time
+import uuid
+from unittest.mock import patch
+
+import pytest
+from django.test import override_settings
+from django.urls import reverse
+
+from utils.shared_token_cache import SharedTokenCache
+from .fixtures.common_fixtures import api_client
+
+
+@pytest.fixture
+def cache_settings(tmp_path):
+    with override_settings(
+        SHARED_TOKEN_CACHE_ENABLED=True,
+        SHARED_TOKEN_CACHE_PATH=str(tmp_path / "token_cache"),
+        SHARED_TOKEN_CACHE_SLOTS=1024,
+        SHARED_TOKEN_CACHE_TTL_SECONDS=30,
+    ):
+        yield
+
+
+def test_entries_are_visible_to_other_mappings(cache_settings):
+    # Arrange
+    writer, reader = SharedTokenCache(), SharedTokenCache()
+    session_id = str(uuid.uuid4())
+
+    # Act
+    writer.set(token="token1", user_id=7, session_id=session_id, expires_at=time.time() + 300)
+
+    # Assert
+    assert reader.get(token="token1") == {"user_id": 7, "session_id": session_id}
+    assert reader.get(token="token2") is None
+
+
+def test_entries_expire_after_ttl(cache_settings):
+    # Arrange
+    cache = SharedTokenCache()
+    cache.set(token="token1", user_id=7, session_id=str(uuid.uuid4()), expires_at=time.time() + 300)
+
+    # Act
+    with patch('utils.shared_token_cache.time.time', return_value=time.time() + 31):
+        entry = cache.get(token="token1")
+
+    # Assert
+    assert entry is None
+
+
+def test_invalidation_by_token_and_session(cache_settings):
+    # Arrange
+    cache = SharedTokenCache()
+    revoked_session, other_session = str(uuid.uuid4()), str(uuid.uuid4())
+    expires_at = time.time() + 300
+    cache.set(token="token1", user_id=1, session_id=revoked_session, expires_at=expires_at)
+    cache.set(token="token2", user_id=1, session_id=revoked_session, expires_at=expires_at)
+    cache.set(token="token3", user_id=2, session_id=other_session, expires_at=expires_at)
+    cache.set(token="token4", user_id=2, session_id=other_session, expires_at=expires_at)
+
+    # Act
+    cache.invalidate_sessions(session_ids=[revoked_session])
+    cache.invalidate(token="token4")
+
+    # Assert
+    assert cache.get(token="token1") is None
+    assert cache.get(token="token2") is None
+    assert cache.get(token="token3") == {"user_id": 2, "session_id": other_session}
+    assert cache.get(token="token4") is None
+
+
+@pytest.mark.django_db
+@patch('utils.session_activity_tracker_ins.touch')
+@patch('accounts.middleware.validate_access_token')
+def test_middleware_trusts_cached_token(mock_validate, mock_touch, api_client, cache_settings):
+    # Arrange
+    cache = SharedTokenCache()
+    session_id = str(uuid.uuid4())
+    cache.set(token="cached_token", user_id=1, session_id=session_id, expires_at=time.time() + 300)
+    api_client.credentials(HTTP_AUTHORIZATION="Bearer cached_token")
+
+    # Act
+    with patch('accounts.middleware.shared_token_cache_ins', cache):
+        api_client.post(reverse('logout'))
+
+    # Assert
+    mock_validate.assert_not_called()
+    mock_touch.assert_called_once_with(session_id=session_id)
+
+
+def test_invalidate_sessions_clears_a_whole_batch(cache_settings):
+    # Arrange
+    cache = SharedTokenCache()
+    expires_at = time.time() + 300
+    revoked_sessions = [str(uuid.uuid4()) for _ in range(50)]
+    kept_session = str(uuid.uuid4())
+    for index, session_id in enumerate(revoked_sessions):
+        cache.set(token=f"revoked{index}", user_id=1, session_id=session_id, expires_at=expires_at)
+    cache.set(token="kept", user_id=2, session_id=kept_session, expires_at=expires_at)
+
+    # Act
+    cache.invalidate_sessions(session_ids=revoked_sessions + [str(uuid.uuid4()) for _ in range(450)] + ["not-a-uuid"])
+
+    # Assert
+    assert all(cache.get(token=f"revoked{index}") is None for index in range(50))
+    assert cache.get(token="kept") == {"user_id": 2, "session_id": kept_session}
@@ -2,6 +2,7 @@ import pytest
 from django.urls import reverse
 from rest_framework import status
 from django.contrib.auth.models import User
+from unittest.mock import patch
 from .fixtures.common_fixtures import api_client, create_user
 
 @pytest.mark.django_db
@@ -55,4 +56,22 @@ def test_signup_existing_user(api_client, create_user):
     # Assert
     assert response.status_code == status.HTTP_400_BAD_REQUEST
     # Adjust based on your serializer's error structure
-    assert 'username' in response.data
\ No newline at end of file
+    assert 'username' in response.data
+
+@pytest.mark.django_db
+@patch('utils.auth_event_publisher_ins.publish')
+def test_signup_publishes_event(mock_publish, api_client):
+    # Arrange
+    url = reverse('signup')
+    data = {
+        "username": "eventuser",
+        "password": "newpassword123",
+    }
+
+    # Act
+    response = api_client.post(url, data, format='json')
+
+    # Assert
+    assert response.status_code == status.HTTP_201_CREATED
+    user = User.objects.get(username="eventuser")
+    mock_publish.assert_called_once_with("signup", user_id=user.id, username="eventuser")
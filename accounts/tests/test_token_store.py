@@ -0,0 +1,99 @@
+# tests/test_token_store.py
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from utils import InMemoryTokenStore, register_access_token, revoke_sessions
+from utils.redis_client import SLIDE_ACCESS_TOKEN_SCRIPT, TokenCommandsMixin
+from .fixtures.common_fixtures import api_client
+
+
+def test_in_memory_store_set_get_delete():
+    # Arrange
+    store = InMemoryTokenStore()
+    store.set_access_tokens(tokens=[("token1", "session1"), ("token2", "session1")])
+
+    # Act
+    store.delete_access_token(token="token1")
+
+    # Assert
+    assert store.get_access_token(token="token1") is None
+    assert store.get_access_token(token="token2", replica=True) == b"valid"
+
+
+@override_settings(ACCESS_TOKEN_EXPIRATION_SECONDS=10)
+def test_in_memory_store_entries_expire():
+    # Arrange
+    store = InMemoryTokenStore()
+    with patch('utils.token_store.time.monotonic', return_value=1000.0):
+        store.set_access_token(token="token1")
+        store.increment_session_generation(session_id="session1")
+
+    # Act
+    with patch('utils.token_store.time.monotonic', return_value=1011.0):
+        token_value = store.get_access_token(token="token1")
+        generation = store.get_session_generation(session_id="session1")
+        next_generation = store.increment_session_generation(session_id="session1")
+
+    # Assert
+    assert token_value is None
+    assert generation is None
+    assert next_generation == 1
+
+
+@pytest.mark.django_db
+def test_in_memory_store_backs_token_validation(api_client):
+    # Arrange
+    url = reverse('token-validation')
+    store = InMemoryTokenStore()
+
+    # Act
+    with patch('utils.token_registry.token_store_ins', store):
+        register_access_token(token="token1", session_id="session1")
+        valid_response = api_client.post(url, {"token": "token1"}, format='json')
+        revoke_sessions(session_ids=["session1"])
+        revoked_response = api_client.post(url, {"token": "token1"}, format='json')
+
+    # Assert
+    assert valid_response.status_code == status.HTTP_200_OK
+    assert valid_response.data['data']['is_valid'] is True
+    assert revoked_response.data['data']['is_valid'] is False
+
+
+@override_settings(ACCESS_TOKEN_EXPIRATION_SECONDS=300)
+def test_in_memory_store_slides_expiry_up_to_cap():
+    # Arrange
+    store = InMemoryTokenStore()
+    with patch('utils.token_store.time.monotonic', return_value=1000.0):
+        store.set_access_token(token="token1")
+
+    # Act
+    with patch('utils.token_store.time.monotonic', return_value=1200.0), \
+            patch('utils.token_store.time.time', return_value=50200.0):
+        extended = store.slide_access_token(token="token1", max_expires_at=50600.0)
+        capped = store.slide_access_token(token="token1", max_expires_at=50400.0)
+        missing = store.slide_access_token(token="token2", max_expires_at=50600.0)
+
+    # Assert
+    assert extended == 50500
+    # The cap never shortens a lifetime that was already extended
+    assert capped == 50500
+    assert missing is None
+
+
+def test_redis_slide_access_token_runs_one_script():
+    # Arrange
+    client = MagicMock()
+    client.eval.return_value = 1700000900
+
+    # Act
+    with override_settings(ACCESS_TOKEN_EXPIRATION_SECONDS=900):
+        expires_at = TokenCommandsMixin.slide_access_token(client, token="token1", max_expires_at=1700003600.5)
+
+    # Assert
+    assert expires_at == 1700000900
+    client.eval.assert_called_once_with(SLIDE_ACCESS_TOKEN_SCRIPT, 1, "access_token:token1", 900, 1700003600)
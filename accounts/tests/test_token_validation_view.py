@@ -1,5 +1,7 @@
 # tests/views/test_token_validation_view.py
 
+import time
+
 import pytest
 from django.urls import reverse
 from rest_framework import status
@@ -8,6 +10,8 @@ import jwt
 from datetime import datetime, timedelta
 from ..models import Session  # Adjust based on your app name
 from django.conf import settings
+from django.test import override_settings
+from utils import encode_token, InMemoryTokenStore
 from .fixtures.common_fixtures import api_client, create_user, create_session
 
 @pytest.mark.django_db
@@ -108,4 +112,275 @@ def test_token_validation_invalid_token_error(mock_decode_token, api_client, cre
     # Assert
     assert response.status_code == status.HTTP_200_OK
     assert response.data['data']['is_valid'] is False
-    assert response.data['data']['message'] == "Token is invalid or expired."
\ No newline at end of file
+    assert response.data['data']['message'] == "Token is invalid or expired."
+
+@pytest.mark.django_db
+@override_settings(TOKEN_VALIDATION_MODE='denylist')
+@patch('utils.token_registry.decode_token')
+@patch('utils.revocation_denylist_ins.is_revoked')
+def test_token_validation_denylist_mode_valid(mock_is_revoked, mock_decode_token, api_client, create_user, create_session):
+    # Arrange
+    url = reverse('token-validation')
+    user = create_user(username='testuser', password='testpassword')
+    session = create_session(user=user)
+
+    mock_is_revoked.return_value = False
+    mock_decode_token.return_value = {
+        "user_id": user.id,
+        "session_id": str(session.id),
+        "exp": datetime.utcnow() + timedelta(seconds=60),
+        "type": "access"
+    }
+
+    data = {
+        "token": "valid_token"
+    }
+
+    # Act
+    response = api_client.post(url, data, format='json')
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data['data']['is_valid'] is True
+    mock_is_revoked.assert_called_with(str(session.id))
+
+@pytest.mark.django_db
+@override_settings(TOKEN_VALIDATION_MODE='denylist')
+@patch('utils.token_registry.decode_token')
+@patch('utils.revocation_denylist_ins.is_revoked')
+def test_token_validation_denylist_mode_revoked(mock_is_revoked, mock_decode_token, api_client, create_user, create_session):
+    # Arrange
+    url = reverse('token-validation')
+    user = create_user(username='testuser', password='testpassword')
+    session = create_session(user=user, revoked=True)
+
+    mock_is_revoked.return_value = True
+    mock_decode_token.return_value = {
+        "user_id": user.id,
+        "session_id": str(session.id),
+        "exp": datetime.utcnow() + timedelta(seconds=60),
+        "type": "access"
+    }
+
+    data = {
+        "token": "revoked_token"
+    }
+
+    # Act
+    response = api_client.post(url, data, format='json')
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data['data']['is_valid'] is False
+    assert response.data['data']['message'] == "Token is invalid or expired."
+
+@pytest.mark.django_db
+@override_settings(TOKEN_VALIDATION_MODE='session')
+@patch('utils.token_registry.decode_token')
+@patch('utils.token_store.redis_replica_ins')
+def test_token_validation_session_mode_current_generation(mock_redis_client, mock_decode_token, api_client, create_user, create_session):
+    # Arrange
+    url = reverse('token-validation')
+    user = create_user(username='testuser', password='testpassword')
+    session = create_session(user=user)
+
+    mock_redis_client.get_session_generation.return_value = b'3'
+    mock_decode_token.return_value = {
+        "user_id": user.id,
+        "session_id": str(session.id),
+        "exp": datetime.utcnow() + timedelta(seconds=60),
+        "type": "access",
+        "generation": 3,
+    }
+
+    data = {
+        "token": "valid_token"
+    }
+
+    # Act
+    response = api_client.post(url, data, format='json')
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data['data']['is_valid'] is True
+    mock_redis_client.get_session_generation.assert_called_with(session_id=str(session.id))
+
+@pytest.mark.django_db
+@override_settings(TOKEN_VALIDATION_MODE='session')
+@patch('utils.token_registry.decode_token')
+@patch('utils.token_store.redis_replica_ins')
+def test_token_validation_session_mode_stale_generation(mock_redis_client, mock_decode_token, api_client, create_user, create_session):
+    # Arrange
+    url = reverse('token-validation')
+    user = create_user(username='testuser', password='testpassword')
+    session = create_session(user=user)
+
+    mock_redis_client.get_session_generation.return_value = b'4'
+    mock_decode_token.return_value = {
+        "user_id": user.id,
+        "session_id": str(session.id),
+        "exp": datetime.utcnow() + timedelta(seconds=60),
+        "type": "access",
+        "generation": 3,
+    }
+
+    data = {
+        "token": "stale_token"
+    }
+
+    # Act
+    response = api_client.post(url, data, format='json')
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data['data']['is_valid'] is False
+
+
+@pytest.mark.django_db
+@override_settings(REDIS_REPLICA_MISS_POLICY='recent')
+@patch('utils.token_store.redis_client_ins')
+@patch('utils.token_store.redis_replica_ins')
+def test_token_validation_replica_miss_retried_on_primary(mock_redis_replica, mock_redis_client, api_client, create_user, create_session):
+    # Arrange
+    url = reverse('token-validation')
+    user = create_user(username='testuser', password='testpassword')
+    session = create_session(user=user)
+    fresh_token = jwt.encode({
+        "user_id": user.id,
+        "session_id": str(session.id),
+        "exp": datetime.utcnow() + timedelta(seconds=settings.ACCESS_TOKEN_EXPIRATION_SECONDS),
+        "type": "access"
+    }, settings.SECRET_KEY, algorithm='HS256')
+
+    mock_redis_replica.get_access_token.return_value = None
+    mock_redis_client.get_access_token.return_value = b'valid'
+
+    data = {
+        "token": fresh_token
+    }
+
+    # Act
+    response = api_client.post(url, data, format='json')
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data['data']['is_valid'] is True
+    mock_redis_client.get_access_token.assert_called_once_with(token=fresh_token)
+
+@pytest.mark.django_db
+@override_settings(REDIS_REPLICA_MISS_POLICY='recent')
+@patch('utils.token_store.redis_client_ins')
+@patch('utils.token_store.redis_replica_ins')
+def test_token_validation_replica_miss_on_old_token_not_retried(mock_redis_replica, mock_redis_client, api_client, create_user, create_session):
+    # Arrange
+    url = reverse('token-validation')
+    user = create_user(username='testuser', password='testpassword')
+    session = create_session(user=user)
+    old_token = jwt.encode({
+        "user_id": user.id,
+        "session_id": str(session.id),
+        "exp": datetime.utcnow() + timedelta(seconds=60),
+        "type": "access"
+    }, settings.SECRET_KEY, algorithm='HS256')
+
+    mock_redis_replica.get_access_token.return_value = None
+
+    data = {
+        "token": old_token
+    }
+
+    # Act
+    response = api_client.post(url, data, format='json')
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data['data']['is_valid'] is False
+    mock_redis_client.get_access_token.assert_not_called()
+
+
+def _access_token(session, lifetime_seconds):
+    return encode_token(payload={
+        "user_id": session.user_id,
+        "session_id": str(session.id),
+        "exp": datetime.utcnow() + timedelta(seconds=lifetime_seconds),
+        "type": "access"
+    })
+
+
+@pytest.mark.django_db
+@override_settings(TOKEN_VALIDATION_CACHE_MAX_AGE_SECONDS=30)
+def test_token_validation_get_cacheable_for_revocation_tolerance(api_client, create_session):
+    # Arrange
+    url = reverse('token-validation')
+    session = create_session()
+    token = _access_token(session, lifetime_seconds=300)
+    store = InMemoryTokenStore()
+    store.set_access_token(token=token, session_id=str(session.id))
+
+    # Act
+    with patch('utils.token_registry.token_store_ins', store):
+        response = api_client.get(url, HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data['data']['is_valid'] is True
+    assert response['Cache-Control'] == 'private, max-age=30'
+    assert 'Authorization' in response['Vary'].split(', ')
+
+@pytest.mark.django_db
+@override_settings(TOKEN_VALIDATION_CACHE_MAX_AGE_SECONDS=30)
+def test_token_validation_get_max_age_capped_at_token_lifetime(api_client, create_session):
+    # Arrange
+    url = reverse('token-validation')
+    session = create_session()
+    token = _access_token(session, lifetime_seconds=10)
+    store = InMemoryTokenStore()
+    store.set_access_token(token=token, session_id=str(session.id))
+
+    # Act
+    with patch('utils.token_registry.token_store_ins', store):
+        response = api_client.get(url, HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    # Assert
+    max_age = int(response['Cache-Control'].split('max-age=')[1])
+    assert 0 < max_age <= 10
+
+@pytest.mark.django_db
+def test_token_validation_get_invalid_token_not_cacheable(api_client, create_session):
+    # Arrange
+    url = reverse('token-validation')
+    token = _access_token(create_session(), lifetime_seconds=300)
+
+    # Act
+    with patch('utils.token_registry.token_store_ins', InMemoryTokenStore()):
+        response = api_client.get(url, HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    # Assert
+    assert response.data['data']['is_valid'] is False
+    assert response['Cache-Control'] == 'no-store'
+    assert 'Authorization' in response['Vary'].split(', ')
+
+
+@pytest.mark.django_db
+@override_settings(
+    ACCESS_TOKEN_SLIDING_EXPIRY=True,
+    ACCESS_TOKEN_EXPIRATION_SECONDS=300,
+    ACCESS_TOKEN_MAX_LIFETIME_SECONDS=3600,
+)
+def test_token_validation_sliding_expiry_reports_effective_expiry(api_client, create_session):
+    # Arrange
+    url = reverse('token-validation')
+    session = create_session()
+    # Issued 200 seconds ago
+    token = _access_token(session, lifetime_seconds=100)
+    store = InMemoryTokenStore()
+    store.set_access_token(token=token, session_id=str(session.id))
+
+    # Act
+    with patch('utils.token_registry.token_store_ins', store):
+        response = api_client.post(url, {"token": token}, format='json')
+
+    # Assert
+    assert response.data['data']['is_valid'] is True
+    expires_in = response.data['data']['expires_at'] - time.time()
+    assert 290 < expires_in <= 300
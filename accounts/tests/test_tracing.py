@@ -0,0 +1,97 @@
+# tests/test_tracing.py
+
+import json
+import queue
+from unittest.mock import patch
+
+import pytest
+from django.test import override_settings
+from django.urls import reverse
+
+from utils import encode_token, start_trace
+from utils.tracing import SpanExporter, Trace, span_exporter_ins
+from .fixtures.common_fixtures import api_client, create_user
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_SPAN_ID = "00f067aa0ba902b7"
+
+
+def read_spans(export_path):
+    span_exporter_ins.flush()
+    lines = export_path.read_text().splitlines()
+    return [
+        span
+        for line in lines
+        for span in json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    ]
+
+
+@pytest.mark.django_db
+def test_request_continues_incoming_trace(api_client, create_user, tmp_path):
+    # Arrange
+    export_path = tmp_path / "traces.jsonl"
+    create_user(username='testuser', password='testpassword')
+    data = {"username": "testuser", "password": "wrongpassword"}
+
+    # Act
+    with override_settings(TRACING_ENABLED=True, TRACING_EXPORT_PATH=str(export_path)):
+        api_client.post(
+            reverse('login'),
+            data,
+            format='json',
+            HTTP_TRACEPARENT=f"00-{TRACE_ID}-{PARENT_SPAN_ID}-01",
+        )
+
+    # Assert
+    spans = read_spans(export_path)
+    root = next(span for span in spans if span["kind"] == 2)
+    assert root["parentSpanId"] == PARENT_SPAN_ID
+    assert {span["traceId"] for span in spans} == {TRACE_ID}
+    assert any(span["name"] == "db.query" and span["parentSpanId"] == root["spanId"] for span in spans)
+
+
+@pytest.mark.django_db
+def test_unsampled_incoming_trace_is_not_exported(api_client, tmp_path):
+    # Arrange
+    export_path = tmp_path / "traces.jsonl"
+
+    # Act
+    with override_settings(TRACING_ENABLED=True, TRACING_EXPORT_PATH=str(export_path)):
+        api_client.post(
+            reverse('login'),
+            {"username": "nobody", "password": "wrongpassword"},
+            format='json',
+            HTTP_TRACEPARENT=f"00-{TRACE_ID}-{PARENT_SPAN_ID}-00",
+        )
+
+    # Assert
+    span_exporter_ins.flush()
+    assert not export_path.exists()
+
+
+def test_jwt_encoding_is_traced(tmp_path):
+    # Arrange
+    export_path = tmp_path / "traces.jsonl"
+
+    # Act
+    with override_settings(TRACING_ENABLED=True, TRACING_EXPORT_PATH=str(export_path)):
+        with start_trace("test"):
+            encode_token({"user_id": 1, "type": "access"})
+
+    # Assert
+    assert [span["name"] for span in read_spans(export_path)] == ["jwt.encode", "test"]
+
+
+def test_exporter_drops_traces_when_queue_is_full():
+    # Arrange
+    exporter = SpanExporter()
+    exporter._queue = queue.Queue(maxsize=1)
+
+    # Act
+    with patch.object(exporter, '_ensure_thread'):
+        exporter.export(Trace(trace_id=TRACE_ID))
+        exporter.export(Trace(trace_id=TRACE_ID))
+
+    # Assert
+    assert exporter._queue.qsize() == 1
+    assert exporter.dropped == 1
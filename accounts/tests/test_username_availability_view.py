@@ -0,0 +1,125 @@
+# tests/views/test_username_availability_view.py
+
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+
+from .fixtures.common_fixtures import api_client, create_user
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the bitmap commands used by the username filter."""
+
+    def __init__(self):
+        self.bitmaps = {}
+        self._commands = None
+
+    def pipeline(self, transaction=True):
+        self._commands = []
+        return self
+
+    def execute(self):
+        results = [command() for command in self._commands]
+        self._commands = None
+        return results
+
+    def exists(self, key):
+        self._commands.append(lambda: int(key in self.bitmaps))
+
+    def getbit(self, key, offset):
+        self._commands.append(lambda: int(offset in self.bitmaps.get(key, set())))
+
+    def setbit(self, key, offset, value):
+        def command():
+            bits = self.bitmaps.setdefault(key, set())
+            if value:
+                bits.add(offset)
+        if self._commands is None:
+            return command()
+        self._commands.append(command)
+
+    def delete(self, *keys):
+        return sum(self.bitmaps.pop(key, None) is not None for key in keys)
+
+    def rename(self, source, destination):
+        self.bitmaps[destination] = self.bitmaps.pop(source)
+
+
+@pytest.fixture
+def fake_redis():
+    redis = FakeRedis()
+    with patch('utils.username_filter.redis_client_ins', redis), \
+            patch('accounts.management.commands.rebuild_username_filter.redis_client_ins', redis):
+        yield redis
+
+
+@pytest.mark.django_db
+def test_free_username_answered_without_database_query(api_client, create_user, fake_redis, django_assert_num_queries):
+    # Arrange
+    url = reverse('username-availability')
+    create_user(username='taken', password='password123')
+    call_command('rebuild_username_filter')
+
+    # Act
+    with django_assert_num_queries(0):
+        response = api_client.get(url, {"username": "free"})
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data['data'] == {"username": "free", "available": True}
+
+
+@pytest.mark.django_db
+def test_possible_hit_confirmed_in_database(api_client, create_user, fake_redis, django_assert_num_queries):
+    # Arrange
+    url = reverse('username-availability')
+    create_user(username='taken', password='password123')
+    call_command('rebuild_username_filter')
+
+    # Act
+    with django_assert_num_queries(1):
+        response = api_client.get(url, {"username": "taken"})
+
+    # Assert
+    assert response.data['data'] == {"username": "taken", "available": False}
+
+
+@pytest.mark.django_db
+def test_signup_adds_username_to_filter(api_client, fake_redis):
+    # Arrange
+    call_command('rebuild_username_filter')
+
+    # Act
+    api_client.post(reverse('signup'), {"username": "newuser", "password": "newpassword123"}, format='json')
+    response = api_client.get(reverse('username-availability'), {"username": "newuser"})
+
+    # Assert
+    assert response.data['data']['available'] is False
+
+
+@pytest.mark.django_db
+@patch('utils.username_filter.redis_client_ins', None)
+def test_missing_filter_falls_back_to_database(api_client, create_user):
+    # Arrange
+    url = reverse('username-availability')
+    create_user(username='taken', password='password123')
+
+    # Act
+    taken_response = api_client.get(url, {"username": "taken"})
+    free_response = api_client.get(url, {"username": "free"})
+
+    # Assert
+    assert taken_response.data['data']['available'] is False
+    assert free_response.data['data']['available'] is True
+
+
+@pytest.mark.django_db
+def test_invalid_username_rejected(api_client):
+    # Act
+    response = api_client.get(reverse('username-availability'), {"username": "not valid!"})
+
+    # Assert
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
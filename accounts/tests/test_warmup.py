@@ -0,0 +1,48 @@
+# tests/test_warmup.py
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from cryptography.hazmat.primitives.serialization import load_pem_private_key
+
+from auth_service import gunicorn_config
+from utils import decode_token, encode_token, warm_up
+from utils.jwt_keys import _load_private_key
+
+
+@pytest.mark.django_db
+def test_warm_up_runs_every_step():
+    # Act
+    results = warm_up()
+
+    # Assert
+    assert list(results) == ["imports", "database", "redis", "jwt_keys", "shared_token_cache"]
+    assert all(isinstance(duration, float) for duration in results.values())
+
+
+@patch('utils.jwt_keys.load_pem_private_key', wraps=load_pem_private_key)
+def test_private_key_is_parsed_once(mock_load_private_key):
+    # Arrange
+    _load_private_key.cache_clear()
+
+    # Act
+    tokens = [encode_token({"user_id": 1, "type": "access"}) for _ in range(3)]
+
+    # Assert
+    assert mock_load_private_key.call_count == 1
+    assert decode_token(tokens[0])["user_id"] == 1
+
+
+@patch('utils.warm_up')
+def test_post_fork_logs_failed_warm_up_steps(mock_warm_up):
+    # Arrange
+    server = MagicMock()
+    mock_warm_up.return_value = {"imports": 1.0, "redis": ConnectionError("refused")}
+
+    # Act
+    gunicorn_config.post_fork(server, worker=MagicMock())
+
+    # Assert
+    mock_warm_up.assert_called_once_with()
+    assert server.log.warning.call_args.args[2] == "redis"
+    assert "imports 1.0 ms" in server.log.info.call_args_list[0].args[-1]
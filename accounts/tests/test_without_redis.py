@@ -0,0 +1,91 @@
+# tests/test_without_redis.py
+
+from contextlib import ExitStack
+from unittest.mock import patch
+
+import pytest
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from utils import InMemoryTokenStore
+from utils.revocation_denylist import RevocationDenylist
+from ..models import Session
+from .fixtures.common_fixtures import api_client, create_user
+
+# Every module that talks to Redis directly
+REDIS_MODULES = [
+    'utils.auth_events',
+    'utils.refresh_coalescer',
+    'utils.revocation_denylist',
+    'utils.session_activity',
+    'utils.token_store',
+    'utils.user_sessions',
+    'utils.username_filter',
+]
+
+
+@pytest.fixture
+def without_redis():
+    with ExitStack() as stack:
+        for module in REDIS_MODULES:
+            stack.enter_context(patch(f'{module}.redis_client_ins', None))
+        stack.enter_context(patch('utils.token_registry.token_store_ins', InMemoryTokenStore()))
+        stack.enter_context(patch('utils.token_registry.revocation_denylist_ins', RevocationDenylist()))
+        stack.enter_context(override_settings(
+            AUTH_EVENTS_ENABLED=True,
+            REFRESH_COALESCING_ENABLED=True,
+            SHARED_TOKEN_CACHE_ENABLED=False,
+        ))
+        yield
+
+
+def _login(api_client):
+    response = api_client.post(reverse('login'), {"username": "testuser", "password": "testpassword"}, format='json')
+    assert response.status_code == status.HTTP_200_OK
+    return response.data['data']
+
+
+def _list_sessions(api_client, access_token):
+    return api_client.get(reverse('session-list'), HTTP_AUTHORIZATION=f"Bearer {access_token}")
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('mode', ['allowlist', 'session', 'denylist'])
+def test_login_request_refresh_and_logout_without_redis(mode, without_redis, api_client, create_user):
+    # Arrange
+    create_user(username='testuser', password='testpassword')
+
+    with override_settings(TOKEN_VALIDATION_MODE=mode):
+        # Act
+        tokens = _login(api_client)
+        sessions_response = _list_sessions(api_client, tokens['access'])
+        refresh_response = api_client.post(reverse('refresh-token'), {"refresh": tokens['refresh']}, format='json')
+        access_token = refresh_response.data['data']['access']
+        refreshed_sessions_response = _list_sessions(api_client, access_token)
+        logout_response = api_client.post(reverse('logout'), HTTP_AUTHORIZATION=f"Bearer {access_token}")
+        revoked_response = _list_sessions(api_client, access_token)
+
+    # Assert
+    assert sessions_response.status_code == status.HTTP_200_OK
+    assert sessions_response.data['data']['active_count'] == 1
+    assert refresh_response.status_code == status.HTTP_200_OK
+    assert refreshed_sessions_response.status_code == status.HTTP_200_OK
+    assert logout_response.status_code == status.HTTP_200_OK
+    assert revoked_response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db
+@override_settings(MAX_SESSIONS_PER_USER=1)
+def test_session_limit_enforced_without_redis(without_redis, api_client, create_user):
+    # Arrange
+    create_user(username='testuser', password='testpassword')
+    first_tokens = _login(api_client)
+
+    # Act
+    second_tokens = _login(api_client)
+
+    # Assert
+    assert _list_sessions(api_client, first_tokens['access']).status_code == status.HTTP_401_UNAUTHORIZED
+    assert _list_sessions(api_client, second_tokens['access']).status_code == status.HTTP_200_OK
+    assert Session.objects.filter(revoked=False).count() == 1
@@ -1,5 +1,14 @@
 from django.urls import path
-from .views import SignupView, LoginView, TokenValidationView, LogoutView, RefreshTokenView
+from .views import (
+    SignupView,
+    LoginView,
+    TokenValidationView,
+    LogoutView,
+    RefreshTokenView,
+    SessionListView,
+    BulkTokenIssueView,
+    UsernameAvailabilityView,
+)
 
 urlpatterns = [
     path('signup/', SignupView.as_view(), name='signup'),
@@ -7,4 +16,7 @@ urlpatterns = [
     path('validate-token/', TokenValidationView.as_view(), name='token-validation'),
     path('logout/', LogoutView.as_view(), name='logout'),
     path('refresh-token/', RefreshTokenView.as_view(), name='refresh-token'),
+    path('sessions/', SessionListView.as_view(), name='session-list'),
+    path('tokens/bulk/', BulkTokenIssueView.as_view(), name='bulk-token-issue'),
+    path('username-available/', UsernameAvailabilityView.as_view(), name='username-availability'),
 ]
\ No newline at end of file
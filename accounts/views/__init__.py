@@ -1,5 +1,8 @@
+from .bulk_token_issue import BulkTokenIssueView
 from .login import LoginView
 from .logout import LogoutView
 from .refresh_token import RefreshTokenView
+from .session_list import SessionListView
 from .signup import SignupView
-from .token_validation import TokenValidationView
\ No newline at end of file
+from .token_validation import TokenValidationView
+from .username_availability import UsernameAvailabilityView
@@ -0,0 +1,167 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from rest_framework import generics, status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from utils import (
+    auth_event_publisher_ins,
+    encode_token,
+    next_session_generations,
+    register_access_tokens,
+    user_session_index_ins,
+)
+from ..models import Session
+from ..serializers import BulkTokenIssueSerializer
+
+# Constants for response messages and status codes
+STATUS_OK = status.HTTP_200_OK
+STATUS_BAD_REQUEST = status.HTTP_400_BAD_REQUEST
+STATUS_FORBIDDEN = status.HTTP_403_FORBIDDEN
+MESSAGE_OPERATION_SUCCEEDED = "Operation succeeded."
+MESSAGE_OPERATION_FAILED = "Operation failed."
+ERROR_NOT_ALLOWED = "Only superusers or accounts with the issue_bulk_tokens permission can issue tokens in bulk."
+ERROR_UNKNOWN_USERS = "Unknown, inactive or superuser user ids: {user_ids}."
+ISSUE_BULK_TOKENS_PERMISSION = "accounts.issue_bulk_tokens"
+
+
+class BulkTokenIssueView(generics.GenericAPIView):
+    """API view to issue access tokens for many users in one call.
+
+    Intended for batch jobs running as a service account, which must be a
+    superuser or hold the `accounts.issue_bulk_tokens` permission. Tokens are
+    only issued for active users who are not superusers, so the endpoint
+    cannot be used to act as an administrator or revive a deactivated account.
+
+    One session is created per requested user with a single bulk INSERT, the
+    access tokens are signed across a worker pool, and all of them are
+    registered in Redis with one pipeline. Tokens are returned in request order.
+
+    Bulk issuance is deliberately exempt from MAX_SESSIONS_PER_USER: batch jobs
+    must not log users out of their interactive sessions. The new sessions
+    still count towards the limit on the user's next login.
+    """
+
+    serializer_class = BulkTokenIssueSerializer
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request) -> Response:
+        """Handle POST requests to issue access tokens in bulk.
+
+        Args:
+            request (rest_framework.request.Request): The incoming HTTP request containing the user ids.
+
+        Returns:
+            rest_framework.response.Response: The issued tokens in request order, or an error message.
+        """
+        # The token has already been validated and decoded by TokenMiddleware
+        caller_id = request.auth.user_id
+        caller = User.objects.filter(id=caller_id, is_active=True).first()
+        if caller is None or not caller.has_perm(ISSUE_BULK_TOKENS_PERMISSION):
+            return self._build_error_response(STATUS_FORBIDDEN, ERROR_NOT_ALLOWED)
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        user_ids = serializer.validated_data["user_ids"]
+
+        existing_ids = set(User.objects.filter(
+            id__in=set(user_ids),
+            is_active=True,
+            is_superuser=False,
+        ).values_list("id", flat=True))
+        unknown_ids = sorted(set(user_ids) - existing_ids)
+        if unknown_ids:
+            return self._build_error_response(
+                STATUS_BAD_REQUEST,
+                ERROR_UNKNOWN_USERS.format(user_ids=", ".join(map(str, unknown_ids))),
+            )
+
+        sessions = Session.objects.bulk_create([Session(user_id=user_id) for user_id in user_ids])
+        access_tokens = self._sign_access_tokens(sessions)
+
+        register_access_tokens(
+            tokens=[(access_token, str(session.id)) for access_token, session in zip(access_tokens, sessions)],
+        )
+        user_session_index_ins.add_many(
+            sessions=[(session.user_id, str(session.id), session.created_at.timestamp()) for session in sessions],
+        )
+        auth_event_publisher_ins.publish(
+            "bulk_tokens_issued",
+            user_id=caller_id,
+            count=len(sessions),
+        )
+
+        data = [
+            {
+                "user_id": session.user_id,
+                "session_id": str(session.id),
+                "access": access_token,
+            }
+            for access_token, session in zip(access_tokens, sessions)
+        ]
+        return Response(
+            {
+                "statusCode": STATUS_OK,
+                "message": MESSAGE_OPERATION_SUCCEEDED,
+                "error": None,
+                "data": data,
+            },
+            status=STATUS_OK,
+        )
+
+    def _sign_access_tokens(self, sessions: list) -> list:
+        """Sign one access token per session across a worker pool.
+
+        Args:
+            sessions (list): The sessions to issue tokens for.
+
+        Returns:
+            list: The encoded access tokens, in the order of `sessions`.
+        """
+        expires_at = datetime.utcnow() + timedelta(seconds=settings.ACCESS_TOKEN_EXPIRATION_SECONDS)
+        generations = next_session_generations(session_ids=[str(session.id) for session in sessions])
+
+        payloads = []
+        for index, session in enumerate(sessions):
+            payload = {
+                "user_id": session.user_id,
+                "session_id": str(session.id),
+                "exp": expires_at,
+                "type": "access",
+            }
+            if generations is not None:
+                payload["generation"] = generations[index]
+            payloads.append(payload)
+
+        # Worker threads do not inherit context variables, so each task runs in a
+        # copy of the request's context to keep its JWT spans in the request trace
+        with ThreadPoolExecutor(max_workers=settings.BULK_TOKEN_SIGNING_WORKERS) as executor:
+            futures = [
+                executor.submit(contextvars.copy_context().run, encode_token, payload=payload)
+                for payload in payloads
+            ]
+            return [future.result() for future in futures]
+
+    def _build_error_response(self, status_code: int, error: str) -> Response:
+        """Construct a standardized error response.
+
+        Args:
+            status_code (int): The HTTP status code for the error.
+            error (str): Detailed error information.
+
+        Returns:
+            rest_framework.response.Response: A response with an error status and message.
+        """
+        return Response(
+            {
+                "statusCode": status_code,
+                "message": MESSAGE_OPERATION_FAILED,
+                "error": error,
+                "data": None,
+            },
+            status=status_code,
+        )
@@ -2,13 +2,18 @@ from datetime import datetime, timedelta
 
 from django.conf import settings
 from django.contrib.auth import authenticate
+from django.utils import timezone
 from rest_framework import generics, status
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 
 from utils import (
-    redis_client_ins,
+    auth_event_publisher_ins,
     encode_token,
+    user_session_index_ins,
+    next_session_generation,
+    register_access_token,
+    revoke_sessions,
 )
 from ..models import Session
 from ..serializers import LoginSerializer, TokenSerializer
@@ -63,6 +68,11 @@ class LoginView(generics.GenericAPIView):
             token_serializer = TokenSerializer(data=token_data)
             token_serializer.is_valid(raise_exception=True)
 
+            auth_event_publisher_ins.publish(
+                "login",
+                user_id=user.id,
+                session_id=str(session.id),
+            )
             return Response(
                 {
                     "statusCode": status.HTTP_200_OK,
@@ -73,6 +83,10 @@ class LoginView(generics.GenericAPIView):
                 status=status.HTTP_200_OK,
             )
 
+        auth_event_publisher_ins.publish(
+            "login_failed",
+            username=serializer.validated_data["username"],
+        )
         return Response(
             {
                 "statusCode": status.HTTP_401_UNAUTHORIZED,
@@ -102,8 +116,11 @@ class LoginView(generics.GenericAPIView):
     def _create_session(self, user):
         """Create a new session for the authenticated user.
 
-        This method creates a session record in the database. Additional
-        session handling logic (e.g., caching in Redis) can be added here.
+        This method creates a session record in the database and adds it to
+        the user's session index in Redis. If the user now has more than
+        MAX_SESSIONS_PER_USER active sessions, the oldest ones are evicted.
+        If the index is not populated, or Redis is unavailable, the index is
+        rebuilt from the database and the sessions to evict are read from it.
 
         Args:
             user (User): The authenticated user instance.
@@ -112,13 +129,70 @@ class LoginView(generics.GenericAPIView):
             Session: The newly created session object.
         """
         session = Session.objects.create(user=user)
+        evicted_session_ids = user_session_index_ins.add(
+            user_id=user.id,
+            session_id=str(session.id),
+            created_at=session.created_at.timestamp(),
+            limit=settings.MAX_SESSIONS_PER_USER,
+        )
+        if evicted_session_ids is None:
+            evicted_session_ids = self._rebuild_session_index(user)
+        if evicted_session_ids:
+            self._evict_sessions(user, evicted_session_ids)
         return session
 
+    def _rebuild_session_index(self, user) -> list:
+        """Rebuild the session index of the user from the database.
+
+        The index keeps the newest MAX_SESSIONS_PER_USER active sessions
+        (all of them without a limit), and the rest are returned for eviction.
+
+        Args:
+            user (User): The authenticated user instance.
+
+        Returns:
+            list: The ids of the sessions to evict.
+        """
+        active_since = timezone.now() - timedelta(seconds=settings.REFRESH_TOKEN_EXPIRATION_SECONDS)
+        sessions = [
+            (session_id, created_at.timestamp())
+            for session_id, created_at in Session.objects.filter(
+                user=user,
+                revoked=False,
+                created_at__gte=active_since,
+            ).order_by("-created_at", "-id").values_list("id", "created_at")
+        ]
+        limit = settings.MAX_SESSIONS_PER_USER or len(sessions)
+        user_session_index_ins.rebuild(user_id=user.id, sessions=sessions[:limit])
+        return [str(session_id) for session_id, _ in sessions[limit:]]
+
+    def _evict_sessions(self, user, session_ids: list) -> None:
+        """Revoke sessions evicted by the per-user session limit.
+
+        The sessions were already removed from the user's session index. They
+        are marked revoked with one UPDATE and their access tokens are revoked
+        in one batch.
+
+        Args:
+            user (User): The authenticated user instance.
+            session_ids (list): The ids of the evicted sessions.
+        """
+        Session.objects.filter(user=user, id__in=session_ids).update(revoked=True)
+        revoke_sessions(session_ids=session_ids)
+        for session_id in session_ids:
+            auth_event_publisher_ins.publish(
+                "session_evicted",
+                user_id=user.id,
+                session_id=session_id,
+            )
+
     def _generate_access_token(self, user, session):
         """Generate a JWT access token for the user session.
 
         The access token contains the user ID, session ID, token type, and an
-        expiration time. It is stored in Redis for quick retrieval and validation.
+        expiration time. In allowlist mode it is stored in Redis for quick
+        retrieval and validation. In session mode it also carries the session
+        generation counter that validation compares against Redis.
 
         Args:
             user (User): The authenticated user instance.
@@ -133,11 +207,14 @@ class LoginView(generics.GenericAPIView):
             "exp": datetime.utcnow() + timedelta(seconds=settings.ACCESS_TOKEN_EXPIRATION_SECONDS),
             "type": "access"
         }
+        generation = next_session_generation(session_id=str(session.id))
+        if generation is not None:
+            payload["generation"] = generation
 
         token = encode_token(payload=payload)
 
-        # Store the access token in Redis
-        redis_client_ins.set_access_token(token=token)
+        # Store the access token in Redis (allowlist mode only)
+        register_access_token(token=token, session_id=str(session.id))
         return token
 
     def _generate_refresh_token(self, user, session):
@@ -2,14 +2,15 @@ from rest_framework.views import APIView
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from jwt import InvalidTokenError
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
 from utils import (
-    redis_client_ins,
-    extract_token,
-    decode_token,
+    auth_event_publisher_ins,
+    auth_logger_ins,
+    revoke_access_token,
+    token_store_ins,
+    user_session_index_ins,
 )
 from ..models import Session
 
@@ -17,9 +18,9 @@ class LogoutView(APIView):
     """
     API view to handle user logout by revoking the session.
 
-    This view validates the provided JWT token from the Authorization header,
-    decodes it to extract the session ID, revokes the corresponding session,
-    and returns an appropriate response.
+    The JWT token of the Authorization header is validated by `TokenMiddleware`,
+    which exposes it and its claims as `request.auth`. This view revokes the
+    session of the token and returns an appropriate response.
     """
     permission_classes = [IsAuthenticated]
 
@@ -77,30 +78,22 @@ class LogoutView(APIView):
         """
         Handle POST requests for user logout.
 
-        This method extracts the token from the Authorization header,
+        This method reads the token from the request auth context,
         revokes the session, and returns a success or error response based on the outcome.
         """
-        auth_header = request.headers.get("Authorization")
-        if not auth_header:
+        auth_context = request.auth
+        if auth_context is None:
             return self._response_error(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 message="Authentication credentials were not provided.",
                 error="Authorization header missing."
             )
 
-        token = extract_token(auth_header=auth_header)
-        if not token:
-            return self._response_error(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                message="Operation failed.",
-                error="No token provided."
-            )
-
+        token = auth_context.token
         try:
-            payload = decode_token(token=token)
-            session_id = payload.get("session_id")
+            session_id = auth_context.session_id
             if not session_id:
-                redis_client_ins.delete_access_token(token=token)
+                token_store_ins.delete_access_token(token=token)
                 return self._response_error(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     message="Operation failed.",
@@ -109,15 +102,15 @@ class LogoutView(APIView):
 
             session = self._get_session(session_id)
             self._revoke_session(session)
-            redis_client_ins.delete_access_token(token=token)
+            revoke_access_token(token=token, session_id=session_id)
+            user_session_index_ins.remove(sessions=[(session.user_id, session_id)])
+            auth_event_publisher_ins.publish(
+                "logout",
+                user_id=auth_context.user_id,
+                session_id=session_id,
+            )
             return self._response_success(message="Logout successful.")
 
-        except InvalidTokenError:
-            return self._response_error(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                message="Operation failed.",
-                error="Invalid token.",
-            )
         except Session.DoesNotExist:
             return self._response_error(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -125,7 +118,7 @@ class LogoutView(APIView):
                 error="Session does not exist.",
             )
         except Exception:
-            # TODO: logging
+            auth_logger_ins.error(endpoint=request.path, reason="logout_error", session_id=session_id)
             return self._response_error(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 message="Operation failed.",
@@ -19,7 +19,15 @@ from ..serializers import (
     TokenSerializer,
     RefreshTokenSerializer,
 )
-from utils import decode_token, encode_token, redis_client_ins
+from utils import (
+    auth_event_publisher_ins,
+    decode_token,
+    encode_token,
+    next_session_generation,
+    refresh_coalescer_ins,
+    register_access_token,
+    session_activity_tracker_ins,
+)
 
 # Constants for response messages and status codes
 STATUS_UNAUTHORIZED = status.HTTP_401_UNAUTHORIZED
@@ -37,7 +45,8 @@ class RefreshTokenView(generics.GenericAPIView):
     """API view to handle refresh token requests.
 
     This view accepts a refresh token, validates it, checks the associated session,
-    and issues a new access token if all validations pass.
+    and issues a new access token if all validations pass. Concurrent refreshes
+    of the same session share one access token (see `utils.refresh_coalescer.RefreshCoalescer`).
     """
 
     serializer_class = RefreshTokenSerializer
@@ -61,12 +70,16 @@ class RefreshTokenView(generics.GenericAPIView):
             payload = decode_token(token=refresh_token)
             self._validate_payload_type(payload)
 
-            session = self._get_valid_session(payload.get("session_id"))
-
-            access_token = self._generate_access_token(payload, session)
+            session_id = str(payload.get("session_id"))
+            # Checked before the coalescer, which may answer from its cache
+            session = self._get_valid_session(session_id)
+            access_token = refresh_coalescer_ins.issue(
+                session_id=session_id,
+                issue_access_token=lambda: self._issue_access_token(payload, session),
+            )
             token_data = self._serialize_tokens(access_token, refresh_token)
 
-            self._store_access_token(access_token)
+            session_activity_tracker_ins.touch(session_id=session_id)
 
             return self._build_success_response(token_data)
 
@@ -98,6 +111,25 @@ class RefreshTokenView(generics.GenericAPIView):
                 str(ve),
             )
 
+    def _issue_access_token(self, payload: dict, session: Session) -> str:
+        """Issue and register a new access token for a valid session.
+
+        Args:
+            payload (dict): The decoded payload from the refresh token.
+            session (Session): The session of the refresh token.
+
+        Returns:
+            str: The newly issued access token.
+        """
+        access_token = self._generate_access_token(payload, session)
+        self._store_access_token(access_token, session)
+        auth_event_publisher_ins.publish(
+            "token_refreshed",
+            user_id=payload.get("user_id"),
+            session_id=str(session.id),
+        )
+        return access_token
+
     def _validate_payload_type(self, payload: dict) -> None:
         """Ensure the token payload type is 'refresh'.
 
@@ -132,6 +164,9 @@ class RefreshTokenView(generics.GenericAPIView):
     def _generate_access_token(self, payload: dict, session: Session) -> str:
         """Create a new JWT access token based on the refresh token's payload.
 
+        In session mode the session generation counter is advanced, so the
+        previously issued access token of the session stops being valid.
+
         Args:
             payload (dict): The decoded payload from the refresh token.
             session (Session): The session associated with the token.
@@ -146,6 +181,9 @@ class RefreshTokenView(generics.GenericAPIView):
             + timedelta(seconds=settings.ACCESS_TOKEN_EXPIRATION_SECONDS),
             "type": "access",
         }
+        generation = next_session_generation(session_id=str(session.id))
+        if generation is not None:
+            access_payload["generation"] = generation
         return encode_token(payload=access_payload)
 
     def _serialize_tokens(self, access_token: str, refresh_token: str) -> dict:
@@ -167,13 +205,14 @@ class RefreshTokenView(generics.GenericAPIView):
         token_serializer.is_valid(raise_exception=True)
         return token_serializer.data
 
-    def _store_access_token(self, access_token: str) -> None:
-        """Store the access token in Redis for validation purposes.
+    def _store_access_token(self, access_token: str, session: Session) -> None:
+        """Store the access token in Redis for validation purposes (allowlist mode only).
 
         Args:
             access_token (str): The access token to store.
+            session (Session): The session associated with the token.
         """
-        redis_client_ins.set_access_token(token=access_token)
+        register_access_token(token=access_token, session_id=str(session.id))
 
     def _build_success_response(self, data: dict) -> Response:
         """Construct a standardized success response.
@@ -0,0 +1,177 @@
+import binascii
+import uuid
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import generics, status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from utils import user_session_index_ins
+from ..models import Session
+from ..serializers import SessionSerializer
+
+# Constants for response messages and status codes
+STATUS_OK = status.HTTP_200_OK
+STATUS_BAD_REQUEST = status.HTTP_400_BAD_REQUEST
+MESSAGE_OPERATION_SUCCEEDED = "Operation succeeded."
+MESSAGE_OPERATION_FAILED = "Operation failed."
+ERROR_INVALID_CURSOR = "Invalid cursor."
+ERROR_INVALID_LIMIT = "Invalid limit."
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class SessionListView(generics.GenericAPIView):
+    """API view to list the sessions of the authenticated user.
+
+    Sessions are returned newest first with keyset pagination on
+    `(created_at, id)`, backed by the `(user, created_at, id)` index, so every
+    page costs the same regardless of how many sessions the user has. The
+    number of active sessions comes from the Redis session index rather than a
+    `COUNT(*)`.
+    """
+
+    serializer_class = SessionSerializer
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description="List the sessions of the authenticated user, newest first.",
+        manual_parameters=[
+            openapi.Parameter(
+                "cursor",
+                openapi.IN_QUERY,
+                description="Cursor of the next page, as returned in `next_cursor`.",
+                type=openapi.TYPE_STRING,
+            ),
+            openapi.Parameter(
+                "limit",
+                openapi.IN_QUERY,
+                description=f"Page size, at most {MAX_PAGE_SIZE}.",
+                type=openapi.TYPE_INTEGER,
+            ),
+        ],
+    )
+    def get(self, request) -> Response:
+        """Handle GET requests to list the caller's sessions.
+
+        Query parameters:
+            cursor (str): Opaque cursor returned as `next_cursor` by the previous page.
+            limit (int): Page size, at most 100. Defaults to 20.
+
+        Args:
+            request (rest_framework.request.Request): The incoming HTTP request.
+
+        Returns:
+            rest_framework.response.Response: A page of sessions, the cursor of the
+                next page and the number of active sessions.
+        """
+        # The token has already been validated and decoded by TokenMiddleware
+        user_id = request.auth.user_id
+
+        try:
+            limit = min(int(request.query_params.get("limit", DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE)
+            if limit < 1:
+                raise ValueError(ERROR_INVALID_LIMIT)
+        except ValueError:
+            return self._build_error_response(ERROR_INVALID_LIMIT)
+
+        queryset = Session.objects.filter(user_id=user_id).order_by("-created_at", "-id")
+
+        cursor = request.query_params.get("cursor")
+        if cursor:
+            try:
+                created_at, session_id = self._decode_cursor(cursor)
+            except ValueError:
+                return self._build_error_response(ERROR_INVALID_CURSOR)
+            queryset = queryset.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=session_id)
+            )
+
+        sessions = list(queryset[:limit + 1])
+        next_cursor = None
+        if len(sessions) > limit:
+            sessions = sessions[:limit]
+            next_cursor = self._encode_cursor(sessions[-1])
+
+        data = {
+            "results": self.get_serializer(sessions, many=True).data,
+            "next_cursor": next_cursor,
+            "active_count": self._get_active_count(user_id),
+        }
+        return Response(
+            {
+                "statusCode": STATUS_OK,
+                "message": MESSAGE_OPERATION_SUCCEEDED,
+                "error": None,
+                "data": data,
+            },
+            status=STATUS_OK,
+        )
+
+    def _get_active_count(self, user_id) -> int:
+        """Return the number of active sessions, rebuilding the Redis index if needed.
+
+        Args:
+            user_id: The id of the authenticated user.
+
+        Returns:
+            int: The number of active sessions of the user.
+        """
+        count = user_session_index_ins.count(user_id=user_id)
+        if count is not None:
+            return count
+
+        active_since = timezone.now() - timedelta(seconds=settings.REFRESH_TOKEN_EXPIRATION_SECONDS)
+        sessions = [
+            (session_id, created_at.timestamp())
+            for session_id, created_at in Session.objects.filter(
+                user_id=user_id,
+                revoked=False,
+                created_at__gte=active_since,
+            ).values_list("id", "created_at")
+        ]
+        user_session_index_ins.rebuild(user_id=user_id, sessions=sessions)
+        return len(sessions)
+
+    def _encode_cursor(self, session: Session) -> str:
+        """Encode the keyset position after `session` as an opaque cursor."""
+        position = f"{session.created_at.isoformat()}|{session.id}"
+        return urlsafe_b64encode(position.encode()).decode()
+
+    def _decode_cursor(self, cursor: str) -> tuple:
+        """Decode a cursor into its `(created_at, id)` keyset position.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        try:
+            created_at, session_id = urlsafe_b64decode(cursor.encode()).decode().split("|")
+        except (binascii.Error, UnicodeDecodeError) as e:
+            raise ValueError(ERROR_INVALID_CURSOR) from e
+        return datetime.fromisoformat(created_at), uuid.UUID(session_id)
+
+    def _build_error_response(self, error: str) -> Response:
+        """Construct a standardized bad request response.
+
+        Args:
+            error (str): Detailed error information.
+
+        Returns:
+            rest_framework.response.Response: A response with an error status and message.
+        """
+        return Response(
+            {
+                "statusCode": STATUS_BAD_REQUEST,
+                "message": MESSAGE_OPERATION_FAILED,
+                "error": error,
+                "data": None,
+            },
+            status=STATUS_BAD_REQUEST,
+        )
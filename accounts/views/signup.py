@@ -1,5 +1,6 @@
 from rest_framework import generics, status
 from rest_framework.response import Response
+from utils import auth_event_publisher_ins, username_filter_ins
 from ..serializers import SignupSerializer
 
 from rest_framework.permissions import AllowAny, IsAuthenticated
@@ -16,6 +17,13 @@ class SignupView(generics.CreateAPIView):
         serializer.is_valid(raise_exception=True)
         self.perform_create(serializer)
         headers = self.get_success_headers(serializer.data)
+        username_filter_ins.add(serializer.instance.username)
+
+        auth_event_publisher_ins.publish(
+            "signup",
+            user_id=serializer.instance.id,
+            username=serializer.instance.username,
+        )
 
         return Response(
             {
@@ -1,12 +1,16 @@
+import time
+
 import jwt
 from typing import Any, Tuple
 
+from django.conf import settings
+from django.utils.cache import patch_cache_control, patch_vary_headers
 from rest_framework import generics, status
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 
 from ..serializers import TokenValidationSerializer
-from utils import redis_client_ins  # Ensure redis_client_ins is imported correctly
+from utils import decode_token, extract_token, is_access_token_valid, validate_access_token
 
 
 # Constants for response messages and status codes
@@ -14,6 +18,7 @@ STATUS_OK = status.HTTP_200_OK
 STATUS_UNAUTHORIZED = status.HTTP_401_UNAUTHORIZED
 
 MESSAGE_OPERATION_SUCCEEDED = "Operation succeeded."
+MESSAGE_OPERATION_FAILED = "Operation failed."
 MESSAGE_AUTHORIZATION_HEADER_MISSING = "Authorization header missing."
 MESSAGE_TOKEN_VALID = "Token is valid."
 MESSAGE_TOKEN_INVALID_OR_EXPIRED = "Token is invalid or expired."
@@ -24,8 +29,14 @@ MESSAGE_INVALID_TOKEN = "Invalid token."
 class TokenValidationView(generics.GenericAPIView):
     """API view to validate JWT tokens.
 
-    This view accepts a JWT token, checks its validity against Redis, and returns
-    the validation status. It does not require authentication to access this endpoint.
+    This view accepts a JWT token, checks its validity according to the configured
+    token validation mode, and returns the validation status. It does not require
+    authentication to access this endpoint.
+
+    POST takes the token in the body. GET takes it from the Authorization header
+    and returns a response that HTTP caches may reuse for that header. With
+    sliding expiry, validation extends the token and valid results include its
+    effective `expires_at`, which is later than the `exp` claim once extended.
     """
 
     serializer_class = TokenValidationSerializer
@@ -44,29 +55,127 @@ class TokenValidationView(generics.GenericAPIView):
         serializer.is_valid(raise_exception=True)
 
         token = serializer.validated_data["token"]
+        return self._build_response(data=self._validate(token))
+
+    def get(self, request) -> Response:
+        """Handle GET requests to validate the JWT token of the Authorization header.
+
+        A valid token gets `Cache-Control: private, max-age=N`, where N is the
+        smaller of the token's remaining lifetime and
+        TOKEN_VALIDATION_CACHE_MAX_AGE_SECONDS, the time a revoked token may
+        still be accepted from a cache. Other results are not cacheable. The
+        response always varies on the Authorization header.
+
+        Args:
+            request (rest_framework.request.Request): The incoming HTTP request.
+
+        Returns:
+            rest_framework.response.Response: A response indicating whether the token is valid or not.
+        """
+        auth_header = request.headers.get("Authorization")
+        if not auth_header:
+            response = Response(
+                {
+                    "statusCode": STATUS_UNAUTHORIZED,
+                    "message": MESSAGE_OPERATION_FAILED,
+                    "error": MESSAGE_AUTHORIZATION_HEADER_MISSING,
+                    "data": None,
+                },
+                status=STATUS_UNAUTHORIZED,
+            )
+            patch_cache_control(response, no_store=True)
+            patch_vary_headers(response, ["Authorization"])
+            return response
+
         try:
-            # Retrieve token validity status from Redis
-            is_valid, message = self._check_token_validity(token)
+            token = extract_token(auth_header=auth_header)
+        except jwt.InvalidTokenError:
+            token = None
+        data = self._validate(token) if token else {"is_valid": False, "message": MESSAGE_INVALID_TOKEN}
+        response = self._build_response(data=data)
+
+        max_age = self._get_cache_max_age(token, data.get("expires_at")) if data["is_valid"] else 0
+        if max_age > 0:
+            patch_cache_control(response, private=True, max_age=max_age)
+        else:
+            patch_cache_control(response, no_store=True)
+        patch_vary_headers(response, ["Authorization"])
+        return response
+
+    def _validate(self, token: str) -> dict:
+        """Validate a token and describe the result.
+
+        Args:
+            token (str): The JWT token to validate.
+
+        Returns:
+            dict: The `is_valid` flag and a message, plus `expires_at` with sliding expiry.
+        """
+        try:
+            if settings.ACCESS_TOKEN_SLIDING_EXPIRY:
+                return self._validate_and_extend(token)
 
-            data = {
+            # Check token validity against the token store or the revocation denylist
+            is_valid, message = self._check_token_validity(token)
+            return {
                 "is_valid": is_valid,
                 "message": message,
             }
-            return self._build_response(data=data)
 
         except jwt.ExpiredSignatureError:
-            data = {
+            return {
                 "is_valid": False,
                 "message": MESSAGE_TOKEN_EXPIRED,
             }
-            return self._build_response(data=data)
 
         except jwt.InvalidTokenError:
-            data = {
+            return {
                 "is_valid": False,
                 "message": MESSAGE_INVALID_TOKEN,
             }
-            return self._build_response(data=data)
+
+    def _validate_and_extend(self, token: str) -> dict:
+        """Validate a token in sliding expiry mode, extending its lifetime.
+
+        Args:
+            token (str): The JWT token to validate.
+
+        Returns:
+            dict: The `is_valid` flag and a message, plus the effective
+                  `expires_at` UNIX timestamp of valid tokens.
+
+        Raises:
+            jwt.ExpiredSignatureError: If the token has expired.
+            jwt.InvalidTokenError: If the token is invalid.
+        """
+        claims = validate_access_token(token=token)
+        if claims is None:
+            return {
+                "is_valid": False,
+                "message": MESSAGE_TOKEN_INVALID_OR_EXPIRED,
+            }
+        return {
+            "is_valid": True,
+            "message": MESSAGE_TOKEN_VALID,
+            "expires_at": claims["exp"],
+        }
+
+    def _get_cache_max_age(self, token: str, expires_at: int = None) -> int:
+        """Return how long the validation result of a valid token may be cached.
+
+        Args:
+            token (str): A JWT token that was just validated.
+            expires_at (int): The effective expiry of the token, if known.
+                Defaults to its `exp` claim.
+
+        Returns:
+            int: Seconds until the token expires, capped at TOKEN_VALIDATION_CACHE_MAX_AGE_SECONDS.
+        """
+        if expires_at is None:
+            # The token is already validated, so its claims can be read unverified
+            expires_at = decode_token(token=token, verify=False).get("exp", 0)
+        remaining = int(expires_at - time.time())
+        return max(0, min(remaining, settings.TOKEN_VALIDATION_CACHE_MAX_AGE_SECONDS))
 
     def _check_token_validity(self, token: str) -> Tuple[bool, str]:
         """Check the validity of the provided JWT token.
@@ -81,9 +190,7 @@ class TokenValidationView(generics.GenericAPIView):
             jwt.ExpiredSignatureError: If the token has expired.
             jwt.InvalidTokenError: If the token is invalid.
         """
-        token_value = redis_client_ins.get_access_token(token=token)
-
-        if token_value == b"valid":
+        if is_access_token_valid(token=token):
             return True, MESSAGE_TOKEN_VALID
 
         return False, MESSAGE_TOKEN_INVALID_OR_EXPIRED
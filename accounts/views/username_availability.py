@@ -0,0 +1,68 @@
+from django.contrib.auth.models import User
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import generics, status
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+
+from utils import username_filter_ins
+from ..serializers import UsernameAvailabilitySerializer
+
+# Constants for response messages and status codes
+STATUS_OK = status.HTTP_200_OK
+MESSAGE_OPERATION_SUCCEEDED = "Operation succeeded."
+
+
+class UsernameAvailabilityView(generics.GenericAPIView):
+    """API view to check whether a username is still free, e.g. while typing on signup.
+
+    The username is first looked up in the Redis Bloom filter of taken
+    usernames. A miss means the username is certainly free and is answered
+    without touching the database. Only possible hits, and every check while
+    the filter is unavailable, are confirmed with an indexed `User` lookup.
+    """
+
+    serializer_class = UsernameAvailabilitySerializer
+    permission_classes = [AllowAny]
+
+    @swagger_auto_schema(
+        operation_description="Check whether a username is available.",
+        manual_parameters=[
+            openapi.Parameter(
+                "username",
+                openapi.IN_QUERY,
+                description="The username to check.",
+                type=openapi.TYPE_STRING,
+                required=True,
+            ),
+        ],
+    )
+    def get(self, request) -> Response:
+        """Handle GET requests to check the availability of a username.
+
+        Args:
+            request (rest_framework.request.Request): The incoming HTTP request.
+
+        Returns:
+            rest_framework.response.Response: The username and whether it is available.
+        """
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        username = serializer.validated_data["username"]
+
+        available = not username_filter_ins.might_contain(username) or not User.objects.filter(
+            username=username,
+        ).exists()
+
+        return Response(
+            {
+                "statusCode": STATUS_OK,
+                "message": MESSAGE_OPERATION_SUCCEEDED,
+                "error": None,
+                "data": {
+                    "username": username,
+                    "available": available,
+                },
+            },
+            status=STATUS_OK,
+        )
@@ -0,0 +1,52 @@
+"""
+Gunicorn configuration for auth_service.
+
+Start the server with ``gunicorn -c python:auth_service.gunicorn_config``.
+
+The application is loaded once in the master process, which also imports the
+views and parses the JWT keys before forking, so workers share them
+copy-on-write. Each new worker then opens its own database and Redis
+connections and maps the shared token cache in `post_fork`, before it accepts
+connections. Deploys and scale-outs therefore never route requests to a cold
+worker.
+"""
+
+import os
+
+wsgi_app = "auth_service.wsgi:application"
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("GUNICORN_WORKERS", "1"))
+preload_app = True
+
+# Warm-up steps that can be shared by every worker
+MASTER_WARMUP_STEPS = ["imports", "jwt_keys"]
+
+
+def _log_warm_up(log, prefix, results):
+    for step, result in results.items():
+        if isinstance(result, Exception):
+            log.warning("%s warm-up step %s failed: %r", prefix, step, result)
+    timings = ", ".join(
+        f"{step} {result:.1f} ms" for step, result in results.items() if not isinstance(result, Exception)
+    )
+    log.info("%s warm (%s)", prefix, timings)
+
+
+def when_ready(server):
+    from utils import warm_up
+
+    _log_warm_up(server.log, "Master", warm_up(steps=MASTER_WARMUP_STEPS))
+
+
+def pre_fork(server, worker):
+    # Connections opened by the master must not be shared with workers
+    from django.db import connections
+
+    connections.close_all()
+
+
+def post_fork(server, worker):
+    from utils import warm_up
+
+    _log_warm_up(server.log, f"Worker {os.getpid()}", warm_up())
+    server.log.info("Worker %s ready", os.getpid())
@@ -1,6 +1,8 @@
 import os
 from pathlib import Path
 import environ
+from django.conf import global_settings
+from django.core.exceptions import ImproperlyConfigured
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -24,6 +26,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "accounts.middleware.TracingMiddleware",
+    "accounts.middleware.ProfilingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -63,6 +67,10 @@ DATABASES = {
         "PASSWORD": env("DB_PASSWORD"),
         "HOST": env("DB_HOST"),
         "PORT": env("DB_PORT"),
+        # Keep connections across requests, so connections opened by the worker
+        # warm-up (see auth_service/gunicorn_config.py) are reused
+        "CONN_MAX_AGE": env.int("DB_CONN_MAX_AGE", default=60),
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
@@ -71,6 +79,21 @@ REDIS_HOST = env("REDIS_HOST")
 REDIS_PORT = env("REDIS_PORT")
 REDIS_DB = env.int("REDIS_DB")
 REDIS_PASSWORD = env("REDIS_PASSWORD")
+# Sharded mode: comma separated "host:port" list of independent nodes. Keys are
+# distributed by consistent hashing and REDIS_HOST/REDIS_PORT are ignored.
+REDIS_NODES = env.list("REDIS_NODES", default=[])
+# Cluster mode: REDIS_HOST/REDIS_PORT point to any node of a Redis Cluster.
+REDIS_CLUSTER = env.bool("REDIS_CLUSTER", default=False)
+# Sentinel mode: comma separated "host:port" list of sentinels monitoring REDIS_SENTINEL_MASTER.
+REDIS_SENTINELS = env.list("REDIS_SENTINELS", default=[])
+REDIS_SENTINEL_MASTER = env("REDIS_SENTINEL_MASTER", default="mymaster")
+REDIS_SENTINEL_PASSWORD = env("REDIS_SENTINEL_PASSWORD", default=None)
+# Route token validation reads to replicas (Sentinel mode only). A miss on a replica is
+# retried on the primary: "always", or "recent" only for tokens issued within
+# REDIS_REPLICA_MAX_LAG_SECONDS.
+REDIS_READ_FROM_REPLICAS = env.bool("REDIS_READ_FROM_REPLICAS", default=False)
+REDIS_REPLICA_MISS_POLICY = env("REDIS_REPLICA_MISS_POLICY", default="recent")
+REDIS_REPLICA_MAX_LAG_SECONDS = env.int("REDIS_REPLICA_MAX_LAG_SECONDS", default=5)
 
 # JWT Configuration
 with open(env("JWT_PRIVATE_KEY_PATH"), "r") as key_file:
@@ -82,6 +105,159 @@ with open(env("JWT_PUBLIC_KEY_PATH"), "r") as key_file:
 # Token Expiration Settings
 ACCESS_TOKEN_EXPIRATION_SECONDS = env.int("ACCESS_TOKEN_EXPIRATION_SECONDS")
 REFRESH_TOKEN_EXPIRATION_SECONDS = env.int("REFRESH_TOKEN_EXPIRATION_SECONDS")
+# Sliding expiry (allowlist mode only): every successful validation keeps the access token
+# valid for ACCESS_TOKEN_EXPIRATION_SECONDS from now, up to ACCESS_TOKEN_MAX_LIFETIME_SECONDS
+# after it was issued. The `exp` claim keeps the issuance lifetime; validation reports the
+# effective expiry.
+ACCESS_TOKEN_SLIDING_EXPIRY = env.bool("ACCESS_TOKEN_SLIDING_EXPIRY", default=False)
+ACCESS_TOKEN_MAX_LIFETIME_SECONDS = env.int("ACCESS_TOKEN_MAX_LIFETIME_SECONDS", default=28800)
+
+# Refresh Coalescing
+# Concurrent refreshes of one session share the access token issued by the first of
+# them, cached in Redis for REFRESH_COALESCING_WINDOW_SECONDS.
+REFRESH_COALESCING_ENABLED = env.bool("REFRESH_COALESCING_ENABLED", default=True)
+REFRESH_COALESCING_WINDOW_SECONDS = env.float("REFRESH_COALESCING_WINDOW_SECONDS", default=5.0)
+REFRESH_COALESCING_LOCK_TIMEOUT_SECONDS = env.float("REFRESH_COALESCING_LOCK_TIMEOUT_SECONDS", default=2.0)
+
+# Bulk Token Issuance
+BULK_TOKEN_MAX_COUNT = env.int("BULK_TOKEN_MAX_COUNT", default=1000)
+BULK_TOKEN_SIGNING_WORKERS = env.int("BULK_TOKEN_SIGNING_WORKERS", default=4)
+
+# Token Claim Profile
+# "standard": verbose claim names. "compact": short claim names, base64url binary
+# session ids and integer token types. Both profiles are always accepted on decode.
+TOKEN_CLAIM_PROFILE = env("TOKEN_CLAIM_PROFILE", default="standard")
+
+# Token Validation Mode
+# "allowlist": every issued access token is stored in Redis and looked up on validation.
+# "session": access tokens carry a session generation counter that is checked against
+#            a single `session:{id}` key per session.
+# "denylist": access tokens are verified locally and checked against an in-process
+#             Bloom filter of revoked sessions, synced from a Redis stream.
+TOKEN_VALIDATION_MODE = env("TOKEN_VALIDATION_MODE", default="allowlist")
+# Longest time a GET validation result may be cached, i.e. how long a revoked token
+# can still be accepted by a client or gateway that caches validation responses.
+TOKEN_VALIDATION_CACHE_MAX_AGE_SECONDS = env.int("TOKEN_VALIDATION_CACHE_MAX_AGE_SECONDS", default=30)
+TOKEN_REVOCATION_BATCH_SIZE = env.int("TOKEN_REVOCATION_BATCH_SIZE", default=500)
+REVOCATION_STREAM_NAME = env("REVOCATION_STREAM_NAME", default="revoked_sessions")
+REVOCATION_SYNC_INTERVAL_SECONDS = env.float("REVOCATION_SYNC_INTERVAL_SECONDS", default=1.0)
+REVOCATION_BLOOM_CAPACITY = env.int("REVOCATION_BLOOM_CAPACITY", default=1000000)
+REVOCATION_BLOOM_ERROR_RATE = env.float("REVOCATION_BLOOM_ERROR_RATE", default=0.001)
+
+# gRPC Token Introspection
+# Served by `python manage.py run_introspection_server` next to the HTTP API.
+GRPC_INTROSPECTION_ADDRESS = env("GRPC_INTROSPECTION_ADDRESS", default="[::]:50051")
+GRPC_INTROSPECTION_MAX_WORKERS = env.int("GRPC_INTROSPECTION_MAX_WORKERS", default=10)
+
+# Token Store Backend
+# "redis": tokens and session generations are kept in Redis, shared by all workers.
+# "memory": they are kept in the memory of each process; only for a single worker
+#           process or local load tests. Any other value is the dotted path of a
+#           `utils.token_store.TokenStore` subclass.
+TOKEN_STORE_BACKEND = env("TOKEN_STORE_BACKEND", default="redis")
+
+# Shared Token Cache
+# Validated access tokens are cached for SHARED_TOKEN_CACHE_TTL_SECONDS in a memory-mapped
+# hash table shared by the worker processes of a node. Revocations on other nodes are
+# seen here only when the entries expire.
+SHARED_TOKEN_CACHE_ENABLED = env.bool("SHARED_TOKEN_CACHE_ENABLED", default=False)
+SHARED_TOKEN_CACHE_PATH = env("SHARED_TOKEN_CACHE_PATH", default="/dev/shm/auth_service_token_cache")
+SHARED_TOKEN_CACHE_SLOTS = env.int("SHARED_TOKEN_CACHE_SLOTS", default=65536)
+SHARED_TOKEN_CACHE_TTL_SECONDS = env.int("SHARED_TOKEN_CACHE_TTL_SECONDS", default=30)
+
+# Authentication Events
+# Login, logout, refresh and signup events are buffered in memory and flushed to a
+# Redis stream in batches by a background thread.
+AUTH_EVENTS_ENABLED = env.bool("AUTH_EVENTS_ENABLED", default=False)
+AUTH_EVENT_STREAM_NAME = env("AUTH_EVENT_STREAM_NAME", default="auth_events")
+AUTH_EVENT_STREAM_MAXLEN = env.int("AUTH_EVENT_STREAM_MAXLEN", default=1000000)
+AUTH_EVENT_BATCH_SIZE = env.int("AUTH_EVENT_BATCH_SIZE", default=100)
+AUTH_EVENT_BUFFER_SIZE = env.int("AUTH_EVENT_BUFFER_SIZE", default=10000)
+AUTH_EVENT_FLUSH_INTERVAL_SECONDS = env.float("AUTH_EVENT_FLUSH_INTERVAL_SECONDS", default=0.5)
+
+# Username Availability
+# Taken usernames are kept in a Redis Bloom filter sized for USERNAME_FILTER_CAPACITY users
+# at USERNAME_FILTER_ERROR_RATE false positives. Build it with
+# `python manage.py rebuild_username_filter`, and again after changing these settings.
+USERNAME_FILTER_CAPACITY = env.int("USERNAME_FILTER_CAPACITY", default=1000000)
+USERNAME_FILTER_ERROR_RATE = env.float("USERNAME_FILTER_ERROR_RATE", default=0.01)
+
+# Session Activity Tracking
+# Last activity timestamps are buffered in Redis and flushed to the database in bulk
+# by the `flush_session_activity` management command.
+SESSION_ACTIVITY_RESOLUTION_SECONDS = env.int("SESSION_ACTIVITY_RESOLUTION_SECONDS", default=60)
+SESSION_ACTIVITY_LOCAL_CACHE_SIZE = env.int("SESSION_ACTIVITY_LOCAL_CACHE_SIZE", default=100000)
+
+# Session Limit
+# Maximum number of active sessions per user, 0 for no limit. A login beyond the limit
+# revokes the oldest sessions of the user.
+MAX_SESSIONS_PER_USER = env.int("MAX_SESSIONS_PER_USER", default=0)
+
+# Tracing
+# Sampled requests are traced with spans for the middleware, Redis, database and JWT
+# stages. Traces are written as OTLP/JSON lines to TRACING_EXPORT_PATH, or to stdout
+# when it is empty, by a background thread; traces are dropped while
+# TRACING_EXPORT_QUEUE_SIZE are waiting. An incoming W3C `traceparent` header keeps
+# its sampling decision.
+TRACING_ENABLED = env.bool("TRACING_ENABLED", default=False)
+TRACING_SAMPLE_RATE = env.float("TRACING_SAMPLE_RATE", default=1.0)
+TRACING_SERVICE_NAME = env("TRACING_SERVICE_NAME", default="auth-service")
+TRACING_EXPORT_PATH = env("TRACING_EXPORT_PATH", default="")
+TRACING_EXPORT_QUEUE_SIZE = env.int("TRACING_EXPORT_QUEUE_SIZE", default=10000)
+
+# Profiling
+# With PROFILING_ENABLED, a PROFILING_SAMPLE_RATE fraction of requests to the account
+# views is profiled. A request with a signed `X-Profile-Request` header is always
+# profiled. Profiles are aggregated per endpoint in PROFILING_OUTPUT_DIR as collapsed
+# stacks ("collapsed") or cProfile statistics ("pstats").
+PROFILING_ENABLED = env.bool("PROFILING_ENABLED", default=False)
+PROFILING_SAMPLE_RATE = env.float("PROFILING_SAMPLE_RATE", default=0.01)
+PROFILING_FORMAT = env("PROFILING_FORMAT", default="collapsed")
+PROFILING_INTERVAL_SECONDS = env.float("PROFILING_INTERVAL_SECONDS", default=0.005)
+PROFILING_OUTPUT_DIR = env("PROFILING_OUTPUT_DIR", default=f"{BASE_DIR}/profiles")
+PROFILING_HEADER_MAX_AGE_SECONDS = env.int("PROFILING_HEADER_MAX_AGE_SECONDS", default=300)
+
+# Access Logging
+# Every authentication request is logged as one JSON line with its endpoint, result,
+# reason code and latency. Records go through a bounded queue to a background writer
+# (AUTH_LOG_PATH, or stdout when it is empty) and are dropped when the queue is full.
+# Successful requests are sampled with AUTH_LOG_SUCCESS_SAMPLE_RATE.
+AUTH_LOG_ENABLED = env.bool("AUTH_LOG_ENABLED", default=True)
+AUTH_LOG_SUCCESS_SAMPLE_RATE = env.float("AUTH_LOG_SUCCESS_SAMPLE_RATE", default=1.0)
+AUTH_LOG_QUEUE_SIZE = env.int("AUTH_LOG_QUEUE_SIZE", default=10000)
+AUTH_LOG_PATH = env("AUTH_LOG_PATH", default="")
+
+# Password Hashing
+# New hashes use PASSWORD_HASHER; the other hashers still verify existing hashes.
+# Django's default hashers without a calibrated subclass (e.g. pbkdf2_sha1) come last,
+# so their hashes keep verifying. The subclassed ones are left out: Django looks
+# hashers up by algorithm name and the later entry would shadow the calibrated one.
+# Tune the work factors with `python manage.py calibrate_password_hashers`.
+CALIBRATED_PASSWORD_HASHERS = {
+    "pbkdf2": "accounts.hashers.CalibratedPBKDF2PasswordHasher",
+    "argon2": "accounts.hashers.CalibratedArgon2PasswordHasher",
+    "bcrypt": "accounts.hashers.CalibratedBCryptSHA256PasswordHasher",
+    "scrypt": "accounts.hashers.CalibratedScryptPasswordHasher",
+}
+PASSWORD_HASHER = env("PASSWORD_HASHER", default="pbkdf2")
+if PASSWORD_HASHER not in CALIBRATED_PASSWORD_HASHERS:
+    raise ImproperlyConfigured(
+        f"PASSWORD_HASHER must be one of {', '.join(CALIBRATED_PASSWORD_HASHERS)}, not {PASSWORD_HASHER!r}."
+    )
+PASSWORD_HASHERS = [CALIBRATED_PASSWORD_HASHERS[PASSWORD_HASHER]] + [
+    hasher for name, hasher in CALIBRATED_PASSWORD_HASHERS.items() if name != PASSWORD_HASHER
+] + [
+    hasher for hasher in global_settings.PASSWORD_HASHERS
+    if hasher.replace("django.contrib.auth.hashers.", "accounts.hashers.Calibrated")
+    not in CALIBRATED_PASSWORD_HASHERS.values()
+]
+PASSWORD_HASH_UPGRADE = env.bool("PASSWORD_HASH_UPGRADE", default=True)
+PASSWORD_PBKDF2_ITERATIONS = env.int("PASSWORD_PBKDF2_ITERATIONS", default=600000)
+PASSWORD_ARGON2_TIME_COST = env.int("PASSWORD_ARGON2_TIME_COST", default=2)
+PASSWORD_ARGON2_MEMORY_COST = env.int("PASSWORD_ARGON2_MEMORY_COST", default=102400)
+PASSWORD_ARGON2_PARALLELISM = env.int("PASSWORD_ARGON2_PARALLELISM", default=8)
+PASSWORD_BCRYPT_ROUNDS = env.int("PASSWORD_BCRYPT_ROUNDS", default=12)
+PASSWORD_SCRYPT_WORK_FACTOR = env.int("PASSWORD_SCRYPT_WORK_FACTOR", default=16384)
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -115,6 +291,7 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # REST Framework Configuration
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
+        "accounts.authentication.AuthContextAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
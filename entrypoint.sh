@@ -19,6 +19,9 @@ echo "Applying database migrations..."
 python manage.py makemigrations
 python manage.py migrate
 
+echo "Building the username filter..."
+python manage.py rebuild_username_filter
+
 echo "Collecting static files..."
 python manage.py collectstatic --noinput
 
@@ -48,4 +51,4 @@ coverage run -m pytest
 coverage report
 
 echo "Starting Gunicorn..."
-exec gunicorn auth_service.wsgi:application --bind 0.0.0.0:8000
\ No newline at end of file
+exec gunicorn -c python:auth_service.gunicorn_config
\ No newline at end of file
@@ -1,4 +1,50 @@
 from .decode_token import decode_token
 from .extract_token import extract_token
-from .redis_client import redis_client_ins
-from .encode_token import encode_token
\ No newline at end of file
+from .auth_context import AuthContext
+from .redis_client import redis_client_ins, redis_replica_ins
+from .encode_token import encode_token
+from .revocation_denylist import revocation_denylist_ins
+from .token_store import (
+    token_store_ins,
+    TokenStore,
+    RedisTokenStore,
+    InMemoryTokenStore,
+)
+from .token_registry import (
+    next_session_generation,
+    next_session_generations,
+    register_access_token,
+    register_access_tokens,
+    is_access_token_valid,
+    validate_access_token,
+    revoke_access_token,
+    revoke_sessions,
+)
+from .session_activity import session_activity_tracker_ins
+from .shared_token_cache import shared_token_cache_ins
+from .refresh_coalescer import refresh_coalescer_ins
+from .user_sessions import user_session_index_ins
+from .auth_events import (
+    auth_event_publisher_ins,
+    AuthEventConsumer,
+)
+from .tracing import (
+    start_span,
+    start_trace,
+    trace_database_query,
+)
+from .profiler import (
+    request_profiler_ins,
+    sign_profiling_request,
+    is_profiling_request_signed,
+    PROFILING_HEADER,
+)
+from .auth_logging import (
+    auth_logger_ins,
+    RESULT_SUCCESS,
+    RESULT_DENIED,
+    RESULT_FAILURE,
+    RESULT_ERROR,
+)
+from .warmup import warm_up
+from .username_filter import username_filter_ins
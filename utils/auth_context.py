@@ -0,0 +1,25 @@
+class AuthContext:
+    """Authentication state of a request, built once by `TokenMiddleware`.
+
+    Views read the token and its claims from here (as `request.auth` in DRF
+    views) instead of extracting and decoding the Authorization header again.
+
+    Attributes:
+        token (str): The encoded access token.
+        claims (dict): The claims of the token. For tokens served from the
+            shared token cache only `user_id` and `session_id` are present.
+    """
+
+    __slots__ = ("token", "claims")
+
+    def __init__(self, token: str, claims: dict):
+        self.token = token
+        self.claims = claims
+
+    @property
+    def user_id(self):
+        return self.claims.get("user_id")
+
+    @property
+    def session_id(self):
+        return self.claims.get("session_id")
@@ -0,0 +1,211 @@
+import atexit
+import os
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from redis import ResponseError
+
+from .redis_client import redis_client_ins
+
+
+class AuthEventPublisher:
+    """Buffered publisher of authentication events to a Redis stream.
+
+    `publish` only appends the event to an in-memory buffer, so emitting an
+    event never adds a Redis round trip to the request. A background thread
+    flushes the buffer with one pipeline per batch, every
+    `AUTH_EVENT_FLUSH_INTERVAL_SECONDS` or as soon as `AUTH_EVENT_BATCH_SIZE`
+    events are waiting. The stream is capped at roughly `AUTH_EVENT_STREAM_MAXLEN`
+    entries on every write.
+
+    If the buffer is full (for example while Redis is unreachable) the oldest
+    events are dropped rather than blocking requests. Without a Redis client,
+    events are not published.
+
+    Attributes:
+        dropped (int): Number of events dropped because the buffer was full.
+    """
+
+    def __init__(self):
+        self._buffer = deque(maxlen=settings.AUTH_EVENT_BUFFER_SIZE)
+        self._wakeup = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._thread_lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self.dropped = 0
+        atexit.register(self.flush)
+
+    def publish(self, event: str, **fields) -> None:
+        """Queue an event for publication.
+
+        Args:
+            event (str): The event name, e.g. "login" or "logout".
+            **fields: Event attributes. None values are omitted.
+        """
+        if not settings.AUTH_EVENTS_ENABLED or redis_client_ins is None:
+            return
+
+        entry = {"event": event, "timestamp": f"{time.time():.6f}"}
+        entry.update({name: value for name, value in fields.items() if value is not None})
+        if len(self._buffer) == self._buffer.maxlen:
+            # Appending pushes out the oldest event
+            self.dropped += 1
+        self._buffer.append(entry)
+
+        self._ensure_thread()
+        if len(self._buffer) >= settings.AUTH_EVENT_BATCH_SIZE:
+            self._wakeup.set()
+
+    def flush(self) -> None:
+        """Write all buffered events to the stream."""
+        with self._flush_lock:
+            while self._buffer:
+                batch = []
+                while self._buffer and len(batch) < settings.AUTH_EVENT_BATCH_SIZE:
+                    batch.append(self._buffer.popleft())
+                try:
+                    self._write(batch)
+                except Exception:
+                    self._requeue(batch)
+                    return
+
+    def _requeue(self, batch: list) -> None:
+        """Put a batch that failed to flush back at the front of the buffer.
+
+        Events published since the batch was taken are newer, so when the
+        buffer cannot hold them all, the oldest events of the batch are dropped.
+        `extendleft` alone would push the newest events out of the right end.
+        """
+        free = self._buffer.maxlen - len(self._buffer)
+        kept = batch[len(batch) - free:] if free < len(batch) else batch
+        self.dropped += len(batch) - len(kept)
+        self._buffer.extendleft(reversed(kept))
+
+    def _write(self, batch: list) -> None:
+        """Append a batch of events to the stream in one pipeline."""
+        pipeline = redis_client_ins.pipeline(transaction=False)
+        for entry in batch:
+            pipeline.xadd(
+                name=settings.AUTH_EVENT_STREAM_NAME,
+                fields=entry,
+                maxlen=settings.AUTH_EVENT_STREAM_MAXLEN,
+                approximate=True,
+            )
+        pipeline.execute()
+
+    def _ensure_thread(self) -> None:
+        """Start the flusher thread in the current process if it is not running.
+
+        Threads do not survive a fork, so the thread is started lazily in every
+        worker process instead of at import time.
+        """
+        if self._pid == os.getpid() and self._thread is not None:
+            return
+        with self._thread_lock:
+            if self._pid == os.getpid() and self._thread is not None:
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(
+                target=self._run,
+                name="auth-event-publisher",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        """Flush the buffer periodically, or earlier when a batch is full."""
+        while True:
+            self._wakeup.wait(timeout=settings.AUTH_EVENT_FLUSH_INTERVAL_SECONDS)
+            self._wakeup.clear()
+            self.flush()
+
+
+class AuthEventConsumer:
+    """Consumer group reader for the authentication event stream.
+
+    Each consumer group receives every event once; consumers in the same group
+    share the work. Events must be acknowledged with `ack` after processing,
+    otherwise they stay pending and are delivered again by `read_pending`.
+
+    Attributes:
+        group (str): The consumer group name.
+        consumer (str): The name of this consumer within the group.
+        stream (str): The stream to read from.
+    """
+
+    def __init__(self, group: str, consumer: str, stream: str = None):
+        self.group = group
+        self.consumer = consumer
+        self.stream = stream or settings.AUTH_EVENT_STREAM_NAME
+
+    def ensure_group(self) -> None:
+        """Create the consumer group (and the stream) if it does not exist yet."""
+        try:
+            redis_client_ins.xgroup_create(
+                name=self.stream,
+                groupname=self.group,
+                id="0",
+                mkstream=True,
+            )
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    def read(self, count: int = 100, block_ms: int = 5000) -> list:
+        """Read events that were never delivered to this group.
+
+        Args:
+            count (int): Maximum number of events to return.
+            block_ms (int): How long to wait for new events, in milliseconds.
+
+        Returns:
+            list: (event_id, fields) tuples with decoded strings.
+        """
+        return self._read(last_id=">", count=count, block_ms=block_ms)
+
+    def read_pending(self, count: int = 100) -> list:
+        """Read events delivered to this consumer but not acknowledged yet.
+
+        Args:
+            count (int): Maximum number of events to return.
+
+        Returns:
+            list: (event_id, fields) tuples with decoded strings.
+        """
+        return self._read(last_id="0", count=count, block_ms=None)
+
+    def ack(self, *event_ids) -> int:
+        """Acknowledge processed events.
+
+        Args:
+            *event_ids: Ids returned by `read` or `read_pending`.
+
+        Returns:
+            int: The number of events acknowledged.
+        """
+        if not event_ids:
+            return 0
+        return redis_client_ins.xack(self.stream, self.group, *event_ids)
+
+    def _read(self, last_id: str, count: int, block_ms) -> list:
+        response = redis_client_ins.xreadgroup(
+            groupname=self.group,
+            consumername=self.consumer,
+            streams={self.stream: last_id},
+            count=count,
+            block=block_ms,
+        )
+        events = []
+        for _, entries in response or []:
+            for event_id, fields in entries:
+                events.append((
+                    event_id.decode(),
+                    {key.decode(): value.decode() for key, value in fields.items()},
+                ))
+        return events
+
+
+auth_event_publisher_ins = AuthEventPublisher()
@@ -0,0 +1,163 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+from django.conf import settings
+
+AUTH_LOGGER_NAME = "auth"
+
+# Values of the `result` field of access log entries
+RESULT_SUCCESS = "success"
+RESULT_DENIED = "denied"
+RESULT_FAILURE = "failure"
+RESULT_ERROR = "error"
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats a record as one JSON object per line, with its `fields` at the top level."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": f"{record.created:.6f}",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Queue handler that drops records instead of blocking when the queue is full.
+
+    Records are formatted to JSON before being queued, so the background
+    listener only writes strings.
+
+    Attributes:
+        dropped (int): Number of records dropped because the queue was full.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class AuthLogger:
+    """Structured JSON logger for authentication outcomes.
+
+    Records are put on a bounded in-memory queue and written by a
+    `QueueListener` thread to AUTH_LOG_PATH, or stdout when it is empty, so a
+    slow disk or pipe never blocks a request. When the queue is full, records
+    are dropped. Successful outcomes are sampled with
+    AUTH_LOG_SUCCESS_SAMPLE_RATE; denials, failures and errors are always
+    logged.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._logger = logging.getLogger(AUTH_LOGGER_NAME)
+        self._listener = None
+        self._pid = None
+        atexit.register(self.stop)
+
+    def access(self, endpoint: str, result: str, latency_ms: float, reason: str, **fields) -> None:
+        """Log the outcome of a request.
+
+        Args:
+            endpoint (str): The request path.
+            result (str): One of "success", "denied", "failure" or "error".
+            latency_ms (float): The time spent handling the request, in milliseconds.
+            reason (str): A short machine-readable reason code, e.g. "invalid_token".
+            **fields: Additional fields. None values are omitted.
+        """
+        if not settings.AUTH_LOG_ENABLED:
+            return
+
+        sample_rate = settings.AUTH_LOG_SUCCESS_SAMPLE_RATE if result == RESULT_SUCCESS else 1.0
+        if sample_rate < 1.0 and random.random() >= sample_rate:
+            return
+
+        self._log(
+            logging.INFO,
+            "access",
+            endpoint=endpoint,
+            result=result,
+            latency_ms=round(latency_ms, 3),
+            reason=reason,
+            sample_rate=sample_rate,
+            **fields,
+        )
+
+    def error(self, endpoint: str, reason: str, **fields) -> None:
+        """Log an unexpected exception, with its traceback, from inside an `except` block.
+
+        Args:
+            endpoint (str): The request path.
+            reason (str): A short machine-readable reason code.
+            **fields: Additional fields. None values are omitted.
+        """
+        if not settings.AUTH_LOG_ENABLED:
+            return
+
+        self._log(logging.ERROR, "error", exc_info=True, endpoint=endpoint, result=RESULT_ERROR, reason=reason, **fields)
+
+    def stop(self) -> None:
+        """Write the queued records and stop the background thread."""
+        with self._lock:
+            if self._listener is not None and self._pid == os.getpid():
+                self._listener.stop()
+            self._listener = None
+
+    def _log(self, level: int, message: str, exc_info=False, **fields) -> None:
+        self._ensure_listener()
+        self._logger.log(
+            level,
+            message,
+            exc_info=exc_info,
+            extra={"fields": {name: value for name, value in fields.items() if value is not None}},
+        )
+
+    def _ensure_listener(self) -> None:
+        """Start the writer thread, once per process (it does not survive a fork)."""
+        if self._listener is not None and self._pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._listener is not None and self._pid == os.getpid():
+                return
+
+            log_queue = queue.Queue(maxsize=settings.AUTH_LOG_QUEUE_SIZE)
+            queue_handler = DroppingQueueHandler(log_queue)
+            queue_handler.setFormatter(JsonFormatter())
+
+            if settings.AUTH_LOG_PATH:
+                writer = logging.FileHandler(settings.AUTH_LOG_PATH)
+            else:
+                writer = logging.StreamHandler(sys.stdout)
+            writer.setFormatter(logging.Formatter("%(message)s"))
+
+            self._logger.handlers = [queue_handler]
+            self._logger.setLevel(logging.INFO)
+            self._logger.propagate = False
+
+            self._listener = QueueListener(log_queue, writer)
+            self._listener.start()
+            self._pid = os.getpid()
+
+
+auth_logger_ins = AuthLogger()
+
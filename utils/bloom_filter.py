@@ -0,0 +1,67 @@
+import math
+from hashlib import blake2b
+
+
+def bloom_filter_parameters(capacity: int, error_rate: float) -> tuple:
+    """Return the number of bits and of hash functions for a Bloom filter.
+
+    Args:
+        capacity (int): Expected maximum number of items.
+        error_rate (float): Acceptable false positive probability (0 < error_rate < 1).
+
+    Returns:
+        tuple: The `(size, hash_count)` of the filter.
+    """
+    size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+    hash_count = max(1, round(size / capacity * math.log(2)))
+    return size, hash_count
+
+
+def bloom_filter_positions(item: str, size: int, hash_count: int):
+    """Yield the bit positions of an item using double hashing."""
+    digest = blake2b(item.encode(), digest_size=16).digest()
+    first = int.from_bytes(digest[:8], "little")
+    second = int.from_bytes(digest[8:], "little") | 1
+    for i in range(hash_count):
+        yield (first + i * second) % size
+
+
+class BloomFilter:
+    """A fixed-size probabilistic set of strings.
+
+    Membership tests never return false negatives, and return false positives
+    with a probability close to `error_rate` while the filter holds at most
+    `capacity` items. Items cannot be removed; rebuild the filter instead.
+
+    Attributes:
+        size (int): Number of bits in the filter.
+        hash_count (int): Number of bit positions set per item.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        """Size the filter for the expected number of items.
+
+        Args:
+            capacity (int): Expected maximum number of items.
+            error_rate (float): Acceptable false positive probability (0 < error_rate < 1).
+        """
+        self.size, self.hash_count = bloom_filter_parameters(capacity, error_rate)
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        return bloom_filter_positions(item, self.size, self.hash_count)
+
+    def add(self, item: str) -> None:
+        """Add an item to the filter.
+
+        Args:
+            item (str): The item to add.
+        """
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
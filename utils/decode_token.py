@@ -1,13 +1,21 @@
-from django.conf import settings
 from jwt import decode
 
+from .jwt_keys import get_public_key
+from .token_claims import expand_claims
+from .tracing import start_span
 
-def decode_token(token):
+
+def decode_token(token, verify=True):
     """
     Decodes the JWT token using the public key and specified algorithm.
 
+    Tokens using the compact claim profile are expanded to the standard claim
+    names, so both profiles are accepted regardless of `TOKEN_CLAIM_PROFILE`.
+
     Args:
         token (str): The JWT token to decode.
+        verify (bool): Whether to verify the signature and expiry. Only skip
+            verification for tokens that were already validated.
 
     Returns:
         dict: The decoded payload of the JWT token.
@@ -16,4 +24,10 @@ def decode_token(token):
         ExpiredSignatureError: If the token has expired.
         InvalidTokenError: If the token is invalid.
     """
-    return decode(token, settings.JWT_PUBLIC_KEY, algorithms=["RS256"])
+    if not verify:
+        payload = decode(token, options={"verify_signature": False})
+        return expand_claims(payload)
+
+    with start_span("jwt.decode", **{"jwt.algorithm": "RS256"}):
+        payload = decode(token, get_public_key(), algorithms=["RS256"])
+    return expand_claims(payload)
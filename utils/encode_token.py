@@ -1,13 +1,18 @@
 from django.conf import settings
 from jwt import encode
 
+from .jwt_keys import get_private_key
+from .token_claims import compact_claims
+from .tracing import start_span
+
 
 def encode_token(payload: dict) -> str:
     """Encodes a payload into a JWT token using the RS256 algorithm.
 
     This function takes a dictionary `payload` and encodes it into a JSON Web Token
     (JWT) using the RS256 algorithm. The encoding process utilizes a private key
-    specified in the Django settings (`JWT_PRIVATE_KEY`).
+    specified in the Django settings (`JWT_PRIVATE_KEY`), parsed once and cached.
+    When `TOKEN_CLAIM_PROFILE` is "compact", the claims are shortened before signing.
 
     Args:
         payload (dict): The payload data to encode into the token.
@@ -18,8 +23,12 @@ def encode_token(payload: dict) -> str:
     Raises:
         jwt.PyJWTError: If the token encoding fails due to an invalid payload or key.
     """
-    return encode(
-        payload=payload,
-        key=settings.JWT_PRIVATE_KEY,
-        algorithm="RS256",
-    )
\ No newline at end of file
+    if settings.TOKEN_CLAIM_PROFILE == "compact":
+        payload = compact_claims(payload)
+
+    with start_span("jwt.encode", **{"jwt.algorithm": "RS256"}):
+        return encode(
+            payload=payload,
+            key=get_private_key(),
+            algorithm="RS256",
+        )
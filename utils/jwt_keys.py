@@ -0,0 +1,28 @@
+from functools import lru_cache
+
+from cryptography.hazmat.primitives.serialization import load_pem_private_key, load_pem_public_key
+from django.conf import settings
+
+
+@lru_cache(maxsize=4)
+def _load_private_key(pem: str):
+    return load_pem_private_key(pem.encode(), password=None)
+
+
+@lru_cache(maxsize=4)
+def _load_public_key(pem: str):
+    return load_pem_public_key(pem.encode())
+
+
+def get_private_key():
+    """Return the parsed `JWT_PRIVATE_KEY`.
+
+    PyJWT parses PEM keys on every call, and loading an RSA private key
+    costs tens of milliseconds, so the parsed key is cached per PEM value.
+    """
+    return _load_private_key(settings.JWT_PRIVATE_KEY)
+
+
+def get_public_key():
+    """Return the parsed `JWT_PUBLIC_KEY`, cached like `get_private_key`."""
+    return _load_public_key(settings.JWT_PUBLIC_KEY)
@@ -0,0 +1,147 @@
+import cProfile
+import os
+import pstats
+import sys
+import threading
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.core import signing
+
+# Header that forces profiling of a single request, see `sign_profiling_request`
+PROFILING_HEADER = "X-Profile-Request"
+PROFILING_SIGNING_SALT = "utils.profiler"
+
+COLLAPSED_FORMAT = "collapsed"
+PSTATS_FORMAT = "pstats"
+
+
+def sign_profiling_request() -> str:
+    """Return a value for the `X-Profile-Request` header.
+
+    The value is signed with SECRET_KEY and accepted for
+    `PROFILING_HEADER_MAX_AGE_SECONDS`, so only operators can trigger profiles.
+    """
+    return signing.TimestampSigner(salt=PROFILING_SIGNING_SALT).sign("profile")
+
+
+def is_profiling_request_signed(value: str) -> bool:
+    """Check the signature and age of an `X-Profile-Request` header value."""
+    try:
+        signing.TimestampSigner(salt=PROFILING_SIGNING_SALT).unsign(
+            value, max_age=settings.PROFILING_HEADER_MAX_AGE_SECONDS
+        )
+    except signing.BadSignature:
+        return False
+    return True
+
+
+class StackSampler:
+    """Samples the call stack of one thread from a background thread.
+
+    Every `interval` seconds the current frame of the target thread is read
+    with `sys._current_frames()` and its stack, from `root_code` down to the
+    running function, is counted in collapsed form (`outer;...;inner`).
+
+    Attributes:
+        stacks (Counter): Number of samples per collapsed stack.
+    """
+
+    def __init__(self, thread_id: int, interval: float, root_code=None):
+        self.stacks = Counter()
+        self._thread_id = thread_id
+        self._interval = interval
+        self._root_code = root_code
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stopped.set()
+        self._thread.join()
+        return self.stacks
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self._interval):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is not None:
+                self.stacks[self._collapse(frame)] += 1
+
+    def _collapse(self, frame) -> str:
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+            if code is self._root_code:
+                break
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+
+class RequestProfiler:
+    """Profiles view calls and aggregates the results per endpoint.
+
+    With PROFILING_FORMAT "collapsed" the call stack is sampled every
+    `PROFILING_INTERVAL_SECONDS`, and `<endpoint>.<pid>.collapsed` holds the
+    sample counts of every profiled request of the endpoint, ready for
+    `flamegraph.pl` or speedscope. With "pstats" each call runs under cProfile
+    and `<endpoint>.<pid>.pstats` holds the merged statistics, readable with
+    `pstats`, snakeviz or `flameprof`. Files are rewritten in
+    `PROFILING_OUTPUT_DIR` after each profiled request.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stacks = defaultdict(Counter)
+        self._stats = {}
+
+    def profile(self, endpoint: str, func, *args, **kwargs):
+        """Call `func` under the profiler and record the profile for `endpoint`.
+
+        Returns:
+            The return value of `func`.
+        """
+        if settings.PROFILING_FORMAT == PSTATS_FORMAT:
+            profile = cProfile.Profile()
+            try:
+                return profile.runcall(func, *args, **kwargs)
+            finally:
+                self._record_stats(endpoint, profile)
+
+        sampler = StackSampler(
+            thread_id=threading.get_ident(),
+            interval=settings.PROFILING_INTERVAL_SECONDS,
+            root_code=func.__code__ if hasattr(func, "__code__") else None,
+        )
+        sampler.start()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self._record_stacks(endpoint, sampler.stop())
+
+    def _path(self, endpoint: str, extension: str) -> str:
+        return os.path.join(settings.PROFILING_OUTPUT_DIR, f"{endpoint}.{os.getpid()}.{extension}")
+
+    def _record_stacks(self, endpoint: str, stacks: Counter) -> None:
+        with self._lock:
+            totals = self._stacks[endpoint]
+            totals.update(stacks)
+            os.makedirs(settings.PROFILING_OUTPUT_DIR, exist_ok=True)
+            with open(self._path(endpoint, COLLAPSED_FORMAT), "w") as collapsed_file:
+                for stack, count in totals.most_common():
+                    collapsed_file.write(f"{stack} {count}\n")
+
+    def _record_stats(self, endpoint: str, profile: cProfile.Profile) -> None:
+        with self._lock:
+            stats = self._stats.get(endpoint)
+            if stats is None:
+                stats = self._stats[endpoint] = pstats.Stats(profile)
+            else:
+                stats.add(profile)
+            os.makedirs(settings.PROFILING_OUTPUT_DIR, exist_ok=True)
+            stats.dump_stats(self._path(endpoint, PSTATS_FORMAT))
+
+
+request_profiler_ins = RequestProfiler()
@@ -3,23 +3,84 @@ from redis import (
     ConnectionPool,
     ConnectionError,
 )
+from redis.client import Pipeline as _Pipeline
+from redis.cluster import RedisCluster as _RedisCluster
+from redis.exceptions import RedisClusterException
+from redis.sentinel import Sentinel
 from django.conf import settings
 
+from .sharded_redis import ShardedRedis as _ShardedRedis
+from .tracing import SPAN_KIND_CLIENT, start_span
 
-class Redis(_Redis):
+
+# Extends the TTL of an existing access token key to min(now + ARGV[1], ARGV[2]) and
+# returns the resulting expiry as a UNIX timestamp, or nil if the key does not exist
+SLIDE_ACCESS_TOKEN_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return false
+end
+local now = tonumber(redis.call('TIME')[1])
+local expires_at = math.min(now + tonumber(ARGV[1]), tonumber(ARGV[2]))
+local ttl = redis.call('TTL', KEYS[1])
+if ttl >= 0 and now + ttl >= expires_at then
+    return now + ttl
+end
+redis.call('EXPIREAT', KEYS[1], expires_at)
+return expires_at
+"""
+
+
+def _session_tokens_ttl() -> int:
+    # The session index must outlive every token it holds, including extended ones
+    if settings.ACCESS_TOKEN_SLIDING_EXPIRY:
+        return max(settings.ACCESS_TOKEN_EXPIRATION_SECONDS, settings.ACCESS_TOKEN_MAX_LIFETIME_SECONDS)
+    return settings.ACCESS_TOKEN_EXPIRATION_SECONDS
+
+
+class TokenCommandsMixin:
+    """Token and session commands shared by every Redis client flavour."""
 
     def get_access_token(self, token: str):
         return self.get(name=f"access_token:{token}")
 
+    def slide_access_token(
+        self,
+        token: str,
+        max_expires_at: int,
+    ):
+        return self.eval(
+            SLIDE_ACCESS_TOKEN_SCRIPT,
+            1,
+            f"access_token:{token}",
+            settings.ACCESS_TOKEN_EXPIRATION_SECONDS,
+            int(max_expires_at),
+        )
+
     def set_access_token(
         self,
         token: str,
+        session_id: str = None,
     ):
-        return self.set(
+        if session_id is None:
+            return self.set(
+                name=f"access_token:{token}",
+                value="valid",
+                ex=settings.ACCESS_TOKEN_EXPIRATION_SECONDS,
+            )
+
+        # Index the token by session so that revoking a session can find it
+        pipeline = self.pipeline(transaction=False)
+        pipeline.set(
             name=f"access_token:{token}",
             value="valid",
             ex=settings.ACCESS_TOKEN_EXPIRATION_SECONDS,
         )
+        pipeline.sadd(f"session_tokens:{session_id}", token)
+        pipeline.expire(
+            name=f"session_tokens:{session_id}",
+            time=_session_tokens_ttl(),
+        )
+        return pipeline.execute()[0]
     
     def delete_access_token(
         self,
@@ -27,6 +88,141 @@ class Redis(_Redis):
     ):
         return self.delete(f"access_token:{token}")
 
+    def set_access_tokens(
+        self,
+        tokens: list,
+    ):
+        # One pipeline for a batch of (token, session_id) pairs
+        pipeline = self.pipeline(transaction=False)
+        for token, session_id in tokens:
+            pipeline.set(
+                name=f"access_token:{token}",
+                value="valid",
+                ex=settings.ACCESS_TOKEN_EXPIRATION_SECONDS,
+            )
+            pipeline.sadd(f"session_tokens:{session_id}", token)
+            pipeline.expire(
+                name=f"session_tokens:{session_id}",
+                time=_session_tokens_ttl(),
+            )
+        return pipeline.execute()
+
+    def get_session_generation(self, session_id: str):
+        return self.get(name=f"session:{session_id}")
+
+    def increment_session_generation(
+        self,
+        session_id: str,
+    ):
+        pipeline = self.pipeline()
+        pipeline.incr(name=f"session:{session_id}")
+        pipeline.expire(
+            name=f"session:{session_id}",
+            time=settings.ACCESS_TOKEN_EXPIRATION_SECONDS,
+        )
+        generation, _ = pipeline.execute()
+        return generation
+
+    def increment_session_generations(
+        self,
+        session_ids: list,
+    ):
+        pipeline = self.pipeline(transaction=False)
+        for session_id in session_ids:
+            pipeline.incr(name=f"session:{session_id}")
+            pipeline.expire(
+                name=f"session:{session_id}",
+                time=settings.ACCESS_TOKEN_EXPIRATION_SECONDS,
+            )
+        return pipeline.execute()[::2]
+
+    def delete_session(
+        self,
+        session_id: str,
+    ):
+        return self.delete(f"session:{session_id}")
+
+    def delete_sessions(
+        self,
+        session_ids: list,
+    ):
+        return self.delete(*[f"session:{session_id}" for session_id in session_ids])
+
+    def delete_session_tokens(
+        self,
+        session_ids: list,
+    ):
+        pipeline = self.pipeline(transaction=False)
+        for session_id in session_ids:
+            pipeline.smembers(f"session_tokens:{session_id}")
+        token_sets = pipeline.execute()
+
+        keys = [f"session_tokens:{session_id}" for session_id in session_ids]
+        for tokens in token_sets:
+            keys.extend(f"access_token:{token.decode()}" for token in tokens)
+        return self.delete(*keys)
+
+
+class TracingMixin:
+    """Records every Redis command of a traced request as a client span."""
+
+    def execute_command(self, *args, **options):
+        with start_span(f"redis {args[0]}", kind=SPAN_KIND_CLIENT, **{"db.system": "redis"}):
+            return super().execute_command(*args, **options)
+
+
+class Pipeline(_Pipeline):
+    def execute(self, raise_on_error=True):
+        with start_span("redis pipeline", kind=SPAN_KIND_CLIENT, **{
+            "db.system": "redis",
+            "db.redis.command_count": len(self.command_stack),
+        }):
+            return super().execute(raise_on_error=raise_on_error)
+
+
+class Redis(TracingMixin, TokenCommandsMixin, _Redis):
+    def pipeline(self, transaction=True, shard_hint=None) -> Pipeline:
+        return Pipeline(
+            self.connection_pool, self.response_callbacks, transaction, shard_hint
+        )
+
+
+class RedisCluster(TracingMixin, TokenCommandsMixin, _RedisCluster):
+    pass
+
+
+class ShardedRedis(TokenCommandsMixin, _ShardedRedis):
+    pass
+
+
+def _create_node_client(host: str, port) -> Redis:
+    return Redis(
+        host=host,
+        port=port,
+        db=settings.REDIS_DB,
+        password=settings.REDIS_PASSWORD,
+        connection_pool=ConnectionPool(
+            host=host,
+            port=port,
+            db=settings.REDIS_DB,
+            password=settings.REDIS_PASSWORD,
+            max_connections=100,
+        ),
+    )
+
+
+def _create_sentinel() -> Sentinel:
+    sentinels = []
+    for node in settings.REDIS_SENTINELS:
+        host, port = node.rsplit(":", 1)
+        sentinels.append((host, int(port)))
+    return Sentinel(
+        sentinels,
+        sentinel_kwargs={"password": settings.REDIS_SENTINEL_PASSWORD},
+        db=settings.REDIS_DB,
+        password=settings.REDIS_PASSWORD,
+    )
+
 
 class RedisClient:
     _instance: Redis = None
@@ -34,24 +230,67 @@ class RedisClient:
     def __new__(cls):
         if cls._instance is None:
             try:
-                cls._instance: Redis = Redis(
-                    host=settings.REDIS_HOST,
-                    port=settings.REDIS_PORT,
-                    db=settings.REDIS_DB,
-                    password=settings.REDIS_PASSWORD,
-                    connection_pool=ConnectionPool(
+                if settings.REDIS_CLUSTER:
+                    # Slots are discovered from REDIS_HOST; keys are routed by the cluster
+                    cls._instance = RedisCluster(
                         host=settings.REDIS_HOST,
                         port=settings.REDIS_PORT,
-                        db=settings.REDIS_DB,
                         password=settings.REDIS_PASSWORD,
                         max_connections=100,
-                    ),
+                    )
+                elif settings.REDIS_SENTINELS:
+                    # The current primary is discovered (and followed on failover) via Sentinel
+                    cls._instance = _create_sentinel().master_for(
+                        settings.REDIS_SENTINEL_MASTER,
+                        redis_class=Redis,
+                        max_connections=100,
+                    )
+                elif settings.REDIS_NODES:
+                    # Keys are spread over independent nodes by consistent hashing
+                    clients = {}
+                    for node in settings.REDIS_NODES:
+                        host, port = node.rsplit(":", 1)
+                        clients[node] = _create_node_client(host=host, port=int(port))
+                    cls._instance = ShardedRedis(clients=clients)
+                else:
+                    cls._instance: Redis = _create_node_client(
+                        host=settings.REDIS_HOST,
+                        port=settings.REDIS_PORT,
+                    )
+                # Test connection
+                cls._instance.ping()
+            except (ConnectionError, RedisClusterException) as e:
+                cls._instance = None
+        return cls._instance
+
+
+class RedisReplicaClient:
+    """Client for token validation reads.
+
+    With Sentinel and REDIS_READ_FROM_REPLICAS enabled, reads go to the
+    replicas of the monitored primary (falling back to the primary when no
+    replica is available). Otherwise this is the primary client itself.
+    """
+
+    _instance: Redis = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            if not (settings.REDIS_SENTINELS and settings.REDIS_READ_FROM_REPLICAS):
+                return redis_client_ins
+            try:
+                cls._instance: Redis = _create_sentinel().slave_for(
+                    settings.REDIS_SENTINEL_MASTER,
+                    redis_class=Redis,
+                    max_connections=100,
                 )
                 # Test connection
                 cls._instance.ping()
             except ConnectionError as e:
                 cls._instance = None
+                return redis_client_ins
         return cls._instance
 
 
 redis_client_ins = RedisClient()
+redis_replica_ins = RedisReplicaClient()
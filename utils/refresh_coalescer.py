@@ -0,0 +1,124 @@
+import os
+import time
+
+from django.conf import settings
+from redis import RedisError
+
+from .redis_client import redis_client_ins
+
+# Deletes the lock only while it still holds the value its owner stored, so a
+# caller whose lock timed out never releases the lock of the next holder
+RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class RefreshCoalescer:
+    """Single-flight issuance of access tokens on refresh, per session.
+
+    Clients often send several refreshes at once when their access token
+    expires. The first caller takes a short Redis lock for the session, issues
+    the access token and caches it for `REFRESH_COALESCING_WINDOW_SECONDS`.
+    Concurrent and later callers inside the window get the cached token
+    instead of signing and registering another one. This also keeps parallel
+    refreshes from invalidating each other in session mode.
+
+    If the lock holder fails or the lock times out, a waiting caller takes
+    over; the lock is released with a compare-and-delete, so a late holder
+    never releases the lock of its successor. If Redis is unavailable, every
+    caller issues its own token.
+    """
+
+    poll_interval = 0.01
+
+    def _keys(self, session_id: str):
+        # The hash tag keeps both keys on the same shard, for one pipeline
+        return f"refresh:{{{session_id}}}:lock", f"refresh:{{{session_id}}}:result"
+
+    def issue(self, session_id: str, issue_access_token) -> str:
+        """Return the access token issued for a session inside the current window.
+
+        Args:
+            session_id (str): The id of the session being refreshed.
+            issue_access_token (callable): Issues, registers and returns a new
+                access token. Only called when no token can be shared.
+
+        Returns:
+            str: The access token.
+        """
+        if not settings.REFRESH_COALESCING_ENABLED or redis_client_ins is None:
+            return issue_access_token()
+
+        try:
+            return self._issue_once(session_id, issue_access_token)
+        except RedisError:
+            return issue_access_token()
+
+    def discard(self, session_ids: list) -> None:
+        """Drop the cached access tokens of revoked sessions.
+
+        Args:
+            session_ids (list): The ids of the revoked sessions.
+        """
+        if not settings.REFRESH_COALESCING_ENABLED or redis_client_ins is None or not session_ids:
+            return
+
+        # One key per command: the keys of different sessions live in different slots
+        pipeline = redis_client_ins.pipeline(transaction=False)
+        for session_id in session_ids:
+            pipeline.delete(self._keys(session_id)[1])
+        pipeline.execute()
+
+    def _issue_once(self, session_id: str, issue_access_token) -> str:
+        lock_key, result_key = self._keys(session_id)
+        lock_timeout = settings.REFRESH_COALESCING_LOCK_TIMEOUT_SECONDS
+        deadline = time.monotonic() + lock_timeout
+        lock_value = os.urandom(8).hex()
+
+        while True:
+            cached = redis_client_ins.get(result_key)
+            if cached is not None:
+                return cached.decode()
+
+            if redis_client_ins.set(lock_key, lock_value, nx=True, px=int(lock_timeout * 1000)):
+                break
+
+            if time.monotonic() >= deadline:
+                # The lock holder is stuck; do not keep the client waiting
+                return issue_access_token()
+            time.sleep(self.poll_interval)
+
+        # The previous lock holder may have finished between the read and the lock
+        cached = redis_client_ins.get(result_key)
+        if cached is not None:
+            self._release(lock_key, lock_value)
+            return cached.decode()
+
+        try:
+            access_token = issue_access_token()
+        except Exception:
+            self._release(lock_key, lock_value)
+            raise
+
+        try:
+            pipeline = redis_client_ins.pipeline(transaction=False)
+            pipeline.set(
+                result_key,
+                access_token,
+                px=int(settings.REFRESH_COALESCING_WINDOW_SECONDS * 1000),
+            )
+            pipeline.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, lock_value)
+            pipeline.execute()
+        except RedisError:
+            # The token is issued already; waiting callers will take over
+            pass
+        return access_token
+
+    def _release(self, lock_key: str, lock_value: str) -> None:
+        redis_client_ins.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, lock_value)
+
+
+refresh_coalescer_ins = RefreshCoalescer()
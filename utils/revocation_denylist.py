@@ -0,0 +1,145 @@
+import threading
+import time
+
+from django.conf import settings
+
+from .bloom_filter import BloomFilter
+from .redis_client import redis_client_ins
+
+
+class RevocationDenylist:
+    """Per-process denylist of revoked session ids.
+
+    Revocations are published to a Redis stream and a short-lived
+    `revoked_session:{id}` key. Every worker mirrors the stream into an
+    in-memory Bloom filter, pulling new entries at most once per
+    `REVOCATION_SYNC_INTERVAL_SECONDS`. A session id that is not in the filter
+    is certainly not revoked, so the common case costs no Redis round trip.
+    Filter hits are confirmed against the Redis key to rule out false positives.
+
+    Stream entries only matter while an access token issued before the
+    revocation can still be alive, so the stream is trimmed and the filter is
+    rebuilt after `ACCESS_TOKEN_EXPIRATION_SECONDS`.
+
+    Without Redis, revocations are kept in the memory of the current process
+    for the same time, like the in-memory token store.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._filter = None
+        self._last_id = "0-0"
+        self._last_sync = 0.0
+        self._built_at = 0.0
+        self._local = {}  # session id -> expiry, without Redis
+
+    def revoke(self, session_id: str) -> None:
+        """Publish the revocation of a session to every worker.
+
+        Args:
+            session_id (str): The id of the revoked session.
+        """
+        self.revoke_many(session_ids=[session_id])
+
+    def revoke_many(self, session_ids: list) -> None:
+        """Publish the revocation of several sessions in one pipeline.
+
+        Args:
+            session_ids (list): The ids of the revoked sessions.
+        """
+        if redis_client_ins is None:
+            self._revoke_locally(session_ids)
+            return
+
+        min_id = int(time.time() * 1000) - settings.ACCESS_TOKEN_EXPIRATION_SECONDS * 1000
+        pipeline = redis_client_ins.pipeline(transaction=False)
+        for session_id in session_ids:
+            pipeline.set(
+                name=f"revoked_session:{session_id}",
+                value=1,
+                ex=settings.ACCESS_TOKEN_EXPIRATION_SECONDS,
+            )
+            pipeline.xadd(
+                name=settings.REVOCATION_STREAM_NAME,
+                fields={"session_id": session_id},
+                minid=min_id,
+                approximate=True,
+            )
+        pipeline.execute()
+
+        if self._filter is not None:
+            for session_id in session_ids:
+                self._filter.add(session_id)
+
+    def is_revoked(self, session_id: str) -> bool:
+        """Check whether a session has been revoked.
+
+        Args:
+            session_id (str): The id of the session to check.
+
+        Returns:
+            bool: True if the session has been revoked, False otherwise.
+        """
+        if redis_client_ins is None:
+            expiry = self._local.get(session_id)
+            return expiry is not None and expiry > time.monotonic()
+
+        self._sync()
+        if session_id not in self._filter:
+            return False
+        return bool(redis_client_ins.exists(f"revoked_session:{session_id}"))
+
+    def _revoke_locally(self, session_ids: list) -> None:
+        now = time.monotonic()
+        expiry = now + settings.ACCESS_TOKEN_EXPIRATION_SECONDS
+        with self._lock:
+            self._local = {session_id: until for session_id, until in self._local.items() if until > now}
+            for session_id in session_ids:
+                self._local[session_id] = expiry
+
+    def _sync(self) -> None:
+        """Pull new revocations from the stream if the sync interval elapsed."""
+        now = time.monotonic()
+        if self._filter is not None and now - self._last_sync < settings.REVOCATION_SYNC_INTERVAL_SECONDS:
+            return
+
+        with self._lock:
+            if self._filter is not None and now - self._last_sync < settings.REVOCATION_SYNC_INTERVAL_SECONDS:
+                return
+
+            if self._filter is None or now - self._built_at >= settings.ACCESS_TOKEN_EXPIRATION_SECONDS:
+                self._rebuild()
+            else:
+                self._pull()
+            self._last_sync = now
+
+    def _rebuild(self) -> None:
+        """Build a fresh filter from the revocations still within the token lifetime."""
+        bloom_filter = BloomFilter(
+            capacity=settings.REVOCATION_BLOOM_CAPACITY,
+            error_rate=settings.REVOCATION_BLOOM_ERROR_RATE,
+        )
+        window_ms = settings.ACCESS_TOKEN_EXPIRATION_SECONDS * 1000
+        entries = redis_client_ins.xrange(
+            name=settings.REVOCATION_STREAM_NAME,
+            min=int(time.time() * 1000) - window_ms,
+        )
+        for entry_id, fields in entries:
+            bloom_filter.add(fields[b"session_id"].decode())
+            self._last_id = entry_id
+
+        self._filter = bloom_filter
+        self._built_at = time.monotonic()
+
+    def _pull(self) -> None:
+        """Add the stream entries appended since the last sync to the filter."""
+        response = redis_client_ins.xread(
+            streams={settings.REVOCATION_STREAM_NAME: self._last_id},
+        )
+        for _, entries in response:
+            for entry_id, fields in entries:
+                self._filter.add(fields[b"session_id"].decode())
+                self._last_id = entry_id
+
+
+revocation_denylist_ins = RevocationDenylist()
@@ -0,0 +1,84 @@
+import threading
+import time
+
+from django.conf import settings
+from redis import RedisError
+
+from .redis_client import redis_client_ins
+
+# Redis sorted set of session id -> last activity timestamp (seconds since epoch).
+# The hash tag keeps both keys on the same shard, which RENAME requires.
+SESSION_ACTIVITY_KEY = "{session_last_seen}"
+SESSION_ACTIVITY_FLUSHING_KEY = "{session_last_seen}:flushing"
+
+
+class SessionActivityTracker:
+    """Coalesced tracking of the last activity time of sessions.
+
+    Activity is buffered in a Redis sorted set instead of being written to the
+    database on every request; `drain` hands the buffered timestamps over to a
+    periodic bulk update. Each process also skips repeated touches of the same
+    session within `SESSION_ACTIVITY_RESOLUTION_SECONDS`, so a busy session
+    costs at most one Redis write per resolution window and worker.
+
+    Without Redis, activity is not tracked.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._recent = {}
+
+    def touch(self, session_id: str) -> None:
+        """Record activity on a session.
+
+        Tracking is best effort: a Redis failure never fails the request.
+
+        Args:
+            session_id (str): The id of the active session.
+        """
+        if redis_client_ins is None:
+            return
+
+        now = time.time()
+        with self._lock:
+            last_touch = self._recent.get(session_id)
+            if last_touch is not None and now - last_touch < settings.SESSION_ACTIVITY_RESOLUTION_SECONDS:
+                return
+            if len(self._recent) >= settings.SESSION_ACTIVITY_LOCAL_CACHE_SIZE:
+                self._recent.clear()
+            self._recent[session_id] = now
+
+        try:
+            redis_client_ins.zadd(SESSION_ACTIVITY_KEY, {session_id: now})
+        except RedisError:
+            pass
+
+    def drain(self) -> dict:
+        """Atomically take all buffered activity out of Redis.
+
+        The sorted set is renamed before it is read, so touches that arrive
+        while a flush is running land in a fresh set for the next flush.
+
+        Returns:
+            dict: Mapping of session id to last activity timestamp.
+        """
+        if redis_client_ins is None:
+            return {}
+
+        if not redis_client_ins.exists(SESSION_ACTIVITY_FLUSHING_KEY):
+            if not redis_client_ins.exists(SESSION_ACTIVITY_KEY):
+                return {}
+            redis_client_ins.rename(SESSION_ACTIVITY_KEY, SESSION_ACTIVITY_FLUSHING_KEY)
+
+        # A leftover flushing key from an interrupted flush is drained first.
+        entries = redis_client_ins.zrange(SESSION_ACTIVITY_FLUSHING_KEY, 0, -1, withscores=True)
+        return {session_id.decode(): timestamp for session_id, timestamp in entries}
+
+    def acknowledge(self) -> None:
+        """Discard the drained activity once it has been persisted."""
+        if redis_client_ins is None:
+            return
+        redis_client_ins.delete(SESSION_ACTIVITY_FLUSHING_KEY)
+
+
+session_activity_tracker_ins = SessionActivityTracker()
@@ -0,0 +1,187 @@
+from bisect import bisect
+from collections import defaultdict
+from hashlib import blake2b
+
+
+def hash_slot_key(key) -> str:
+    """Return the part of a key that decides its shard.
+
+    Like Redis Cluster, only the content of the first non-empty `{...}` hash
+    tag is hashed, so keys such as `{a}` and `{a}:tmp` always share a shard.
+    """
+    if isinstance(key, bytes):
+        key = key.decode()
+    start = key.find("{")
+    if start != -1:
+        end = key.find("}", start + 1)
+        if end > start + 1:
+            return key[start + 1:end]
+    return key
+
+
+class ConsistentHashRing:
+    """Consistent hash ring mapping keys to node names.
+
+    Each node is placed on the ring `replicas` times, so keys are spread evenly
+    and adding or removing a node only moves about 1/N of the keys.
+    """
+
+    def __init__(self, nodes: list, replicas: int = 160):
+        self._ring = sorted(
+            (self._hash(f"{node}#{replica}"), node)
+            for node in nodes
+            for replica in range(replicas)
+        )
+        self._hashes = [point for point, _ in self._ring]
+
+    @staticmethod
+    def _hash(value: str) -> int:
+        return int.from_bytes(blake2b(value.encode(), digest_size=8).digest(), "big")
+
+    def get_node(self, key) -> str:
+        """Return the node responsible for a key."""
+        index = bisect(self._hashes, self._hash(hash_slot_key(key))) % len(self._ring)
+        return self._ring[index][1]
+
+
+def _command_key(args: tuple, kwargs: dict):
+    """Extract the key a single-key command operates on."""
+    if "streams" in kwargs:
+        streams = kwargs["streams"]
+        if len(streams) != 1:
+            raise ValueError("Sharded Redis only supports reading one stream per call.")
+        return next(iter(streams))
+    if args:
+        return args[0]
+    for name in ("name", "key", "src"):
+        if name in kwargs:
+            return kwargs[name]
+    raise ValueError("Cannot determine the key of the command.")
+
+
+class ShardedRedis:
+    """Redis client that spreads keys over several independent Redis nodes.
+
+    Single-key commands are forwarded to the node chosen by consistent hashing
+    of the key. Multi-key `delete` and `exists` are split per node, and
+    pipelines queue commands per node and send one pipeline to each node.
+
+    Attributes:
+        clients (dict): Mapping of node name to its Redis client.
+    """
+
+    def __init__(self, clients: dict):
+        self.clients = clients
+        self._ring = ConsistentHashRing(list(clients))
+
+    def get_client(self, key):
+        """Return the client of the node responsible for a key."""
+        return self.clients[self._ring.get_node(key)]
+
+    def group_by_client(self, keys) -> dict:
+        """Group keys by the node responsible for them.
+
+        Returns:
+            dict: Mapping of node name to the list of its keys.
+        """
+        groups = defaultdict(list)
+        for key in keys:
+            groups[self._ring.get_node(key)].append(key)
+        return groups
+
+    def ping(self) -> bool:
+        return all(client.ping() for client in self.clients.values())
+
+    def delete(self, *keys) -> int:
+        return sum(
+            self.clients[node].delete(*node_keys)
+            for node, node_keys in self.group_by_client(keys).items()
+        )
+
+    def exists(self, *keys) -> int:
+        return sum(
+            self.clients[node].exists(*node_keys)
+            for node, node_keys in self.group_by_client(keys).items()
+        )
+
+    def eval(self, script, numkeys: int, *keys_and_args):
+        # A script runs on the node of its first key; all its keys must share that node
+        return self.get_client(keys_and_args[0]).eval(script, numkeys, *keys_and_args)
+
+    def pipeline(self, transaction=False, shard_hint=None):
+        return ShardedPipeline(self)
+
+    def __getattr__(self, command):
+        if command.startswith("_"):
+            raise AttributeError(command)
+
+        def route(*args, **kwargs):
+            client = self.get_client(_command_key(args, kwargs))
+            return getattr(client, command)(*args, **kwargs)
+
+        return route
+
+
+class ShardedPipeline:
+    """Pipeline that groups queued commands per node.
+
+    `execute` sends one non-transactional pipeline per node and returns the
+    results in the order the commands were queued. Multi-key `delete` and
+    `exists` are split per node and their results summed.
+    """
+
+    def __init__(self, sharded_redis: ShardedRedis):
+        self._sharded_redis = sharded_redis
+        self._pipelines = {}
+        # For each queued command, the (node, index) positions of its parts
+        self._positions = []
+
+    def _queue(self, node, command, *args, **kwargs):
+        pipeline = self._pipelines.get(node)
+        if pipeline is None:
+            client = self._sharded_redis.clients[node]
+            pipeline = self._pipelines[node] = client.pipeline(transaction=False)
+        getattr(pipeline, command)(*args, **kwargs)
+        return node, len(pipeline) - 1
+
+    def _queue_multi_key(self, command, keys):
+        groups = self._sharded_redis.group_by_client(keys)
+        self._positions.append([
+            self._queue(node, command, *node_keys) for node, node_keys in groups.items()
+        ])
+        return self
+
+    def delete(self, *keys):
+        return self._queue_multi_key("delete", keys)
+
+    def exists(self, *keys):
+        return self._queue_multi_key("exists", keys)
+
+    def eval(self, script, numkeys: int, *keys_and_args):
+        node = self._sharded_redis._ring.get_node(keys_and_args[0])
+        self._positions.append([self._queue(node, "eval", script, numkeys, *keys_and_args)])
+        return self
+
+    def __getattr__(self, command):
+        if command.startswith("_"):
+            raise AttributeError(command)
+
+        def queue(*args, **kwargs):
+            node = self._sharded_redis._ring.get_node(_command_key(args, kwargs))
+            self._positions.append([self._queue(node, command, *args, **kwargs)])
+            return self
+
+        return queue
+
+    def __len__(self):
+        return len(self._positions)
+
+    def execute(self) -> list:
+        results = {node: pipeline.execute() for node, pipeline in self._pipelines.items()}
+        ordered = []
+        for positions in self._positions:
+            values = [results[node][index] for node, index in positions]
+            ordered.append(values[0] if len(values) == 1 else sum(values))
+        self._pipelines = {}
+        self._positions = []
+        return ordered
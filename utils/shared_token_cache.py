@@ -0,0 +1,231 @@
+import fcntl
+import mmap
+import os
+import struct
+import threading
+import time
+import uuid
+from hashlib import blake2b
+
+from django.conf import settings
+
+HEADER = struct.Struct("<4sI8x")
+MAGIC = b"STC1"
+
+# version, expiry, token digest, session id, user id
+SLOT = struct.Struct("<II16s16sq")
+VERSION = struct.Struct("<I")
+SESSION_OFFSET = 24
+EMPTY_SLOT = bytes(SLOT.size)
+
+# Slots probed for a token after its home slot
+PROBES = 8
+
+
+class SharedTokenCache:
+    """Cache of validated access tokens shared by every worker process of a node.
+
+    The cache is a fixed-size open-addressing hash table in a memory-mapped
+    file (under /dev/shm by default), keyed by a 128-bit digest of the token.
+    Each slot holds the cache expiry and the user and session ids of the token.
+
+    Reads take no lock. Each slot has a version counter that writers make odd
+    while they update it (a seqlock), so readers detect and skip torn slots.
+    Writers serialize on an `flock` of the file. Entries live for at most
+    SHARED_TOKEN_CACHE_TTL_SECONDS and never beyond the token's expiry.
+
+    Revocations made on this node clear the matching entries. Revocations made
+    on other nodes take effect here when the entries expire. Every method is a
+    no-op unless SHARED_TOKEN_CACHE_ENABLED is set.
+    """
+
+    def __init__(self):
+        self._init_lock = threading.Lock()
+        self._file = None
+        self._map = None
+        self._slots = 0
+
+    def _open(self):
+        """Map the cache file, creating or resizing it on first use."""
+        with self._init_lock:
+            if self._map is not None:
+                return self._map
+
+            slots = settings.SHARED_TOKEN_CACHE_SLOTS
+            size = HEADER.size + slots * SLOT.size
+            descriptor = os.open(settings.SHARED_TOKEN_CACHE_PATH, os.O_RDWR | os.O_CREAT, 0o600)
+            cache_file = os.fdopen(descriptor, "r+b")
+            fcntl.flock(cache_file, fcntl.LOCK_EX)
+            try:
+                cache_file.seek(0)
+                header = cache_file.read(HEADER.size)
+                if len(header) < HEADER.size or HEADER.unpack(header) != (MAGIC, slots):
+                    cache_file.truncate(0)
+                    cache_file.truncate(size)
+                    cache_file.seek(0)
+                    cache_file.write(HEADER.pack(MAGIC, slots))
+                    cache_file.flush()
+            finally:
+                fcntl.flock(cache_file, fcntl.LOCK_UN)
+
+            self._file = cache_file
+            self._slots = slots
+            self._map = mmap.mmap(cache_file.fileno(), size)
+            return self._map
+
+    def _digest(self, token: str) -> bytes:
+        return blake2b(token.encode(), digest_size=16).digest()
+
+    def _offsets(self, digest: bytes):
+        home = int.from_bytes(digest[:8], "little")
+        for probe in range(PROBES):
+            yield HEADER.size + ((home + probe) % self._slots) * SLOT.size
+
+    def get(self, token: str):
+        """Return the cached claims of a validated token.
+
+        Args:
+            token (str): The encoded access token.
+
+        Returns:
+            dict or None: The `user_id` and `session_id` of the token, or None
+                          if the token is not cached or its entry expired.
+        """
+        if not settings.SHARED_TOKEN_CACHE_ENABLED:
+            return None
+
+        cache = self._map or self._open()
+        digest = self._digest(token)
+        now = time.time()
+
+        for offset in self._offsets(digest):
+            version, expires_at, slot_digest, session_id, user_id = SLOT.unpack_from(cache, offset)
+            if slot_digest != digest:
+                continue
+            # Skip slots that are being written or changed while being read
+            if version & 1 or VERSION.unpack_from(cache, offset)[0] != version:
+                return None
+            if expires_at <= now:
+                return None
+            return {"user_id": user_id, "session_id": str(uuid.UUID(bytes=session_id))}
+        return None
+
+    def set(self, token: str, user_id, session_id: str, expires_at: float) -> None:
+        """Cache the claims of a token that was just validated.
+
+        Args:
+            token (str): The encoded access token.
+            user_id: The id of the user the token belongs to.
+            session_id (str): The id of the session the token belongs to.
+            expires_at (float): The `exp` claim of the token as a UNIX timestamp.
+        """
+        if not settings.SHARED_TOKEN_CACHE_ENABLED:
+            return
+
+        try:
+            session_bytes = uuid.UUID(str(session_id)).bytes
+            user_id = int(user_id)
+        except (TypeError, ValueError):
+            return
+
+        cache = self._map or self._open()
+        digest = self._digest(token)
+        now = time.time()
+        expires_at = int(min(expires_at, now + settings.SHARED_TOKEN_CACHE_TTL_SECONDS))
+        if expires_at <= now:
+            return
+
+        with self._write_lock():
+            target = None
+            oldest = None
+            for offset in self._offsets(digest):
+                _, slot_expires_at, slot_digest, _, _ = SLOT.unpack_from(cache, offset)
+                if slot_digest == digest or slot_expires_at <= now:
+                    target = offset
+                    break
+                if oldest is None or slot_expires_at < oldest[0]:
+                    oldest = (slot_expires_at, offset)
+            if target is None:
+                target = oldest[1]
+            self._write_slot(cache, target, expires_at, digest, session_bytes, user_id)
+
+    def invalidate(self, token: str) -> None:
+        """Remove a token from the cache."""
+        if not settings.SHARED_TOKEN_CACHE_ENABLED:
+            return
+
+        cache = self._map or self._open()
+        digest = self._digest(token)
+        with self._write_lock():
+            for offset in self._offsets(digest):
+                if SLOT.unpack_from(cache, offset)[2] == digest:
+                    self._clear_slot(cache, offset)
+
+    def invalidate_sessions(self, session_ids: list) -> None:
+        """Remove every token of the given sessions from the cache.
+
+        The table is scanned once per call, without the write lock, for slots
+        holding any of the sessions. Only the matching slots are then cleared
+        under the lock, after checking that they still hold those sessions.
+        """
+        if not settings.SHARED_TOKEN_CACHE_ENABLED:
+            return
+
+        needles = set()
+        for session_id in session_ids:
+            try:
+                needles.add(uuid.UUID(str(session_id)).bytes)
+            except ValueError:
+                continue
+        if not needles:
+            return
+
+        cache = self._map or self._open()
+        with memoryview(cache) as view:
+            offsets = [
+                HEADER.size + index * SLOT.size
+                for index, slot in enumerate(SLOT.iter_unpack(view[HEADER.size:]))
+                if slot[3] in needles
+            ]
+        if not offsets:
+            return
+
+        with self._write_lock():
+            for offset in offsets:
+                if cache[offset + SESSION_OFFSET:offset + SESSION_OFFSET + 16] in needles:
+                    self._clear_slot(cache, offset)
+
+    def _write_lock(self):
+        return _FileLock(self._file)
+
+    def _write_slot(self, cache, offset, expires_at, digest, session_bytes, user_id):
+        version = VERSION.unpack_from(cache, offset)[0]
+        VERSION.pack_into(cache, offset, (version + 1) & 0xFFFFFFFF)
+        SLOT.pack_into(cache, offset, (version + 1) & 0xFFFFFFFF, expires_at, digest, session_bytes, user_id)
+        VERSION.pack_into(cache, offset, (version + 2) & 0xFFFFFFFF)
+
+    def _clear_slot(self, cache, offset):
+        version = VERSION.unpack_from(cache, offset)[0]
+        VERSION.pack_into(cache, offset, (version + 1) & 0xFFFFFFFF)
+        cache[offset + VERSION.size:offset + SLOT.size] = EMPTY_SLOT[VERSION.size:]
+        VERSION.pack_into(cache, offset, (version + 2) & 0xFFFFFFFF)
+
+
+class _FileLock:
+    """Exclusive `flock` of the cache file, serializing writers across processes and threads."""
+
+    _thread_lock = threading.Lock()
+
+    def __init__(self, cache_file):
+        self._file = cache_file
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        fcntl.flock(self._file, fcntl.LOCK_EX)
+
+    def __exit__(self, *exc_info):
+        fcntl.flock(self._file, fcntl.LOCK_UN)
+        self._thread_lock.release()
+
+
+shared_token_cache_ins = SharedTokenCache()
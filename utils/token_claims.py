@@ -0,0 +1,75 @@
+import binascii
+import uuid
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from jwt import InvalidTokenError
+
+# Short claim names used by the compact claim profile
+COMPACT_CLAIM_NAMES = {
+    "user_id": "u",
+    "session_id": "s",
+    "type": "t",
+    "generation": "g",
+}
+STANDARD_CLAIM_NAMES = {short: name for name, short in COMPACT_CLAIM_NAMES.items()}
+
+# Integer codes for the token type claim
+TOKEN_TYPE_CODES = {
+    "access": 1,
+    "refresh": 2,
+}
+TOKEN_TYPE_NAMES = {code: name for name, code in TOKEN_TYPE_CODES.items()}
+
+
+def compact_claims(payload: dict) -> dict:
+    """Convert a standard token payload to the compact claim profile.
+
+    Claim names are shortened, the session id is encoded as the base64url form
+    of its 16 raw bytes (22 characters instead of 36) and the token type is
+    replaced by an integer code. Registered claims such as `exp` are kept as is.
+
+    Args:
+        payload (dict): The payload using standard claim names.
+
+    Returns:
+        dict: The payload using compact claim names.
+    """
+    compact = {}
+    for name, value in payload.items():
+        if name == "session_id":
+            value = urlsafe_b64encode(uuid.UUID(str(value)).bytes).rstrip(b"=").decode()
+        elif name == "type":
+            value = TOKEN_TYPE_CODES[value]
+        compact[COMPACT_CLAIM_NAMES.get(name, name)] = value
+    return compact
+
+
+def expand_claims(payload: dict) -> dict:
+    """Convert a compact token payload back to standard claim names.
+
+    Payloads that already use standard claim names are returned unchanged, so
+    tokens of both profiles can be decoded while clients migrate.
+
+    Args:
+        payload (dict): The decoded payload.
+
+    Returns:
+        dict: The payload using standard claim names.
+
+    Raises:
+        InvalidTokenError: If a compact claim cannot be decoded.
+    """
+    if "s" not in payload and "t" not in payload:
+        return payload
+
+    standard = {}
+    try:
+        for name, value in payload.items():
+            if name == "s":
+                value = str(uuid.UUID(bytes=urlsafe_b64decode(value + "==")))
+            elif name == "t":
+                value = TOKEN_TYPE_NAMES[value]
+            standard[STANDARD_CLAIM_NAMES.get(name, name)] = value
+    except (binascii.Error, KeyError, TypeError, ValueError):
+        raise InvalidTokenError("Invalid compact token claims.")
+    return standard
@@ -0,0 +1,261 @@
+import time
+
+from django.conf import settings
+from jwt import InvalidTokenError
+
+from .decode_token import decode_token
+from .refresh_coalescer import refresh_coalescer_ins
+from .revocation_denylist import revocation_denylist_ins
+from .shared_token_cache import shared_token_cache_ins
+from .token_store import token_store_ins
+
+# Supported values of settings.TOKEN_VALIDATION_MODE
+ALLOWLIST_MODE = "allowlist"
+SESSION_MODE = "session"
+DENYLIST_MODE = "denylist"
+
+
+def next_session_generation(session_id: str):
+    """Advance the generation counter of a session before issuing an access token.
+
+    In session mode the token store holds the generation of the only
+    access token currently valid for the session. Issuing a new token bumps the
+    counter, which also invalidates the previous access token of the session.
+
+    Args:
+        session_id (str): The id of the session the token is issued for.
+
+    Returns:
+        int or None: The generation to embed in the token in session mode,
+                     otherwise None.
+    """
+    if settings.TOKEN_VALIDATION_MODE == SESSION_MODE:
+        return token_store_ins.increment_session_generation(session_id=session_id)
+    return None
+
+
+def next_session_generations(session_ids: list):
+    """Batch version of `next_session_generation`, in one store call.
+
+    Args:
+        session_ids (list): The ids of the sessions tokens are issued for.
+
+    Returns:
+        list or None: The generations in the order of `session_ids` in session
+                      mode, otherwise None.
+    """
+    if settings.TOKEN_VALIDATION_MODE == SESSION_MODE:
+        return token_store_ins.increment_session_generations(session_ids=session_ids)
+    return None
+
+
+def register_access_token(token: str, session_id: str) -> None:
+    """Make a freshly issued access token valid.
+
+    In allowlist mode the token is stored in the token store and indexed by session. In
+    session mode the token was registered by `next_session_generation`, and in
+    denylist mode a token is valid by its signature alone, so nothing is written.
+
+    Args:
+        token (str): The encoded access token.
+        session_id (str): The id of the session the token is issued for.
+    """
+    if settings.TOKEN_VALIDATION_MODE == ALLOWLIST_MODE:
+        token_store_ins.set_access_token(token=token, session_id=session_id)
+
+
+def register_access_tokens(tokens: list) -> None:
+    """Batch version of `register_access_token`, in one store call.
+
+    Args:
+        tokens (list): (token, session_id) pairs.
+    """
+    if settings.TOKEN_VALIDATION_MODE == ALLOWLIST_MODE and tokens:
+        token_store_ins.set_access_tokens(tokens=tokens)
+
+
+def validate_access_token(token: str):
+    """Validate an access token and return its claims.
+
+    In allowlist mode the token must be present in the token store. Only tokens
+    issued by this service are stored, so the claims are then read without a
+    second signature check. In session mode the token generation must match
+    the one stored for its session. In denylist mode the session must not be in
+    the revocation denylist. Outside allowlist mode the signature and expiry
+    are verified locally first.
+
+    With ACCESS_TOKEN_SLIDING_EXPIRY in allowlist mode, the lookup also extends
+    the token's lifetime in the store, and the returned `exp` claim is the
+    effective expiry.
+
+    Token store reads go to a replica when replica reads are enabled. A replica
+    that has not caught up yet with the token is retried on the primary
+    according to REDIS_REPLICA_MISS_POLICY, so freshly issued tokens are never
+    rejected.
+
+    Args:
+        token (str): The encoded access token.
+
+    Returns:
+        dict or None: The claims of the token if it is valid, otherwise None.
+
+    Raises:
+        ExpiredSignatureError: If the token has expired (session and denylist modes only).
+        InvalidTokenError: If the token is invalid.
+    """
+    mode = settings.TOKEN_VALIDATION_MODE
+    if mode == ALLOWLIST_MODE:
+        if settings.ACCESS_TOKEN_SLIDING_EXPIRY:
+            return _validate_and_extend_access_token(token=token)
+        token_value = token_store_ins.get_access_token(token=token, replica=True)
+        if token_value is None and _should_retry_on_primary(token=token):
+            token_value = token_store_ins.get_access_token(token=token)
+        if token_value != b"valid":
+            return None
+        return decode_token(token=token, verify=False)
+
+    payload = decode_token(token=token)
+    if payload.get("type") != "access":
+        return None
+
+    if mode == SESSION_MODE:
+        session_id = payload.get("session_id")
+        generation = token_store_ins.get_session_generation(session_id=session_id, replica=True)
+        is_behind = generation is None or int(generation) < payload.get("generation", 0)
+        if is_behind and _should_retry_on_primary(token=token, payload=payload):
+            generation = token_store_ins.get_session_generation(session_id=session_id)
+        is_valid = generation is not None and int(generation) == payload.get("generation")
+        return payload if is_valid else None
+
+    if revocation_denylist_ins.is_revoked(payload.get("session_id")):
+        return None
+    return payload
+
+
+def is_access_token_valid(token: str) -> bool:
+    """Check whether an access token is currently valid.
+
+    See `validate_access_token` for the checks made in each validation mode.
+
+    Args:
+        token (str): The encoded access token.
+
+    Returns:
+        bool: True if the token is valid, False otherwise.
+
+    Raises:
+        ExpiredSignatureError: If the token has expired (session and denylist modes only).
+        InvalidTokenError: If the token is invalid (session and denylist modes only).
+    """
+    mode = settings.TOKEN_VALIDATION_MODE
+    if mode == ALLOWLIST_MODE and not settings.ACCESS_TOKEN_SLIDING_EXPIRY:
+        token_value = token_store_ins.get_access_token(token=token, replica=True)
+        if token_value is None and _should_retry_on_primary(token=token):
+            token_value = token_store_ins.get_access_token(token=token)
+        return token_value == b"valid"
+
+    return validate_access_token(token=token) is not None
+
+
+def _validate_and_extend_access_token(token: str):
+    """Validate an access token in sliding expiry mode and extend its lifetime.
+
+    The token store checks the token and extends it in one operation (one Lua
+    script on Redis), always on the primary. The lifetime is capped at
+    ACCESS_TOKEN_MAX_LIFETIME_SECONDS after issuance, derived from the `exp`
+    claim set at issuance.
+
+    Args:
+        token (str): The encoded access token.
+
+    Returns:
+        dict or None: The claims of the token with `exp` set to the effective
+                      expiry if it is valid, otherwise None.
+
+    Raises:
+        InvalidTokenError: If the token cannot be decoded.
+    """
+    # Only issued tokens are stored, so the claims can be read before the lookup
+    payload = decode_token(token=token, verify=False)
+    issued_at = payload.get("exp", 0) - settings.ACCESS_TOKEN_EXPIRATION_SECONDS
+    expires_at = token_store_ins.slide_access_token(
+        token=token,
+        max_expires_at=issued_at + settings.ACCESS_TOKEN_MAX_LIFETIME_SECONDS,
+    )
+    if expires_at is None:
+        return None
+    payload["exp"] = int(expires_at)
+    return payload
+
+
+def _should_retry_on_primary(token: str, payload: dict = None) -> bool:
+    """Decide whether a replica miss must be confirmed on the primary.
+
+    Args:
+        token (str): The encoded access token.
+        payload (dict): The token claims, if already decoded.
+
+    Returns:
+        bool: True if the read should be repeated on the primary.
+    """
+    if not token_store_ins.uses_replicas:
+        return False
+    if settings.REDIS_REPLICA_MISS_POLICY == "always":
+        return True
+
+    if payload is None:
+        try:
+            # Only the issue time is needed; validity is decided by the store
+            payload = decode_token(token=token, verify=False)
+        except InvalidTokenError:
+            return False
+    issued_at = payload.get("exp", 0) - settings.ACCESS_TOKEN_EXPIRATION_SECONDS
+    return time.time() - issued_at <= settings.REDIS_REPLICA_MAX_LAG_SECONDS
+
+
+def revoke_access_token(token: str, session_id: str) -> None:
+    """Invalidate an access token and, outside allowlist mode, its whole session.
+
+    The session's entries in the shared token cache of this node and its
+    coalesced refresh result are cleared too.
+
+    Args:
+        token (str): The encoded access token.
+        session_id (str): The id of the session the token belongs to.
+    """
+    mode = settings.TOKEN_VALIDATION_MODE
+    if mode == SESSION_MODE:
+        token_store_ins.delete_session(session_id=session_id)
+    elif mode == DENYLIST_MODE:
+        revocation_denylist_ins.revoke(session_id=session_id)
+    else:
+        token_store_ins.delete_access_token(token=token)
+    shared_token_cache_ins.invalidate(token=token)
+    shared_token_cache_ins.invalidate_sessions(session_ids=[session_id])
+    refresh_coalescer_ins.discard(session_ids=[session_id])
+
+
+def revoke_sessions(session_ids: list) -> None:
+    """Invalidate every access token of the given sessions.
+
+    The store is updated in batches of `TOKEN_REVOCATION_BATCH_SIZE` sessions,
+    so revoking many sessions on Redis costs a few round trips per batch
+    rather than one per session.
+
+    Args:
+        session_ids (list): The ids of the sessions to revoke.
+    """
+    mode = settings.TOKEN_VALIDATION_MODE
+    batch_size = settings.TOKEN_REVOCATION_BATCH_SIZE
+    session_ids = [str(session_id) for session_id in session_ids]
+
+    for start in range(0, len(session_ids), batch_size):
+        batch = session_ids[start:start + batch_size]
+        if mode == SESSION_MODE:
+            token_store_ins.delete_sessions(session_ids=batch)
+        elif mode == DENYLIST_MODE:
+            revocation_denylist_ins.revoke_many(session_ids=batch)
+        else:
+            token_store_ins.delete_session_tokens(session_ids=batch)
+        shared_token_cache_ins.invalidate_sessions(session_ids=batch)
+        refresh_coalescer_ins.discard(session_ids=batch)
@@ -0,0 +1,275 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from .redis_client import redis_client_ins, redis_replica_ins
+
+
+class TokenStore(ABC):
+    """Interface of the storage behind access token issuance and validation.
+
+    Allowlist mode stores each access token (indexed by session), and session
+    mode stores one generation counter per session. Read methods accept
+    `replica=True` to read from a replica when the backend has one.
+    """
+
+    @property
+    def uses_replicas(self) -> bool:
+        """Whether reads with `replica=True` may lag behind writes."""
+        return False
+
+    @abstractmethod
+    def get_access_token(self, token: str, replica: bool = False):
+        ...
+
+    @abstractmethod
+    def slide_access_token(self, token: str, max_expires_at: float):
+        """Extend the lifetime of a stored access token, for sliding expiry.
+
+        The token is kept for ACCESS_TOKEN_EXPIRATION_SECONDS from now, but not
+        beyond `max_expires_at`, and never shortened.
+
+        Args:
+            token (str): The encoded access token.
+            max_expires_at (float): The hard expiry cap as a UNIX timestamp.
+
+        Returns:
+            int or None: The effective expiry as a UNIX timestamp, or None if
+                         the token is not stored.
+        """
+
+    @abstractmethod
+    def set_access_token(self, token: str, session_id: str = None):
+        ...
+
+    @abstractmethod
+    def set_access_tokens(self, tokens: list):
+        """Store a batch of (token, session_id) pairs."""
+
+    @abstractmethod
+    def delete_access_token(self, token: str):
+        ...
+
+    @abstractmethod
+    def get_session_generation(self, session_id: str, replica: bool = False):
+        ...
+
+    @abstractmethod
+    def increment_session_generation(self, session_id: str):
+        ...
+
+    @abstractmethod
+    def increment_session_generations(self, session_ids: list):
+        ...
+
+    @abstractmethod
+    def delete_session(self, session_id: str):
+        ...
+
+    @abstractmethod
+    def delete_sessions(self, session_ids: list):
+        ...
+
+    @abstractmethod
+    def delete_session_tokens(self, session_ids: list):
+        """Delete every access token stored for the given sessions."""
+
+
+class RedisTokenStore(TokenStore):
+    """Token store backed by the shared Redis deployment.
+
+    Writes go to the primary client; reads with `replica=True` go to the
+    replica client when Sentinel replica reads are enabled.
+    """
+
+    @property
+    def uses_replicas(self) -> bool:
+        return redis_replica_ins is not redis_client_ins
+
+    def _reader(self, replica: bool):
+        return redis_replica_ins if replica else redis_client_ins
+
+    def get_access_token(self, token: str, replica: bool = False):
+        return self._reader(replica).get_access_token(token=token)
+
+    def slide_access_token(self, token: str, max_expires_at: float):
+        # Validation and extension run in one Lua script on the primary
+        return redis_client_ins.slide_access_token(token=token, max_expires_at=max_expires_at)
+
+    def set_access_token(self, token: str, session_id: str = None):
+        return redis_client_ins.set_access_token(token=token, session_id=session_id)
+
+    def set_access_tokens(self, tokens: list):
+        return redis_client_ins.set_access_tokens(tokens=tokens)
+
+    def delete_access_token(self, token: str):
+        return redis_client_ins.delete_access_token(token=token)
+
+    def get_session_generation(self, session_id: str, replica: bool = False):
+        return self._reader(replica).get_session_generation(session_id=session_id)
+
+    def increment_session_generation(self, session_id: str):
+        return redis_client_ins.increment_session_generation(session_id=session_id)
+
+    def increment_session_generations(self, session_ids: list):
+        return redis_client_ins.increment_session_generations(session_ids=session_ids)
+
+    def delete_session(self, session_id: str):
+        return redis_client_ins.delete_session(session_id=session_id)
+
+    def delete_sessions(self, session_ids: list):
+        return redis_client_ins.delete_sessions(session_ids=session_ids)
+
+    def delete_session_tokens(self, session_ids: list):
+        return redis_client_ins.delete_session_tokens(session_ids=session_ids)
+
+
+class InMemoryTokenStore(TokenStore):
+    """Token store kept in the memory of the current process.
+
+    Entries expire after ACCESS_TOKEN_EXPIRATION_SECONDS like their Redis
+    counterparts. Expired entries are dropped when read and by a sweep that
+    runs at most every `sweep_interval` seconds on writes.
+
+    The store is not shared between processes, so it only suits deployments
+    with a single worker process (threads are fine) and local load tests.
+    """
+
+    sweep_interval = 60
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tokens = {}  # token -> expiry
+        self._session_tokens = {}  # session id -> (set of tokens, expiry)
+        self._generations = {}  # session id -> (generation, expiry)
+        self._next_sweep = time.monotonic() + self.sweep_interval
+
+    def _expiry(self) -> float:
+        return time.monotonic() + settings.ACCESS_TOKEN_EXPIRATION_SECONDS
+
+    def _sweep(self, now: float) -> None:
+        if now < self._next_sweep:
+            return
+        self._next_sweep = now + self.sweep_interval
+        self._tokens = {token: expiry for token, expiry in self._tokens.items() if expiry > now}
+        self._session_tokens = {
+            session_id: entry for session_id, entry in self._session_tokens.items() if entry[1] > now
+        }
+        self._generations = {
+            session_id: entry for session_id, entry in self._generations.items() if entry[1] > now
+        }
+
+    def _store_token(self, token: str, session_id, expiry: float) -> None:
+        self._tokens[token] = expiry
+        if session_id is not None:
+            session_id = str(session_id)
+            tokens, _ = self._session_tokens.get(session_id, (set(), None))
+            tokens.add(token)
+            if settings.ACCESS_TOKEN_SLIDING_EXPIRY:
+                # The session index must outlive every token it holds, including extended ones
+                expiry += max(0, settings.ACCESS_TOKEN_MAX_LIFETIME_SECONDS - settings.ACCESS_TOKEN_EXPIRATION_SECONDS)
+            self._session_tokens[session_id] = (tokens, expiry)
+
+    def get_access_token(self, token: str, replica: bool = False):
+        expiry = self._tokens.get(token)
+        if expiry is None or expiry <= time.monotonic():
+            return None
+        return b"valid"
+
+    def slide_access_token(self, token: str, max_expires_at: float):
+        with self._lock:
+            now = time.monotonic()
+            expiry = self._tokens.get(token)
+            if expiry is None or expiry <= now:
+                return None
+            # Expiries are kept on the monotonic clock; the cap is wall clock time
+            max_expiry = max_expires_at - time.time() + now
+            expiry = max(expiry, min(self._expiry(), max_expiry))
+            self._tokens[token] = expiry
+            return int(time.time() + expiry - now)
+
+    def set_access_token(self, token: str, session_id: str = None):
+        with self._lock:
+            now = time.monotonic()
+            self._sweep(now)
+            self._store_token(token, session_id, self._expiry())
+        return True
+
+    def set_access_tokens(self, tokens: list):
+        with self._lock:
+            now = time.monotonic()
+            self._sweep(now)
+            expiry = self._expiry()
+            for token, session_id in tokens:
+                self._store_token(token, session_id, expiry)
+        return [True] * len(tokens)
+
+    def delete_access_token(self, token: str):
+        with self._lock:
+            return 1 if self._tokens.pop(token, None) is not None else 0
+
+    def get_session_generation(self, session_id: str, replica: bool = False):
+        entry = self._generations.get(str(session_id))
+        if entry is None or entry[1] <= time.monotonic():
+            return None
+        return entry[0]
+
+    def _increment(self, session_id, now: float, expiry: float) -> int:
+        session_id = str(session_id)
+        generation, previous_expiry = self._generations.get(session_id, (0, None))
+        if previous_expiry is not None and previous_expiry <= now:
+            generation = 0
+        self._generations[session_id] = (generation + 1, expiry)
+        return generation + 1
+
+    def increment_session_generation(self, session_id: str):
+        with self._lock:
+            now = time.monotonic()
+            self._sweep(now)
+            return self._increment(session_id, now, self._expiry())
+
+    def increment_session_generations(self, session_ids: list):
+        with self._lock:
+            now = time.monotonic()
+            self._sweep(now)
+            expiry = self._expiry()
+            return [self._increment(session_id, now, expiry) for session_id in session_ids]
+
+    def delete_session(self, session_id: str):
+        return self.delete_sessions(session_ids=[session_id])
+
+    def delete_sessions(self, session_ids: list):
+        with self._lock:
+            return sum(
+                self._generations.pop(str(session_id), None) is not None
+                for session_id in session_ids
+            )
+
+    def delete_session_tokens(self, session_ids: list):
+        deleted = 0
+        with self._lock:
+            for session_id in session_ids:
+                tokens, _ = self._session_tokens.pop(str(session_id), (set(), None))
+                deleted += 1 if tokens else 0
+                for token in tokens:
+                    deleted += self._tokens.pop(token, None) is not None
+        return deleted
+
+
+# Short names accepted by TOKEN_STORE_BACKEND; any other value is a dotted path
+TOKEN_STORE_BACKENDS = {
+    "redis": RedisTokenStore,
+    "memory": InMemoryTokenStore,
+}
+
+
+def _create_token_store() -> TokenStore:
+    backend = settings.TOKEN_STORE_BACKEND
+    backend_class = TOKEN_STORE_BACKENDS.get(backend) or import_string(backend)
+    return backend_class()
+
+
+token_store_ins = _create_token_store()
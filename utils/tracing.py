@@ -0,0 +1,307 @@
+import atexit
+import json
+import os
+import queue
+import random
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+# W3C Trace Context header: version-trace_id-parent_id-flags
+TRACEPARENT_PATTERN = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+INVALID_TRACE_ID = "0" * 32
+INVALID_SPAN_ID = "0" * 16
+
+# OTLP span kinds and status codes
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+STATUS_CODE_ERROR = 2
+
+_current_span = ContextVar("current_span", default=None)
+
+
+class Span:
+    """A timed operation of a trace.
+
+    Attributes:
+        trace (Trace): The trace the span belongs to.
+        span_id (str): The 16 hex digit id of the span.
+        parent_span_id (str or None): The id of the parent span, if any.
+        name (str): The operation name.
+        kind (int): The OTLP span kind.
+        attributes (dict): Span attributes.
+    """
+
+    __slots__ = (
+        "trace", "span_id", "parent_span_id", "name", "kind", "attributes",
+        "start_time", "end_time", "error",
+    )
+
+    def __init__(self, trace, name: str, kind: int, parent_span_id: str = None, attributes: dict = None):
+        self.trace = trace
+        self.span_id = os.urandom(8).hex()
+        self.parent_span_id = parent_span_id
+        self.name = name
+        self.kind = kind
+        self.attributes = attributes or {}
+        self.start_time = time.time_ns()
+        self.end_time = None
+        self.error = None
+
+    def set_attribute(self, key: str, value) -> None:
+        self.attributes[key] = value
+
+    def set_error(self, message: str) -> None:
+        self.error = message
+
+    def end(self) -> None:
+        self.end_time = time.time_ns()
+        self.trace.spans.append(self)
+
+    @property
+    def traceparent(self) -> str:
+        """The W3C `traceparent` header value identifying this span."""
+        return f"00-{self.trace.trace_id}-{self.span_id}-01"
+
+    def to_otlp(self) -> dict:
+        span = {
+            "traceId": self.trace.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_time),
+            "endTimeUnixNano": str(self.end_time),
+            "attributes": _otlp_attributes(self.attributes),
+            "status": {},
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        if self.error is not None:
+            span["status"] = {"code": STATUS_CODE_ERROR, "message": self.error}
+        return span
+
+
+class Trace:
+    """The spans of one sampled request, exported together when the request ends."""
+
+    __slots__ = ("trace_id", "spans")
+
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.spans = []
+
+
+def _otlp_attributes(attributes: dict) -> list:
+    result = []
+    for key, value in attributes.items():
+        if isinstance(value, bool):
+            encoded = {"boolValue": value}
+        elif isinstance(value, int):
+            encoded = {"intValue": str(value)}
+        elif isinstance(value, float):
+            encoded = {"doubleValue": value}
+        else:
+            encoded = {"stringValue": str(value)}
+        result.append({"key": key, "value": encoded})
+    return result
+
+
+def parse_traceparent(header: str):
+    """Parse a W3C `traceparent` header.
+
+    Args:
+        header (str): The header value.
+
+    Returns:
+        tuple or None: (trace_id, parent_span_id, sampled), or None if the
+                       header is missing or malformed.
+    """
+    if not header:
+        return None
+    match = TRACEPARENT_PATTERN.match(header.strip().lower())
+    if match is None:
+        return None
+    trace_id, parent_span_id, flags = match.groups()
+    if trace_id == INVALID_TRACE_ID or parent_span_id == INVALID_SPAN_ID:
+        return None
+    return trace_id, parent_span_id, bool(int(flags, 16) & 0x01)
+
+
+class SpanExporter:
+    """Writes finished traces as OTLP/JSON lines to a file or stdout.
+
+    Each line is a complete `ExportTraceServiceRequest`, the format read by
+    the OpenTelemetry Collector `otlpjsonfile` receiver, so traces can be
+    inspected locally or shipped later without running a collector.
+
+    `export` only puts the trace on a bounded queue; a background thread
+    serializes and writes it, so a sampled request never waits on disk or
+    pipe I/O. When TRACING_EXPORT_QUEUE_SIZE traces are waiting, new traces
+    are dropped.
+
+    Attributes:
+        dropped (int): Number of traces dropped because the queue was full.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queue = None
+        self._thread = None
+        self._pid = None
+        self.dropped = 0
+        atexit.register(self.flush)
+
+    def export(self, trace: Trace) -> None:
+        self._ensure_thread()
+        try:
+            # The destination is resolved now, in the settings of the request
+            self._queue.put_nowait((trace, settings.TRACING_SERVICE_NAME, settings.TRACING_EXPORT_PATH))
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self) -> None:
+        """Wait until every queued trace has been written."""
+        if self._queue is not None and self._pid == os.getpid():
+            self._queue.join()
+
+    def _ensure_thread(self) -> None:
+        """Start the writer thread, once per process (it does not survive a fork)."""
+        if self._pid == os.getpid() and self._thread is not None:
+            return
+        with self._lock:
+            if self._pid == os.getpid() and self._thread is not None:
+                return
+            self._queue = queue.Queue(maxsize=settings.TRACING_EXPORT_QUEUE_SIZE)
+            self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def _run(self) -> None:
+        while True:
+            trace, service_name, export_path = self._queue.get()
+            try:
+                self._write(trace, service_name, export_path)
+            except OSError:
+                # Tracing must never fail the service
+                pass
+            finally:
+                self._queue.task_done()
+
+    def _write(self, trace: Trace, service_name: str, export_path: str) -> None:
+        line = json.dumps({
+            "resourceSpans": [{
+                "resource": {
+                    "attributes": _otlp_attributes({"service.name": service_name}),
+                },
+                "scopeSpans": [{
+                    "scope": {"name": "utils.tracing"},
+                    "spans": [span.to_otlp() for span in trace.spans],
+                }],
+            }],
+        }, separators=(",", ":"))
+
+        if export_path:
+            with open(export_path, "a") as export_file:
+                export_file.write(line + "\n")
+        else:
+            sys.stdout.write(line + "\n")
+            sys.stdout.flush()
+
+
+span_exporter_ins = SpanExporter()
+
+
+def current_span():
+    """Return the active span of the current request, or None if it is not traced."""
+    return _current_span.get()
+
+
+@contextmanager
+def start_trace(name: str, traceparent: str = None, **attributes):
+    """Start the root (server) span of a request and export the trace when it ends.
+
+    An incoming `traceparent` is continued with its own sampling decision;
+    otherwise a new trace is sampled with probability `TRACING_SAMPLE_RATE`.
+
+    Args:
+        name (str): The span name.
+        traceparent (str): The incoming W3C `traceparent` header, if any.
+        **attributes: Span attributes.
+
+    Yields:
+        Span or None: The root span, or None if the request is not traced.
+    """
+    if not settings.TRACING_ENABLED:
+        yield None
+        return
+
+    parent = parse_traceparent(traceparent)
+    if parent is not None:
+        trace_id, parent_span_id, sampled = parent
+    else:
+        trace_id, parent_span_id = os.urandom(16).hex(), None
+        sampled = random.random() < settings.TRACING_SAMPLE_RATE
+    if not sampled:
+        yield None
+        return
+
+    trace = Trace(trace_id=trace_id)
+    span = Span(trace, name=name, kind=SPAN_KIND_SERVER, parent_span_id=parent_span_id, attributes=attributes)
+    token = _current_span.set(span)
+    try:
+        yield span
+    except Exception as e:
+        span.set_error(type(e).__name__)
+        raise
+    finally:
+        _current_span.reset(token)
+        span.end()
+        span_exporter_ins.export(trace)
+
+
+@contextmanager
+def start_span(name: str, kind: int = SPAN_KIND_INTERNAL, **attributes):
+    """Start a child span of the active span.
+
+    This is a no-op costing one context variable lookup when the current
+    request is not traced.
+
+    Args:
+        name (str): The span name.
+        kind (int): The OTLP span kind.
+        **attributes: Span attributes.
+
+    Yields:
+        Span or None: The new span, or None if the request is not traced.
+    """
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+
+    span = Span(parent.trace, name=name, kind=kind, parent_span_id=parent.span_id, attributes=attributes)
+    token = _current_span.set(span)
+    try:
+        yield span
+    except Exception as e:
+        span.set_error(type(e).__name__)
+        raise
+    finally:
+        _current_span.reset(token)
+        span.end()
+
+
+def trace_database_query(execute, sql, params, many, context):
+    """Django `execute_wrapper` that records each database query as a client span."""
+    connection = context["connection"]
+    with start_span("db.query", kind=SPAN_KIND_CLIENT, **{
+        "db.system": connection.vendor,
+        "db.statement": sql,
+    }):
+        return execute(sql, params, many, context)
@@ -0,0 +1,192 @@
+import time
+
+from django.conf import settings
+
+from .redis_client import redis_client_ins
+
+# Member that keeps the index of a user without active sessions, so a zero
+# count is cached too. Its score of 0 keeps it out of every count, and the
+# first new session trims it away with the expired ones.
+EMPTY_MARKER = "empty"
+EMPTY_INDEX_TTL_SECONDS = 300
+
+# Adds a session to a user's index, drops the expired ones and, with a limit
+# (ARGV[5] > 0), removes and returns the oldest sessions beyond the newest limit.
+# Returns nil without creating the index if it does not exist, since an index
+# holding only the new session would hide the user's other sessions.
+# The scripts only touch KEYS[1], so they are atomic on a single node, a cluster
+# and a sharded deployment alike.
+ADD_SESSION_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return false
+end
+redis.call('ZADD', KEYS[1], ARGV[2], ARGV[1])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[3])
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+local limit = tonumber(ARGV[5])
+if limit <= 0 then
+    return {}
+end
+local evicted = redis.call('ZRANGE', KEYS[1], 0, -(limit + 1))
+if #evicted > 0 then
+    redis.call('ZREMRANGEBYRANK', KEYS[1], 0, -(limit + 1))
+end
+return evicted
+"""
+
+# Replaces a user's index with the score/member pairs in ARGV[2..], expiring
+# after ARGV[1] seconds
+REBUILD_INDEX_SCRIPT = """
+redis.call('DEL', KEYS[1])
+for i = 2, #ARGV, 2 do
+    redis.call('ZADD', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+"""
+
+
+class UserSessionIndex:
+    """Redis index of the active sessions of each user.
+
+    Each user has a sorted set `user_sessions:{user_id}` of session id ->
+    creation time. A session counts as active until it is revoked or its
+    refresh token lifetime has passed, so the active session count is a single
+    `ZCOUNT` instead of a `COUNT(*)` over the user's session history. The
+    same index enforces MAX_SESSIONS_PER_USER on login.
+
+    Sessions are only added to an existing index. A missing index (never
+    built, expired, or lost by Redis) is reported as unpopulated by `add` and
+    `count`, and callers rebuild it from the database with `rebuild`.
+
+    Without Redis the index is unavailable: writes are skipped and the index
+    is always reported as unpopulated, so callers fall back to the database.
+    """
+
+    def _key(self, user_id) -> str:
+        return f"user_sessions:{user_id}"
+
+    def _min_score(self) -> float:
+        return time.time() - settings.REFRESH_TOKEN_EXPIRATION_SECONDS
+
+    def add(self, user_id, session_id: str, created_at: float, limit: int = 0) -> list:
+        """Add a new session to the user's index.
+
+        With a `limit`, the oldest sessions beyond the newest `limit` are
+        removed from the index by the same Lua script, so concurrent logins
+        never leave the user above the limit.
+
+        Args:
+            user_id: The id of the user.
+            session_id (str): The id of the new session.
+            created_at (float): The session creation time as a UNIX timestamp.
+            limit (int): The maximum number of active sessions, or 0 for no limit.
+
+        Returns:
+            list or None: The ids of the sessions evicted to stay within
+                          `limit`, oldest first, or None if the index of the
+                          user is not populated (or Redis is unavailable) and
+                          must be rebuilt from the database.
+        """
+        if redis_client_ins is None:
+            return None
+
+        evicted = redis_client_ins.eval(
+            ADD_SESSION_SCRIPT,
+            1,
+            self._key(user_id),
+            session_id,
+            created_at,
+            f"({self._min_score()}",
+            settings.REFRESH_TOKEN_EXPIRATION_SECONDS,
+            limit,
+        )
+        if evicted is None:
+            return None
+        return [session.decode() for session in evicted]
+
+    def add_many(self, sessions) -> None:
+        """Add several new sessions to their users' indexes in one pipeline.
+
+        MAX_SESSIONS_PER_USER is not applied, and missing indexes are left to
+        be rebuilt on their next use.
+
+        Args:
+            sessions: Iterable of (user_id, session_id, created_at timestamp) triples.
+        """
+        if redis_client_ins is None:
+            return
+
+        min_score = f"({self._min_score()}"
+        pipeline = redis_client_ins.pipeline(transaction=False)
+        for user_id, session_id, created_at in sessions:
+            pipeline.eval(
+                ADD_SESSION_SCRIPT,
+                1,
+                self._key(user_id),
+                session_id,
+                created_at,
+                min_score,
+                settings.REFRESH_TOKEN_EXPIRATION_SECONDS,
+                0,
+            )
+        pipeline.execute()
+
+    def remove(self, sessions) -> None:
+        """Remove revoked sessions from their users' indexes.
+
+        Args:
+            sessions: Iterable of (user_id, session_id) pairs.
+        """
+        if redis_client_ins is None:
+            return
+
+        pipeline = redis_client_ins.pipeline(transaction=False)
+        for user_id, session_id in sessions:
+            pipeline.zrem(self._key(user_id), str(session_id))
+        pipeline.execute()
+
+    def count(self, user_id):
+        """Count the active sessions of a user.
+
+        Args:
+            user_id: The id of the user.
+
+        Returns:
+            int or None: The number of active sessions, or None if the index of
+                         the user is not populated and must be rebuilt.
+        """
+        if redis_client_ins is None:
+            return None
+
+        key = self._key(user_id)
+        pipeline = redis_client_ins.pipeline(transaction=False)
+        pipeline.exists(key)
+        pipeline.zcount(key, self._min_score(), "+inf")
+        exists, count = pipeline.execute()
+        return count if exists else None
+
+    def rebuild(self, user_id, sessions) -> None:
+        """Replace the index of a user with the given active sessions.
+
+        A user without active sessions gets an index holding only EMPTY_MARKER
+        for EMPTY_INDEX_TTL_SECONDS, so their count is not rebuilt on every
+        request.
+
+        Args:
+            user_id: The id of the user.
+            sessions: Iterable of (session_id, created_at timestamp) pairs.
+        """
+        if redis_client_ins is None:
+            return
+
+        members = []
+        for session_id, created_at in sessions:
+            members.extend((created_at, str(session_id)))
+        if members:
+            ttl = settings.REFRESH_TOKEN_EXPIRATION_SECONDS
+        else:
+            members, ttl = [0, EMPTY_MARKER], EMPTY_INDEX_TTL_SECONDS
+        redis_client_ins.eval(REBUILD_INDEX_SCRIPT, 1, self._key(user_id), ttl, *members)
+
+
+user_session_index_ins = UserSessionIndex()
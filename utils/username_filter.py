@@ -0,0 +1,113 @@
+from django.conf import settings
+from redis import RedisError
+
+from .bloom_filter import bloom_filter_parameters, bloom_filter_positions
+from .redis_client import redis_client_ins
+
+
+class UsernameFilter:
+    """Bloom filter of taken usernames, kept in a Redis bitmap.
+
+    A username that is not in the filter is certainly free, so most
+    availability checks cost one Redis round trip and no database query.
+    Possible hits must be confirmed against the database.
+
+    The bitmap is built from the `User` table by the `rebuild_username_filter`
+    management command, and every signup adds its username. Its key embeds the
+    filter size, so changing USERNAME_FILTER_CAPACITY or
+    USERNAME_FILTER_ERROR_RATE starts from a missing filter. While the filter
+    is missing or Redis is unavailable, every username is a possible hit.
+    """
+
+    def __init__(self):
+        self.size, self.hash_count = bloom_filter_parameters(
+            settings.USERNAME_FILTER_CAPACITY,
+            settings.USERNAME_FILTER_ERROR_RATE,
+        )
+        # The hash tag keeps the filter and its rebuild copy on the same shard
+        self.key = f"{{username_filter}}:{self.size}:{self.hash_count}"
+
+    def _positions(self, username: str):
+        return bloom_filter_positions(username, self.size, self.hash_count)
+
+    def might_contain(self, username: str) -> bool:
+        """Check whether a username may be taken.
+
+        Args:
+            username (str): The username to check.
+
+        Returns:
+            bool: False if the username is certainly free, True if it may be taken.
+        """
+        if redis_client_ins is None:
+            return True
+
+        pipeline = redis_client_ins.pipeline(transaction=False)
+        pipeline.exists(self.key)
+        for position in self._positions(username):
+            pipeline.getbit(self.key, position)
+        try:
+            exists, *bits = pipeline.execute()
+        except RedisError:
+            return True
+        return not exists or all(bits)
+
+    def add(self, username: str) -> None:
+        """Add a taken username to the filter.
+
+        A failed update is not retried. The database still rejects duplicates
+        on signup, and the next rebuild restores the username.
+
+        Args:
+            username (str): The username of a newly created user.
+        """
+        if redis_client_ins is None:
+            return
+
+        try:
+            self._add_many(self.key, [username])
+        except RedisError:
+            pass
+
+    def rebuild(self, usernames, batch_size: int = 10000) -> int:
+        """Replace the filter with one holding exactly the given usernames.
+
+        The new bitmap is written under a temporary key and renamed over the
+        filter, so readers never see a partially built filter.
+
+        Args:
+            usernames: Iterable of every taken username.
+            batch_size (int): Number of usernames per pipeline.
+
+        Returns:
+            int: The number of usernames added.
+        """
+        building_key = f"{self.key}:building"
+        redis_client_ins.delete(building_key)
+        # Allocate the whole bitmap up front, so an empty table still yields a filter
+        redis_client_ins.setbit(building_key, self.size - 1, 0)
+
+        count = 0
+        batch = []
+        for username in usernames:
+            batch.append(username)
+            if len(batch) >= batch_size:
+                count += self._add_many(building_key, batch)
+                batch = []
+        count += self._add_many(building_key, batch)
+
+        redis_client_ins.rename(building_key, self.key)
+        return count
+
+    def _add_many(self, key: str, usernames: list) -> int:
+        if not usernames:
+            return 0
+        pipeline = redis_client_ins.pipeline(transaction=False)
+        for username in usernames:
+            for position in self._positions(username):
+                pipeline.setbit(key, position, 1)
+        pipeline.execute()
+        return len(usernames)
+
+
+username_filter_ins = UsernameFilter()
@@ -0,0 +1,74 @@
+import importlib
+import time
+
+from django.db import connections
+from django.urls import get_resolver
+
+from .jwt_keys import get_private_key, get_public_key
+from .redis_client import redis_client_ins, redis_replica_ins
+from .shared_token_cache import shared_token_cache_ins
+
+
+def _import_views():
+    importlib.import_module("accounts.views")
+    # Builds the URL patterns, which imports every view module
+    get_resolver().url_patterns
+
+
+def _open_database_connections():
+    for connection in connections.all():
+        connection.ensure_connection()
+
+
+def _open_redis_connections():
+    for client in {id(client): client for client in (redis_client_ins, redis_replica_ins)}.values():
+        if client is not None:
+            client.ping()
+
+
+def _load_jwt_keys():
+    get_private_key()
+    get_public_key()
+
+
+def _open_shared_token_cache():
+    # Maps the cache file; a no-op unless SHARED_TOKEN_CACHE_ENABLED
+    shared_token_cache_ins.get("")
+
+
+WARMUP_STEPS = [
+    ("imports", _import_views),
+    ("database", _open_database_connections),
+    ("redis", _open_redis_connections),
+    ("jwt_keys", _load_jwt_keys),
+    ("shared_token_cache", _open_shared_token_cache),
+]
+
+
+def warm_up(steps: list = None) -> dict:
+    """Do the lazy per-process work of the first request ahead of time.
+
+    Imports the views, opens the database and Redis connections, parses the
+    JWT keys and maps the shared token cache, so the first requests served by
+    a new worker are as fast as the following ones. A failing step does not
+    stop the others; the request that needs it will fail as it would have.
+
+    Args:
+        steps (list): Names of the steps to run, see `WARMUP_STEPS`. All by default.
+
+    Returns:
+        dict: Mapping of step name to its duration in milliseconds, or to the
+              exception it raised.
+    """
+    results = {}
+    for name, step in WARMUP_STEPS:
+        if steps is not None and name not in steps:
+            continue
+        started = time.perf_counter()
+        try:
+            step()
+        except Exception as error:
+            results[name] = error
+        else:
+            results[name] = (time.perf_counter() - started) * 1000
+    return results